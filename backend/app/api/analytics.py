@@ -81,7 +81,7 @@ async def get_participation_analytics(
     
     # Branch-wise distribution (from MongoDB submissions)
     submissions_collection = get_submissions_collection()
-    cursor = submissions_collection.find({"status": "approved"})
+    cursor = submissions_collection.find({"status": "approved"}, {"branch": 1, "semester": 1})
     students = await cursor.to_list(length=2000)
     
     branch_counts = {}
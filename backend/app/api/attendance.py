@@ -1,16 +1,21 @@
 """Attendance API endpoints."""
-from datetime import datetime, timedelta
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select
 from app.db.postgres import get_postgres_session
 from app.db.mongodb import get_database
 from app.models.sql_models import Event, EventAttendance, User
 from app.schemas.attendance_schemas import (
-    AttendanceRequest, AttendanceResponse, EventDateInfo
+    AttendanceRequest, AttendanceResponse, EventDateInfo,
+    AttendanceMatrixResponse, AttendanceMatrixUpdate
 )
 from app.core.security import get_current_admin_user
+from app.services.attendance import (
+    attendance_rows, attendance_edit_rows, upsert_attendance, build_attendance_matrix,
+    event_dates, naive_utc, CODE_STATUSES, STATUS_CODES
+)
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
@@ -28,20 +33,70 @@ async def get_event_dates(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Generate list of dates between start and end
-    dates = []
-    current_date = event.start_date
-    while current_date <= event.end_date:
-        dates.append(current_date)
-        current_date += timedelta(days=1)
-    
     return EventDateInfo(
         start_date=event.start_date,
         end_date=event.end_date,
-        dates=dates
+        dates=event_dates(event)
     )
 
 
+async def _get_event_or_404(db: AsyncSession, event_id: int) -> Event:
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+def _matrix_response(matrix) -> AttendanceMatrixResponse:
+    return AttendanceMatrixResponse(
+        event_id=matrix.event_id,
+        dates=matrix.dates,
+        legend=CODE_STATUSES,
+        version=matrix.version,
+        full=matrix.full,
+        roster_size=matrix.roster_size,
+        participants=matrix.participants,
+        changes=matrix.changes,
+        dropped=matrix.dropped
+    )
+
+
+@router.get("/{event_id}/matrix", response_model=AttendanceMatrixResponse)
+async def get_attendance_matrix(
+    event_id: int,
+    since: Optional[datetime] = Query(None, description="`version` of a previous response; returns only what changed"),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_postgres_session)
+):
+    """
+    Attendance for every selected participant on every event day in one response.
+    Each participant carries a status string with one character per day.
+    """
+    event = await _get_event_or_404(db, event_id)
+    return _matrix_response(await build_attendance_matrix(db, event, naive_utc(since)))
+
+
+@router.patch("/{event_id}/matrix", response_model=AttendanceMatrixResponse)
+async def update_attendance_matrix(
+    event_id: int,
+    update: AttendanceMatrixUpdate,
+    since: Optional[datetime] = Query(None, description="Client's current version; the response is the delta since then"),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_postgres_session)
+):
+    """Save only the edited cells (any days) in one upsert and return the resulting delta."""
+    event = await _get_event_or_404(db, event_id)
+    for change in update.changes:
+        if change.status not in STATUS_CODES:
+            raise HTTPException(status_code=400, detail=f"Invalid status '{change.status}' for {change.usn}")
+        if not event.start_date <= change.attendance_date <= event.end_date:
+            raise HTTPException(status_code=400, detail=f"{change.attendance_date} is outside the event dates")
+    
+    await upsert_attendance(db, attendance_edit_rows(event_id, update.changes, current_user.id))
+    await db.commit()
+    return _matrix_response(await build_attendance_matrix(db, event, naive_utc(since)))
+
+
 @router.get("/{event_id}", response_model=List[AttendanceResponse])
 async def get_attendance(
     event_id: int,
@@ -123,39 +178,9 @@ async def save_attendance(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    saved_count = 0
-    
-    for record in request.records:
-        # Check if record exists
-        existing = await db.execute(
-            select(EventAttendance).where(and_(
-                EventAttendance.event_id == event_id,
-                EventAttendance.usn == record.usn,
-                EventAttendance.attendance_date == request.attendance_date
-            ))
-        )
-        existing_record = existing.scalar_one_or_none()
-        
-        if existing_record:
-            # Update
-            existing_record.status = record.status
-            existing_record.marked_by = current_user.id
-            existing_record.marked_at = datetime.utcnow()
-        else:
-            # Insert
-            new_record = EventAttendance(
-                event_id=event_id,
-                usn=record.usn,
-                student_name=record.student_name,
-                attendance_date=request.attendance_date,
-                status=record.status,
-                marked_by=current_user.id,
-                marked_at=datetime.utcnow()
-            )
-            db.add(new_record)
-        
-        saved_count += 1
-    
+    # One INSERT ... ON CONFLICT DO UPDATE for the whole roster
+    rows = attendance_rows(event_id, request.attendance_date, request.records, current_user.id)
+    saved_count = await upsert_attendance(db, rows)
     await db.commit()
     
     return {"message": f"Saved {saved_count} attendance records", "saved_count": saved_count}
@@ -0,0 +1,145 @@
+"""Blob API endpoints for serving stored photos and signatures."""
+import mmap
+import os
+import re
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi.responses import Response, StreamingResponse
+from app.core.security import get_current_admin_user, get_current_student
+from app.db.mongodb import get_submissions_collection
+from app.services.blob_store import blob_store, HASH_PATTERN
+from app.services.identity_cache import resolve_student_identity
+
+router = APIRouter(prefix="/blobs", tags=["Blobs"])
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_mmap(path: str, start: int, end: int):
+    """Yield bytes [start, end] of a file through a read-only memory map."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = start
+            while position <= end:
+                chunk_end = min(position + CHUNK_SIZE, end + 1)
+                yield mm[position:chunk_end]
+                position = chunk_end
+
+
+def _parse_range(range_header: str, size: int) -> Optional[tuple]:
+    """Parse a single-range 'bytes=' header. Returns (start, end) inclusive."""
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None
+
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+
+    if not start_str:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+async def require_blob_access(
+    blob_hash: str,
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Admins may read any blob. A student may read only the photo and signature
+    on their own registration; any other blob is reported as not found.
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        await get_current_admin_user(authorization[len("Bearer "):])
+        return
+    except HTTPException:
+        pass
+
+    student = await get_current_student(authorization)
+    identity = await resolve_student_identity(student)
+    blob_hash = blob_hash.lower()
+    owns = identity and await get_submissions_collection().count_documents(
+        {"_id": identity["id"], "$or": [{"photo_blob.hash": blob_hash}, {"signature_blob.hash": blob_hash}]},
+        limit=1
+    )
+    if not owns:
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+
+@router.get("/{blob_hash}", dependencies=[Depends(require_blob_access)])
+async def get_blob(
+    blob_hash: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """
+    Serve a stored blob by its SHA-256 hash.
+    Content is immutable, so the hash doubles as a strong ETag.
+    """
+    blob_hash = blob_hash.lower()
+    if not HASH_PATTERN.match(blob_hash):
+        raise HTTPException(status_code=400, detail="Invalid blob hash")
+
+    etag = f'"{blob_hash}"'
+    cache_headers = {
+        "ETag": etag,
+        # Content never changes, but only authorized viewers may hold a copy
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    path = blob_store.path_for(blob_hash)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    meta = await blob_store.get_metadata(blob_hash)
+    content_type = (meta or {}).get("content_type", "application/octet-stream")
+    size = os.path.getsize(path)
+
+    if size == 0:
+        return Response(content=b"", media_type=content_type, headers=cache_headers)
+
+    start, end = 0, size - 1
+    status_code = status.HTTP_200_OK
+
+    if range_header:
+        try:
+            parsed = _parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**cache_headers, "Content-Range": f"bytes */{size}"}
+            )
+        if parsed:
+            start, end = parsed
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            cache_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    cache_headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _iter_mmap(path, start, end),
+        status_code=status_code,
+        media_type=content_type,
+        headers=cache_headers
+    )
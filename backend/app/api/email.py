@@ -1,145 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
-from app.db.postgres import get_postgres_session
-from app.db.mongodb import get_database
-from app.models.sql_models import EmailAuditLog, User
+from app.core.config import settings
+from app.db.postgres import get_postgres_session, AsyncSessionLocal
+from app.models.sql_models import EmailAuditLog, EmailOutbox, User
 from app.core.security import get_current_admin_user
-from app.schemas.email_schemas import EmailSendRequest, EmailLogResponse
-from app.services.email_service import email_service
-from fastapi.concurrency import run_in_threadpool
-import hashlib
+from app.schemas.email_schemas import (
+    EmailSendRequest, EmailLogResponse, OutboxEntryResponse, CampaignStatusResponse,
+    OutboxRedriveRequest, OutboxRedriveResponse, CampaignProgress, AuditChainVerifyResponse
+)
+from app.services.email_outbox import (
+    email_outbox_worker, enqueue_campaign, enqueue_recipients, campaign_counts, redrive, outbox_progress, IN_FLIGHT_STATUSES
+)
+from app.services.email_templates import compile_template, UnknownPlaceholderError
+from app.services.recipients import RecipientResolver
+from app.services.email_audit import append_to_chain, verify_chain
 import json
+import logging
+import time
+from collections import deque
+from dataclasses import asdict
 from datetime import datetime
-from typing import List
-
-router = APIRouter(prefix="/email", tags=["email"])
+from typing import List, Optional
 
+logger = logging.getLogger(__name__)
 
-def get_submissions_collection():
-    """Get student submissions collection from MongoDB."""
-    db = get_database()
-    return db["student_submissions"]
+router = APIRouter(prefix="/email", tags=["email"])
 
 
 @router.post("/send", response_model=EmailLogResponse)
 async def send_email(
     request: EmailSendRequest,
+    background_tasks: BackgroundTasks,
     current_admin: User = Depends(get_current_admin_user),
     session: AsyncSession = Depends(get_postgres_session)
 ):
-    # 1. Build MongoDB Query for approved students
-    collection = get_submissions_collection()
-    
-    query = {"status": "approved"}  # Only approved students
-    
-    filters_dict = {}
-    if request.filters:
-        filters_dict = request.filters.dict(exclude_none=True)
-        
-        if request.filters.semester:
-            if isinstance(request.filters.semester, list) and len(request.filters.semester) > 0:
-                query["semester"] = {"$in": request.filters.semester}
-            elif isinstance(request.filters.semester, int):
-                query["semester"] = request.filters.semester
-                
-        if request.filters.branch:
-            if isinstance(request.filters.branch, list) and len(request.filters.branch) > 0:
-                query["branch"] = {"$in": request.filters.branch}
-        
-        if request.filters.usn:
-            if isinstance(request.filters.usn, list) and len(request.filters.usn) > 0:
-                query["usn"] = {"$in": request.filters.usn}
+    # 0. Reject templates with placeholders we cannot fill, before anything is sent
+    try:
+        compile_template(request.body)
+    except UnknownPlaceholderError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Execute Query
-    cursor = collection.find(query)
-    students = await cursor.to_list(length=1000)
+    filters_dict = request.filters.dict(exclude_none=True) if request.filters else {}
+    resolver = RecipientResolver(request.filters)
     
-    recipient_count = len(students)
-    
-    # 2. Dry Run
+    # 1. Dry Run: stream the recipients once just to count them
     if request.dry_run:
         return EmailLogResponse(
             id=0,
             admin_id=current_admin.id,
             subject=request.subject,
-            recipient_count=recipient_count,
+            recipient_count=await resolver.count(),
             success_count=0,
             sent_at=datetime.utcnow(),
             filters_used=json.dumps(filters_dict)
         )
     
-    if recipient_count == 0:
-        raise HTTPException(status_code=400, detail="No approved students found matching filters")
-
-    # 3. Prepare Recipients Data
-    recipients_data = []
-    for student in students:
-        email = student.get("email")
-        if email and "@" in email:
-            recipients_data.append({
-                "email": email,
-                "name": student.get("student_name", "Student"),
-                "usn": student.get("usn", "N/A"),
-                "branch": student.get("branch", "N/A"),
-                "semester": student.get("semester", "")
-            })
-    
-    if len(recipients_data) == 0:
-        raise HTTPException(status_code=400, detail="No valid email addresses found")
-    
-    # 4. Find Last Hash for Blockchain
-    last_log_result = await session.execute(
-        select(EmailAuditLog).order_by(desc(EmailAuditLog.id)).limit(1)
-    )
-    last_log = last_log_result.scalar_one_or_none()
-    prev_hash = last_log.blockchain_hash if last_log else "GENESIS_HASH"
-    
-    # 5. Create Initial Log
+    # 2. Create Initial Log (flushed for its id; committed with the outbox rows)
     new_log = EmailAuditLog(
         admin_id=current_admin.id,
         subject=request.subject,
         body_preview=request.body[:100] + "...",
         filters_used=json.dumps(filters_dict),
-        recipient_count=len(recipients_data),
+        recipient_count=0,
         success_count=0,
         failure_count=0,
         sent_at=datetime.utcnow(),
         blockchain_hash="PENDING"
     )
     session.add(new_log)
-    await session.commit()
-    await session.refresh(new_log)
+    await session.flush()
+    await enqueue_campaign(session, new_log, request.body)
     
-    # 6. Send Emails (Blocking in Threadpool)
-    success, failure = await run_in_threadpool(
-        email_service.send_batch,
-        recipients_data, 
-        request.subject, 
-        request.body
-    )
-    
-    # 7. Update Log & Compute Hash
-    new_log.success_count = success
-    new_log.failure_count = failure
+    # 3. Stream recipients from MongoDB into the outbox, one batch per insert
+    async for batch in resolver.batches():
+        await enqueue_recipients(session, new_log.id, batch)
     
-    # Hash = SHA256(prev_hash + admin_id + timestamp + subject + success_count)
-    data_to_hash = f"{prev_hash}{new_log.admin_id}{new_log.sent_at.isoformat()}{new_log.subject}{success}"
-    new_log.blockchain_hash = hashlib.sha256(data_to_hash.encode()).hexdigest()
+    if resolver.matched == 0:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="No approved students found matching filters")
+    if resolver.recipients == 0:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="No valid email addresses found")
     
+    # 4. Link the log into the audit hash chain (serialized) and commit it all
+    new_log.recipient_count = resolver.recipients
+    await append_to_chain(session, new_log)
     await session.commit()
     
+    # 5. Deliver the queued rows in the background.
+    # Failures are retried with backoff by the outbox worker; progress is
+    # streamed from /email/logs/{id}/progress.
+    background_tasks.add_task(deliver_campaign, new_log.id)
+    
     return EmailLogResponse(
         id=new_log.id,
         admin_id=new_log.admin_id,
         subject=new_log.subject,
         recipient_count=new_log.recipient_count,
-        success_count=success,
+        success_count=0,
         sent_at=new_log.sent_at,
-        filters_used=new_log.filters_used
+        filters_used=new_log.filters_used,
+        progress_url=f"/api/email/logs/{new_log.id}/progress"
     )
 
 
+async def deliver_campaign(log_id: int):
+    """Deliver a queued campaign; the outbox keeps the log counts up to date."""
+    try:
+        counts = await email_outbox_worker.drain_campaign(log_id)
+    except Exception as e:
+        # Rows stay queued; the outbox worker picks them up on its next pass
+        logger.error(f"Campaign {log_id} delivery interrupted: {e}")
+        email_outbox_worker.notify()
+        return
+    failed = counts.get("failed", 0) + counts.get("dead", 0)
+    print(f"📧 Campaign {log_id}: {counts.get('sent', 0)} sent, {failed} failed")
+
+
+@router.post("/audit/verify", response_model=AuditChainVerifyResponse)
+async def verify_audit_chain(
+    full: bool = Query(False, description="Replay the whole chain instead of resuming from the last checkpoint"),
+    session: AsyncSession = Depends(get_postgres_session),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """
+    Verify the email audit hash chain. Only links added since the last
+    successful verification are recomputed; an intact run stores a new checkpoint.
+    """
+    result = await verify_chain(session, full=full, verified_by=current_admin.id)
+    await session.commit()
+    return AuditChainVerifyResponse(**asdict(result))
+
+
 @router.get("/logs", response_model=List[EmailLogResponse])
 async def get_email_logs(
     session: AsyncSession = Depends(get_postgres_session),
@@ -147,3 +141,158 @@ async def get_email_logs(
 ):
     result = await session.execute(select(EmailAuditLog).order_by(desc(EmailAuditLog.sent_at)))
     return result.scalars().all()
+
+
+async def _get_log_or_404(session: AsyncSession, log_id: int) -> EmailAuditLog:
+    log = await session.get(EmailAuditLog, log_id)
+    if not log:
+        raise HTTPException(status_code=404, detail="Email log not found")
+    return log
+
+
+@router.get("/logs/{log_id}/status", response_model=CampaignStatusResponse)
+async def get_campaign_status(
+    log_id: int,
+    session: AsyncSession = Depends(get_postgres_session),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Per-status outbox counts for one campaign."""
+    await _get_log_or_404(session, log_id)
+    counts = await campaign_counts(session, log_id)
+    return CampaignStatusResponse(audit_log_id=log_id, total=sum(counts.values()), counts=counts)
+
+
+class ProgressRate:
+    """Completed messages per second over a sliding window of samples."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.samples = deque()
+
+    def update(self, completed: int) -> float:
+        now = time.monotonic()
+        self.samples.append((now, completed))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+        first_at, first_completed = self.samples[0]
+        elapsed = now - first_at
+        return round((completed - first_completed) / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def campaign_progress(log_id: int, counts: dict, rate: float) -> CampaignProgress:
+    remaining = sum(counts.get(status, 0) for status in IN_FLIGHT_STATUSES)
+    return CampaignProgress(
+        audit_log_id=log_id,
+        total=sum(counts.values()),
+        sent=counts.get("sent", 0),
+        failed=counts.get("failed", 0) + counts.get("dead", 0),
+        retrying=counts.get("failed", 0),
+        remaining=remaining,
+        rate_per_second=rate,
+        done=remaining == 0
+    )
+
+
+@router.get("/logs/{log_id}/progress")
+async def stream_campaign_progress(
+    log_id: int,
+    request: Request,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """
+    Server-Sent Events stream of campaign progress.
+    Emits a `progress` event whenever the counts change and a final `done`
+    event once nothing is queued or sending (rows awaiting a retry do not keep
+    the stream open). Counts are read from the outbox, so the stream works no
+    matter which worker or process delivers the campaign.
+    """
+    async with AsyncSessionLocal() as session:
+        await _get_log_or_404(session, log_id)
+
+    async def events():
+        rate = ProgressRate(settings.EMAIL_PROGRESS_RATE_WINDOW_SECONDS)
+        last_payload = None
+        last_write = time.monotonic()
+        while True:
+            async with AsyncSessionLocal() as session:
+                counts = await campaign_counts(session, log_id)
+            completed = sum(n for status, n in counts.items() if status not in IN_FLIGHT_STATUSES)
+            progress = campaign_progress(log_id, counts, rate.update(completed))
+
+            payload = progress.model_dump_json(exclude={"rate_per_second"})
+            if progress.done:
+                yield f"event: done\ndata: {progress.model_dump_json()}\n\n"
+                return
+            if payload != last_payload:
+                yield f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+                last_payload = payload
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write >= settings.EMAIL_PROGRESS_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_write = time.monotonic()
+
+            if await request.is_disconnected():
+                return
+            # Local batches wake us immediately; other processes are picked up by the poll
+            await outbox_progress.wait(settings.EMAIL_PROGRESS_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/logs/{log_id}/outbox", response_model=List[OutboxEntryResponse])
+async def list_campaign_outbox(
+    log_id: int,
+    status: Optional[str] = Query(None, description="queued, sending, sent, failed or dead"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_postgres_session),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """List outbox rows of one campaign."""
+    await _get_log_or_404(session, log_id)
+    query = select(EmailOutbox).where(EmailOutbox.audit_log_id == log_id)
+    if status:
+        query = query.where(EmailOutbox.status == status)
+    query = query.order_by(EmailOutbox.id).offset((page - 1) * per_page).limit(per_page)
+    result = await session.execute(query)
+    return result.scalars().all()
+
+
+@router.get("/outbox/failures", response_model=List[OutboxEntryResponse])
+async def list_outbox_failures(
+    status: Optional[str] = Query(None, pattern="^(failed|dead)$", description="failed or dead (both when omitted)"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_postgres_session),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """List failed and dead-lettered recipients across all campaigns, newest first."""
+    statuses = [status] if status else ["failed", "dead"]
+    result = await session.execute(
+        select(EmailOutbox)
+        .where(EmailOutbox.status.in_(statuses))
+        .order_by(desc(EmailOutbox.updated_at), desc(EmailOutbox.id))
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    return result.scalars().all()
+
+
+@router.post("/logs/{log_id}/redrive", response_model=OutboxRedriveResponse)
+async def redrive_campaign(
+    log_id: int,
+    request: OutboxRedriveRequest,
+    session: AsyncSession = Depends(get_postgres_session),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Requeue failed (and dead) recipients of a campaign for immediate delivery."""
+    await _get_log_or_404(session, log_id)
+    statuses = ("failed", "dead") if request.include_dead else ("failed",)
+    requeued = await redrive(session, log_id, ids=request.ids, statuses=statuses)
+    await session.commit()
+    email_outbox_worker.notify()
+    return OutboxRedriveResponse(audit_log_id=log_id, requeued=requeued)
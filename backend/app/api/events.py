@@ -1,21 +1,63 @@
 """Events API endpoints."""
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from app.db.postgres import get_postgres_session
+from app.db.postgres import get_postgres_session, AsyncSessionLocal
 from app.db.mongodb import get_database
 from app.models.sql_models import Event, User, ApprovedParticipant
-from app.schemas.schemas import EventCreate, EventUpdate, EventResponse
+from app.schemas.schemas import EventCreate, EventUpdate, EventResponse, EventCreateResponse
 from app.core.security import get_current_admin_user
-from app.services.email_service import email_service
-from fastapi.concurrency import run_in_threadpool
+from app.services.announcements import enqueue_event_announcement
+from app.services.events_cache import events_cache
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+EVENT_LIST_ADAPTER = TypeAdapter(List[EventResponse])
 
-@router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+# Selections are written as "approved"; older rows used "selected"
+COUNTED_PARTICIPANT_STATUSES = ("approved", "selected")
+
+
+def events_with_counts():
+    """SELECT (Event, participant_count) with all counts from one grouped subquery."""
+    counts = (
+        select(
+            ApprovedParticipant.event_id,
+            func.count(ApprovedParticipant.id).label("participant_count")
+        )
+        .where(ApprovedParticipant.status.in_(COUNTED_PARTICIPANT_STATUSES))
+        .group_by(ApprovedParticipant.event_id)
+        .subquery()
+    )
+    return (
+        select(Event, func.coalesce(counts.c.participant_count, 0))
+        .outerjoin(counts, counts.c.event_id == Event.id)
+    )
+
+
+def catalogue_headers(cached) -> dict:
+    # Clients may keep the body but must revalidate; 304s are cheap
+    return {"ETag": cached.etag, "Cache-Control": "public, no-cache"}
+
+
+def event_response(event: Event, participant_count: int = 0) -> EventResponse:
+    return EventResponse(
+        id=event.id,
+        name=event.name,
+        location=event.location,
+        start_date=event.start_date,
+        end_date=event.end_date,
+        description=event.description,
+        created_at=event.created_at,
+        participant_count=participant_count
+    )
+
+
+@router.post("/", response_model=EventCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
     event_data: EventCreate,
     current_user: User = Depends(get_current_admin_user),
@@ -40,99 +82,55 @@ async def create_event(
     db.add(new_event)
     await db.commit()
     await db.refresh(new_event)
+    events_cache.invalidate()
     
-    # Send email notification to all approved students
-    submissions_collection = get_database()["student_submissions"]
-    cursor = submissions_collection.find({"status": "approved"})
-    approved_students = await cursor.to_list(length=1000)
-    
-    if approved_students:
-        recipients_data = []
-        for student in approved_students:
-            email = student.get("email")
-            if email and "@" in email:
-                recipients_data.append({
-                    "email": email,
-                    "name": student.get("student_name", "Student"),
-                    "usn": student.get("usn", ""),
-                    "branch": student.get("branch", ""),
-                    "semester": student.get("semester", "")
-                })
-        
-        if recipients_data:
-            # Send in background to not block response
-            email_body = f"""
-            <div style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2 style="color: #1e40af;">🏆 New Sports Event Announced!</h2>
-                <p>Dear <strong>{{{{student_name}}}}</strong>,</p>
-                <p>A new sports event has been announced:</p>
-                <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                    <h3 style="margin: 0; color: #1e293b;">{new_event.name}</h3>
-                    <p style="margin: 8px 0 0 0; color: #64748b;">📍 {new_event.location or 'TBD'}</p>
-                    <p style="margin: 4px 0 0 0; color: #64748b;">📅 {new_event.start_date} - {new_event.end_date}</p>
-                </div>
-                <p>Log in to the Student Portal to register your participation.</p>
-                <p>Best regards,<br>RVCE Sports Department</p>
-            </div>
-            """
-            await run_in_threadpool(
-                email_service.send_batch,
-                recipients_data,
-                f"New Event: {new_event.name} - RVCE Sports",
-                email_body
-            )
+    # Announce to approved students through the durable job queue
+    job_id = await enqueue_event_announcement(new_event, created_by=current_user.email)
     
-    return EventResponse(
-        id=new_event.id,
-        name=new_event.name,
-        location=new_event.location,
-        start_date=new_event.start_date,
-        end_date=new_event.end_date,
-        description=new_event.description,
-        created_at=new_event.created_at,
-        participant_count=0
+    return EventCreateResponse(
+        **event_response(new_event).model_dump(),
+        announcement_job_id=job_id
     )
 
 
 @router.get("/", response_model=List[EventResponse])
 async def list_events(
     upcoming_only: bool = Query(False, description="Filter to upcoming events only"),
-    db: AsyncSession = Depends(get_postgres_session)
+    from_date: Optional[date] = Query(None, description="Only events ending on or after this date"),
+    to_date: Optional[date] = Query(None, description="Only events starting on or before this date"),
+    page: int = Query(1, ge=1),
+    per_page: Optional[int] = Query(None, ge=1, le=100, description="Page size (all events when omitted)"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
-    """List all events (Public - visible to students)."""
-    query = select(Event).order_by(Event.start_date.desc())
-    
-    if upcoming_only:
-        # Use date only, no timezone issues
-        from datetime import date
-        today = date.today()
-        query = query.where(Event.end_date >= today)
-    
-    result = await db.execute(query)
-    events = result.scalars().all()
-    
-    # Get participant counts
-    response = []
-    for event in events:
-        count_result = await db.execute(
-            select(func.count(ApprovedParticipant.id))
-            .where(ApprovedParticipant.event_id == event.id)
-            .where(ApprovedParticipant.status == "selected")
-        )
-        count = count_result.scalar() or 0
+    """
+    List all events (Public - visible to students).
+    Served from the versioned catalogue cache; revalidates with a strong ETag.
+    """
+    # Use date only, no timezone issues
+    today = date.today() if upcoming_only else None
+    key = (today, from_date, to_date, page, per_page)
+    
+    async def build() -> bytes:
+        query = events_with_counts().order_by(Event.start_date.desc(), Event.id.desc())
+        if today:
+            query = query.where(Event.end_date >= today)
+        if from_date:
+            query = query.where(Event.end_date >= from_date)
+        if to_date:
+            query = query.where(Event.start_date <= to_date)
+        if per_page:
+            query = query.offset((page - 1) * per_page).limit(per_page)
         
-        response.append(EventResponse(
-            id=event.id,
-            name=event.name,
-            location=event.location,
-            start_date=event.start_date,
-            end_date=event.end_date,
-            description=event.description,
-            created_at=event.created_at,
-            participant_count=count
-        ))
-    
-    return response
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(query)
+            events = [event_response(event, count) for event, count in result.all()]
+        return EVENT_LIST_ADAPTER.dump_json(events)
+    
+    # Cache hits (and therefore 304s) never touch the database
+    cached = await events_cache.get_or_build(key, build)
+    if cached.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=catalogue_headers(cached))
+    return Response(content=cached.body, media_type="application/json", headers=catalogue_headers(cached))
 
 
 @router.get("/{event_id}", response_model=EventResponse)
@@ -141,29 +139,13 @@ async def get_event(
     db: AsyncSession = Depends(get_postgres_session)
 ):
     """Get a single event by ID."""
-    result = await db.execute(select(Event).where(Event.id == event_id))
-    event = result.scalar_one_or_none()
+    result = await db.execute(events_with_counts().where(Event.id == event_id))
+    row = result.first()
     
-    if not event:
+    if not row:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    count_result = await db.execute(
-        select(func.count(ApprovedParticipant.id))
-        .where(ApprovedParticipant.event_id == event.id)
-        .where(ApprovedParticipant.status == "selected")
-    )
-    count = count_result.scalar() or 0
-    
-    return EventResponse(
-        id=event.id,
-        name=event.name,
-        location=event.location,
-        start_date=event.start_date,
-        end_date=event.end_date,
-        description=event.description,
-        created_at=event.created_at,
-        participant_count=count
-    )
+    return event_response(*row)
 
 
 @router.patch("/{event_id}", response_model=EventResponse)
@@ -185,18 +167,10 @@ async def update_event(
         setattr(event, key, value)
     
     await db.commit()
-    await db.refresh(event)
+    events_cache.invalidate()
     
-    return EventResponse(
-        id=event.id,
-        name=event.name,
-        location=event.location,
-        start_date=event.start_date,
-        end_date=event.end_date,
-        description=event.description,
-        created_at=event.created_at,
-        participant_count=0
-    )
+    result = await db.execute(events_with_counts().where(Event.id == event_id))
+    return event_response(*result.first())
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -224,4 +198,5 @@ async def delete_event(
     # Now delete the event
     await db.delete(event)
     await db.commit()
+    events_cache.invalidate()
 
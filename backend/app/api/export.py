@@ -7,10 +7,11 @@ from typing import Optional
 from datetime import datetime
 import io
 
-from app.db.mongodb import get_submissions_collection, get_participation_collection
+from app.db.mongodb import get_submissions_collection
 from app.db.postgres import get_postgres_session
 from app.models.sql_models import User, Event
 from app.core.security import get_current_admin_user
+from app.services.attendance import build_attendance_matrix, STATUS_CODES
 
 router = APIRouter(prefix="/export", tags=["Export"])
 
@@ -28,7 +29,7 @@ async def export_submissions_csv(
     if branch:
         query["branch"] = branch
     
-    cursor = collection.find(query).sort("sln", 1)
+    cursor = collection.find(query, {"photo_base64": 0, "signature_base64": 0}).sort("sln", 1)
     submissions = await cursor.to_list(length=1000)
     
     output = io.StringIO()
@@ -91,7 +92,7 @@ async def export_submissions_excel(
     if branch:
         query["branch"] = branch
     
-    cursor = collection.find(query).sort("sln", 1)
+    cursor = collection.find(query, {"photo_base64": 0, "signature_base64": 0}).sort("sln", 1)
     submissions = await cursor.to_list(length=1000)
     
     wb = Workbook()
@@ -198,43 +199,15 @@ async def export_event_participants(
     except ImportError:
         raise HTTPException(500, "openpyxl not installed")
     
-    from app.models.sql_models import EventAttendance
-    from datetime import timedelta
-    
     # Get event
     result = await db.execute(select(Event).where(Event.id == event_id))
     event = result.scalar_one_or_none()
     if not event:
         raise HTTPException(404, "Event not found")
     
-    # Get participants
-    collection = get_participation_collection()
-    cursor = collection.find({"event_id": event_id, "status": "selected"})
-    participants = await cursor.to_list(length=500)
-    
-    # Get event dates
-    event_dates = []
-    current_date = event.start_date
-    while current_date <= event.end_date:
-        event_dates.append(current_date)
-        current_date += timedelta(days=1)
-    
-    # Get attendance records
-    attendance_result = await db.execute(
-        select(EventAttendance).where(EventAttendance.event_id == event_id)
-    )
-    
-    # helper for safe date string
-    def to_date_str(d):
-        if hasattr(d, 'strftime'):
-            return d.strftime('%Y-%m-%d')
-        return str(d).split(' ')[0]  # Fallback for strings or odd objects
-
-    # Use explicit date string for robust key matching
-    attendance_records = {
-        (r.usn, to_date_str(r.attendance_date)): r.status 
-        for r in attendance_result.scalars().all()
-    }
+    # Participants x days, from the same builder as the attendance grid
+    matrix = await build_attendance_matrix(db, event)
+    event_dates = matrix.dates
     
     wb = Workbook()
     ws = wb.active
@@ -274,26 +247,22 @@ async def export_event_participants(
         cell.border = thin_border
     
     # Data
-    for i, p in enumerate(participants, 1):
+    for i, p in enumerate(matrix.participants, 1):
         row = 4 + i
         ws.cell(row=row, column=1, value=i).border = thin_border
         ws.cell(row=row, column=2, value=p["usn"]).border = thin_border
-        ws.cell(row=row, column=3, value=p["student_name"]).border = thin_border
+        ws.cell(row=row, column=3, value=p.get("student_name")).border = thin_border
         ws.cell(row=row, column=4, value=str(p.get("processed_at", ""))).border = thin_border
         
         # Attendance columns
-        for col_offset, att_date in enumerate(event_dates):
-            # Use explicit string conversion for lookup
-            date_key = to_date_str(att_date)
-            status = attendance_records.get((p["usn"], date_key))
-            
+        for col_offset, code in enumerate(p["statuses"]):
             cell = ws.cell(row=row, column=5 + col_offset)
             cell.border = thin_border
             
-            if status and status.lower() == "present":
+            if code == STATUS_CODES["present"]:
                 cell.value = "P"
                 cell.fill = present_fill
-            elif status and status.lower() == "absent":
+            elif code == STATUS_CODES["absent"]:
                 cell.value = "Absent"
                 cell.fill = absent_fill
             else:
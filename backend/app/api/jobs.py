@@ -0,0 +1,52 @@
+"""Background job status API endpoints."""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.db.mongodb import get_jobs_collection
+from app.models.sql_models import User
+from app.schemas.schemas import JobStatusResponse
+from app.core.security import get_current_admin_user
+from app.services.job_queue import job_queue, JOB_SUMMARY_PROJECTION
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def job_status(job: dict) -> JobStatusResponse:
+    return JobStatusResponse(
+        id=str(job["_id"]),
+        type=job["type"],
+        status=job["status"],
+        total=job.get("total", 0),
+        processed=job.get("cursor", 0),
+        sent=job.get("sent", 0),
+        failed=job.get("failed", 0),
+        skipped=job.get("skipped", 0),
+        attempts=job.get("attempts", 0),
+        created_at=job["created_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        last_error=job.get("last_error")
+    )
+
+
+@router.get("/", response_model=List[JobStatusResponse])
+async def list_jobs(
+    type: Optional[str] = Query(None, description="Filter by job type"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """List recent background jobs, newest first (Admin only)."""
+    query = {"type": type} if type else {}
+    cursor = get_jobs_collection().find(query, JOB_SUMMARY_PROJECTION).sort("created_at", -1).limit(limit)
+    return [job_status(job) for job in await cursor.to_list(length=limit)]
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get progress of a background job (Admin only)."""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
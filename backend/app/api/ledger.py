@@ -0,0 +1,32 @@
+"""Blockchain ledger API endpoints (inclusion proofs, verification)."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models.sql_models import User
+from app.schemas.schemas import LedgerProofResponse, LedgerVerifyResponse
+from app.core.security import get_current_admin_user
+from app.services.ledger import entry_proof, verify_ledger
+
+router = APIRouter(prefix="/ledger", tags=["Ledger"])
+
+
+@router.get("/proofs/{entry_hash}", response_model=LedgerProofResponse)
+async def get_inclusion_proof(
+    entry_hash: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Merkle inclusion proof for a participation or approval, looked up by the
+    blockchain_hash stored on it (Admin only).
+    """
+    proof = await entry_proof(entry_hash)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="No ledger entry with this hash")
+    return proof
+
+
+@router.post("/verify", response_model=LedgerVerifyResponse)
+async def verify_whole_ledger(
+    workers: int = Query(None, ge=1, le=64, description="Blocks kept in the verification pool at once (default: pool size)"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Recompute every block of the ledger across a process pool (Admin only)."""
+    return await verify_ledger(workers)
@@ -1,17 +1,25 @@
 """Event Participation API endpoints."""
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete
+from sqlalchemy.exc import SQLAlchemyError
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from app.db.postgres import get_postgres_session
 from app.db.mongodb import get_database
 from app.models.sql_models import Event, ApprovedParticipant, User
-from app.schemas.schemas import ParticipationCreate, ParticipationResponse, ParticipationUpdate
+from app.schemas.schemas import (
+    ParticipationCreate, ParticipationResponse, ParticipationUpdate,
+    ParticipationBulkUpdate, ParticipationBulkItemResult, ParticipationBulkResponse
+)
 from app.core.security import get_current_student, get_current_admin_user
 from app.core.blockchain import blockchain
 from app.services.email_service import email_service
+from app.services.identity_cache import resolve_student_identity
+from app.services.events_cache import events_cache
 
 router = APIRouter(prefix="/participation", tags=["Participation"])
 
@@ -22,6 +30,57 @@ def get_participation_collection():
     return db["event_participation_requests"]
 
 
+async def sync_approved_participants(
+    db: AsyncSession,
+    event_id: int,
+    decision: str,
+    participations: List[tuple],  # (participation doc, blockchain hash)
+    admin_id: int,
+    now: Optional[datetime] = None
+):
+    """Mirror a select/drop decision into approved_participants and commit."""
+    now = now or datetime.utcnow()
+    if decision == "selected":
+        await db.execute(insert(ApprovedParticipant), [
+            {
+                "usn": p["usn"],
+                "event_id": event_id,
+                "approved_by": admin_id,
+                "status": "approved",
+                "blockchain_hash": hash_value,
+                "approved_at": now,
+                "created_at": now
+            }
+            for p, hash_value in participations
+        ])
+    else:
+        await db.execute(
+            delete(ApprovedParticipant)
+            .where(ApprovedParticipant.event_id == event_id)
+            .where(ApprovedParticipant.usn.in_([p["usn"] for p, _ in participations]))
+        )
+    await db.commit()
+    events_cache.invalidate()
+
+
+def selection_email(event_name: str) -> tuple:
+    """Subject and body for a selection notice ({{student_name}} is filled per recipient)."""
+    subject = f"Congratulations! You've been selected for {event_name}"
+    body = f"""
+    <div style="font-family: Arial, sans-serif; padding: 20px;">
+        <h2 style="color: #1e40af;">🎉 Selection Confirmed!</h2>
+        <p>Dear <strong>{{{{student_name}}}}</strong>,</p>
+        <p>We are pleased to inform you that you have been <strong>selected</strong> for:</p>
+        <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
+            <h3 style="margin: 0; color: #1e293b;">{event_name}</h3>
+        </div>
+        <p>Please report to the Sports Department for further instructions.</p>
+        <p>Best regards,<br>RVCE Sports Department</p>
+    </div>
+    """
+    return subject, body
+
+
 @router.post("/", response_model=ParticipationResponse, status_code=status.HTTP_201_CREATED)
 async def submit_participation(
     data: ParticipationCreate,
@@ -51,18 +110,9 @@ async def submit_participation(
     
     # Get student's USN from their registration
     collection = get_participation_collection()
-    submissions_collection = get_database()["student_submissions"]
-    
-    # Find student's registration to get USN
-    student_reg = await submissions_collection.find_one({
-        "$or": [
-            {"email": student["email"]},
-            {"firebase_uid": student["uid"]}
-        ],
-        "status": "approved"
-    })
+    student_reg = await resolve_student_identity(student)
     
-    if not student_reg:
+    if not student_reg or student_reg["status"] != "approved":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You must complete and get approved for student registration first"
@@ -118,13 +168,7 @@ async def get_my_participations(
     student = await get_current_student(authorization)
     
     # Get student's USN from registration
-    submissions_collection = get_database()["student_submissions"]
-    student_reg = await submissions_collection.find_one({
-        "$or": [
-            {"email": student["email"]},
-            {"firebase_uid": student["uid"]}
-        ]
-    })
+    student_reg = await resolve_student_identity(student)
     
     if not student_reg:
         return []
@@ -181,10 +225,24 @@ async def get_event_participations(
     ]
 
 
+def participation_response(p: dict) -> ParticipationResponse:
+    return ParticipationResponse(
+        id=str(p["_id"]),
+        usn=p["usn"],
+        student_name=p["student_name"],
+        event_id=p["event_id"],
+        event_name=p["event_name"],
+        status=p["status"],
+        submitted_at=p["submitted_at"],
+        blockchain_hash=p.get("blockchain_hash")
+    )
+
+
 @router.patch("/{participation_id}", response_model=ParticipationResponse)
 async def update_participation_status(
     participation_id: str,
     update_data: ParticipationUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_postgres_session)
 ):
@@ -211,8 +269,12 @@ async def update_participation_status(
     if not participation:
         raise HTTPException(status_code=404, detail="Participation request not found")
     
+    # Already in the requested state: no second ledger entry or roster row
+    if participation["status"] == update_data.status:
+        return participation_response(participation)
+    
     # Create blockchain hash
-    hash_value = blockchain.log_action(
+    hash_value = await blockchain.log_action(
         usn=participation["usn"],
         event_id=participation["event_id"],
         action=update_data.status,
@@ -220,9 +282,9 @@ async def update_participation_status(
         event_name=participation["event_name"]
     )
     
-    # Update in MongoDB
-    await collection.update_one(
-        {"_id": obj_id},
+    # Update in MongoDB, only if nobody changed the status since it was read
+    result = await collection.update_one(
+        {"_id": obj_id, "status": participation["status"]},
         {
             "$set": {
                 "status": update_data.status,
@@ -232,52 +294,202 @@ async def update_participation_status(
             }
         }
     )
+    if result.matched_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Participation status was changed concurrently; reload and retry"
+        )
+    
+    # Also update PostgreSQL approved_participants (insert on select, delete on drop)
+    await sync_approved_participants(
+        db, participation["event_id"], update_data.status, [(participation, hash_value)], current_user.id
+    )
     
-    # Also update/create in PostgreSQL for approved_participants table
     if update_data.status == "selected":
-        approved = ApprovedParticipant(
-            usn=participation["usn"],
-            event_id=participation["event_id"],
-            approved_by=current_user.id,
-            status="approved",
-            blockchain_hash=hash_value,
-            approved_at=datetime.utcnow()
-        )
-        db.add(approved)
-        await db.commit()
-        
-        # Send email notification to student
+        # Send email notification to student after the response goes out
         submissions_collection = get_database()["student_submissions"]
-        student_reg = await submissions_collection.find_one({"usn": participation["usn"]})
+        student_reg = await submissions_collection.find_one(
+            {"usn": participation["usn"]}, {"email": 1}
+        )
         
         if student_reg and student_reg.get("email"):
-            email_service.send_single_email(
+            subject, body = selection_email(participation["event_name"])
+            background_tasks.add_task(
+                email_service.send_single_email,
                 to_email=student_reg["email"],
-                subject=f"Congratulations! You've been selected for {participation['event_name']}",
-                body=f"""
-                <div style="font-family: Arial, sans-serif; padding: 20px;">
-                    <h2 style="color: #1e40af;">🎉 Selection Confirmed!</h2>
-                    <p>Dear <strong>{{{{student_name}}}}</strong>,</p>
-                    <p>We are pleased to inform you that you have been <strong>selected</strong> for:</p>
-                    <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                        <h3 style="margin: 0; color: #1e293b;">{participation['event_name']}</h3>
-                    </div>
-                    <p>Please report to the Sports Department for further instructions.</p>
-                    <p>Best regards,<br>RVCE Sports Department</p>
-                </div>
-                """,
+                subject=subject,
+                body=body,
                 recipient_name=participation["student_name"]
             )
     
     updated = await collection.find_one({"_id": obj_id})
     
-    return ParticipationResponse(
-        id=str(updated["_id"]),
-        usn=updated["usn"],
-        student_name=updated["student_name"],
-        event_id=updated["event_id"],
-        event_name=updated["event_name"],
-        status=updated["status"],
-        submitted_at=updated["submitted_at"],
-        blockchain_hash=updated.get("blockchain_hash")
+    return participation_response(updated)
+
+
+@router.post("/event/{event_id}/bulk-status", response_model=ParticipationBulkResponse)
+async def bulk_update_participation_status(
+    event_id: int,
+    update_data: ParticipationBulkUpdate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_postgres_session)
+):
+    """
+    Select or drop many participation requests for one event (Admin only).
+    
+    Uses one MongoDB bulk_write, one multi-row PostgreSQL write and one
+    batch of blockchain entries. Selected students are notified with a
+    single batched send after the response is returned.
+    """
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    collection = get_participation_collection()
+    results = {}
+    
+    # 1. Resolve targets (explicit IDs, or the whole pending roster)
+    if update_data.ids is not None:
+        obj_ids = []
+        requested_id = {}
+        for participation_id in dict.fromkeys(update_data.ids):
+            try:
+                obj_id = ObjectId(participation_id)
+                obj_ids.append(obj_id)
+                requested_id[obj_id] = participation_id
+            except Exception:
+                results[participation_id] = ParticipationBulkItemResult(
+                    id=participation_id, success=False, error="Invalid participation ID"
+                )
+        cursor = collection.find({"_id": {"$in": obj_ids}, "event_id": event_id})
+        found = {p["_id"]: p for p in await cursor.to_list(length=len(obj_ids))}
+        targets = []
+        for obj_id in obj_ids:
+            if obj_id in found:
+                targets.append(found[obj_id])
+            else:
+                key = requested_id[obj_id]
+                results[key] = ParticipationBulkItemResult(
+                    id=key, success=False, error="Participation request not found for this event"
+                )
+        order = list(dict.fromkeys(update_data.ids))
+    else:
+        cursor = collection.find({"event_id": event_id, "status": "pending"})
+        targets = await cursor.to_list(length=None)
+        requested_id = {p["_id"]: str(p["_id"]) for p in targets}
+        order = [str(p["_id"]) for p in targets]
+    
+    # Requests already in the target state are left alone
+    changes = []
+    for p in targets:
+        key = requested_id[p["_id"]]
+        if p["status"] == update_data.status:
+            results[key] = ParticipationBulkItemResult(
+                id=key, success=True, usn=p["usn"], blockchain_hash=p.get("blockchain_hash")
+            )
+        else:
+            changes.append(p)
+    
+    # 2. One batch of chain entries
+    hashes = await blockchain.log_batch([
+        {
+            "usn": p["usn"],
+            "event_id": event_id,
+            "action": update_data.status,
+            "admin_email": current_user.email,
+            "event_name": p["event_name"]
+        }
+        for p in changes
+    ])
+    
+    # 3. One bulk write to MongoDB
+    now = datetime.utcnow()
+    failed_indexes = {}
+    if changes:
+        operations = [
+            # Matching the status that was read keeps two concurrent bulk
+            # requests from both applying (and both inserting roster rows)
+            UpdateOne({"_id": p["_id"], "status": p["status"]}, {"$set": {
+                "status": update_data.status,
+                "processed_at": now,
+                "processed_by": current_user.email,
+                "blockchain_hash": hash_value
+            }})
+            for p, hash_value in zip(changes, hashes)
+        ]
+        matched = len(operations)
+        try:
+            matched = (await collection.bulk_write(operations, ordered=False)).matched_count
+        except BulkWriteError as e:
+            failed_indexes = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+            matched = e.details.get("nMatched", 0)
+        if matched < len(operations) - len(failed_indexes):
+            # Some filters missed: find out which rows now carry our hash
+            cursor = collection.find({"_id": {"$in": [p["_id"] for p in changes]}}, {"blockchain_hash": 1})
+            current = {d["_id"]: d.get("blockchain_hash") for d in await cursor.to_list(length=None)}
+            for index, (p, hash_value) in enumerate(zip(changes, hashes)):
+                if index not in failed_indexes and current.get(p["_id"]) != hash_value:
+                    failed_indexes[index] = "Status was changed concurrently; reload and retry"
+    
+    written = []
+    for index, (p, hash_value) in enumerate(zip(changes, hashes)):
+        key = requested_id[p["_id"]]
+        if index in failed_indexes:
+            results[key] = ParticipationBulkItemResult(id=key, success=False, usn=p["usn"], error=failed_indexes[index])
+            continue
+        written.append((p, hash_value))
+        results[key] = ParticipationBulkItemResult(id=key, success=True, usn=p["usn"], blockchain_hash=hash_value)
+    
+    # 4. One multi-row write to PostgreSQL
+    if written:
+        try:
+            await sync_approved_participants(db, event_id, update_data.status, written, current_user.id, now)
+        except SQLAlchemyError as e:
+            # MongoDB already holds the new status; report each item so the
+            # admin can retry them instead of getting a bare 500
+            await db.rollback()
+            error = f"Status saved but approved participants sync failed: {e.__class__.__name__}"
+            for p, hash_value in written:
+                key = requested_id[p["_id"]]
+                results[key] = ParticipationBulkItemResult(
+                    id=key, success=False, usn=p["usn"], blockchain_hash=hash_value, error=error
+                )
+            written = []
+    
+    # 5. One batched notification send, after the response
+    notifications_queued = 0
+    if update_data.status == "selected" and update_data.notify and written:
+        submissions_collection = get_database()["student_submissions"]
+        cursor = submissions_collection.find(
+            {"usn": {"$in": [p["usn"] for p, _ in written]}},
+            {"usn": 1, "email": 1, "student_name": 1, "branch": 1, "semester": 1}
+        )
+        recipients = [
+            {
+                "email": s["email"],
+                "name": s.get("student_name", "Student"),
+                "usn": s["usn"],
+                "branch": s.get("branch", ""),
+                "semester": s.get("semester", "")
+            }
+            for s in await cursor.to_list(length=None)
+            if s.get("email") and "@" in s["email"]
+        ]
+        if recipients:
+            subject, body = selection_email(event.name)
+            background_tasks.add_task(email_service.send_batch, recipients, subject, body)
+            notifications_queued = len(recipients)
+    
+    ordered = [results[key] for key in order if key in results]
+    succeeded = sum(1 for r in ordered if r.success)
+    
+    return ParticipationBulkResponse(
+        event_id=event_id,
+        status=update_data.status,
+        succeeded=succeeded,
+        failed=len(ordered) - succeeded,
+        notifications_queued=notifications_queued,
+        results=ordered
     )
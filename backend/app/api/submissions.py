@@ -1,17 +1,32 @@
 """Student Submissions API endpoints."""
+import base64
+import json
 from datetime import datetime
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from bson import ObjectId
 from app.db.mongodb import get_database
 from app.models.sql_models import User
 from app.schemas.schemas import (
-    StudentSubmissionCreate, StudentSubmissionUpdate, StudentSubmissionResponse
+    StudentSubmissionCreate, StudentSubmissionUpdate, StudentSubmissionResponse,
+    BulkStatusUpdate, BulkStatusItemResult, BulkStatusResponse,
+    ImportRowError, ImportResult
 )
 from app.core.security import get_current_admin_user, get_current_student
 from app.core.blockchain import blockchain
+from app.services.blob_store import blob_store, blob_url
+from app.services.counters import allocate_sln, reserve_slns
+from app.services.search_index import (
+    build_search_keys, search_keys_update, build_search_filter, build_exact_filter, needs_recheck, rank, score
+)
 
-from pymongo.errors import DuplicateKeyError
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from app.services.student_sync import outbox_update, student_sync_worker
+from app.services.submission_import import iter_import_rows, next_chunk, normalize_email
+from app.services.identity_cache import identity_cache, resolve_student_identity
 
 router = APIRouter(prefix="/submissions", tags=["Student Submissions"])
 
@@ -22,6 +37,56 @@ def get_submissions_collection():
     return db["student_submissions"]
 
 
+# Inline base64 images are never needed by list views
+LIST_PROJECTION = {"photo_base64": 0, "signature_base64": 0, "search_keys": 0}
+
+# Rows validated and written per insert_many call during imports
+IMPORT_CHUNK_SIZE = 500
+
+# Candidates fetched from the prefix index before ranking autocomplete results
+AUTOCOMPLETE_CANDIDATES = 50
+
+# Filtered "estimated" counts stop scanning the index after this many matches
+ESTIMATED_COUNT_CAP = 10000
+
+
+async def rechecked_docs(db_cursor, term: str, wanted: int) -> list:
+    """
+    Read from `db_cursor` until `wanted` documents really match `term`.
+    Prefix-index hits for query tokens longer than MAX_PREFIX_LEN can be false positives.
+    """
+    docs = []
+    async for doc in db_cursor.batch_size(wanted * 2):
+        if score(doc, term) > 0:
+            docs.append(doc)
+            if len(docs) >= wanted:
+                break
+    return docs
+
+
+def encode_cursor(doc: dict) -> str:
+    """Encode the (submitted_at, _id) keyset position of a document as an opaque token."""
+    payload = {"t": doc["submitted_at"].isoformat(), "id": str(doc["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """Decode a cursor token into a MongoDB filter for the rows after it."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        submitted_at = datetime.fromisoformat(payload["t"])
+        obj_id = ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    # Sort order is (submitted_at DESC, _id DESC)
+    return {"$or": [
+        {"submitted_at": {"$lt": submitted_at}},
+        {"submitted_at": submitted_at, "_id": {"$lt": obj_id}}
+    ]}
+
+
 @router.post("/", response_model=StudentSubmissionResponse, status_code=status.HTTP_201_CREATED)
 async def create_submission(
     submission: StudentSubmissionCreate,
@@ -44,9 +109,18 @@ async def create_submission(
             detail=f"A submission with USN {submission.usn} already exists"
         )
     
+    # Store uploads in the blob store; only references go into MongoDB
+    try:
+        photo_blob = await blob_store.put_base64(submission.photo_base64)
+        signature_blob = await blob_store.put_base64(submission.signature_base64)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     # Create submission document
     doc = {
-        **submission.model_dump(),
+        **submission.model_dump(exclude={"photo_base64", "signature_base64"}),
+        "photo_blob": photo_blob,
+        "signature_blob": signature_blob,
         "usn": submission.usn.upper(),
         "status": "pending",
         "sln": None,
@@ -55,7 +129,8 @@ async def create_submission(
         "reviewed_at": None,
         "reviewed_by": None,
         "email": student["email"],
-        "firebase_uid": student["uid"]
+        "firebase_uid": student["uid"],
+        "search_keys": build_search_keys(submission.student_name, submission.usn)
     }
     
     try:
@@ -86,7 +161,9 @@ async def create_submission(
         contact_address=doc.get("contact_address"),
         email=doc.get("email"),
         photo_base64=doc.get("photo_base64"),
-        signature_base64=doc.get("signature_base64")
+        signature_base64=doc.get("signature_base64"),
+        photo_url=blob_url(doc.get("photo_blob")),
+        signature_url=blob_url(doc.get("signature_blob"))
     )
 
 
@@ -97,15 +174,16 @@ async def get_my_submission(
     """Get current student's submission (if exists)."""
     student = await get_current_student(authorization)
     
+    identity = await resolve_student_identity(student)
+    if not identity:
+        return None
+    
     collection = get_submissions_collection()
-    doc = await collection.find_one({
-        "$or": [
-            {"email": student["email"]},
-            {"firebase_uid": student["uid"]}
-        ]
-    })
+    doc = await collection.find_one({"_id": identity["id"]}, {"search_keys": 0})
     
     if not doc:
+        # Submission was deleted since it was cached
+        identity_cache.invalidate_submission(identity)
         return None
     
     return StudentSubmissionResponse(
@@ -128,7 +206,129 @@ async def get_my_submission(
         contact_address=doc.get("contact_address"),
         email=doc.get("email"),
         photo_base64=doc.get("photo_base64"),
-        signature_base64=doc.get("signature_base64")
+        signature_base64=doc.get("signature_base64"),
+        photo_url=blob_url(doc.get("photo_blob")),
+        signature_url=blob_url(doc.get("signature_blob"))
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_submissions(
+    file: UploadFile = File(..., description="CSV or XLSX with one student per row"),
+    dry_run: bool = Query(False, description="Validate only, do not write"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Bulk import student registrations from a department spreadsheet (Admin only).
+    
+    The file is read as a stream and processed in chunks: each row is validated
+    with StudentSubmissionCreate and valid rows are written with
+    insert_many(ordered=False). Validation and duplicate-USN errors are
+    reported per row; nothing is written in dry-run mode.
+    """
+    collection = get_submissions_collection()
+    
+    try:
+        rows = iter_import_rows(file.file, file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    errors = []
+    total_rows = 0
+    valid_rows = 0
+    inserted = 0
+    seen_usns = set()
+    
+    while True:
+        # Parsing is blocking file I/O; keep it off the event loop
+        try:
+            chunk = await run_in_threadpool(next_chunk, rows, IMPORT_CHUNK_SIZE)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not read file: {e}")
+        if not chunk:
+            break
+        total_rows += len(chunk)
+        
+        # 1. Validate rows
+        docs = []
+        doc_rows = []
+        for row_number, record in chunk:
+            usn = (record.get("usn") or "").upper() or None
+            try:
+                submission = StudentSubmissionCreate(**record)
+            except ValidationError as e:
+                first = e.errors()[0]
+                field = ".".join(str(part) for part in first["loc"])
+                errors.append(ImportRowError(row=row_number, usn=usn, error=f"{field}: {first['msg']}"))
+                continue
+            
+            usn = submission.usn.upper()
+            try:
+                email = normalize_email(record.get("email"))
+            except ValueError as e:
+                errors.append(ImportRowError(row=row_number, usn=usn, error=f"email: {e}"))
+                continue
+            if usn in seen_usns:
+                errors.append(ImportRowError(row=row_number, usn=usn, error="Duplicate USN within file"))
+                continue
+            seen_usns.add(usn)
+            
+            now = datetime.utcnow()
+            docs.append({
+                **submission.model_dump(exclude={"photo_base64", "signature_base64"}),
+                "photo_blob": None,
+                "signature_blob": None,
+                "usn": usn,
+                "status": "pending",
+                "sln": None,
+                "rejection_reason": None,
+                "submitted_at": now,
+                "reviewed_at": None,
+                "reviewed_by": None,
+                "email": email,
+                "firebase_uid": None,
+                "imported_by": current_user.email,
+                "search_keys": build_search_keys(submission.student_name, usn)
+            })
+            doc_rows.append(row_number)
+        
+        valid_rows += len(docs)
+        if not docs:
+            continue
+        
+        # 2. Dry run: report USNs that already exist (one indexed $in per chunk)
+        if dry_run:
+            existing = await collection.find(
+                {"usn": {"$in": [d["usn"] for d in docs]}}, {"usn": 1}
+            ).to_list(length=len(docs))
+            existing_usns = {d["usn"] for d in existing}
+            for doc, row_number in zip(docs, doc_rows):
+                if doc["usn"] in existing_usns:
+                    errors.append(ImportRowError(row=row_number, usn=doc["usn"], error="USN already registered"))
+            continue
+        
+        # 3. Write the chunk; duplicates fail individually without stopping the rest
+        try:
+            result = await collection.insert_many(docs, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            inserted += e.details.get("nInserted", 0)
+            for err in write_errors:
+                doc = docs[err["index"]]
+                message = "USN already registered" if err.get("code") == 11000 else err.get("errmsg", "Write failed")
+                errors.append(ImportRowError(row=doc_rows[err["index"]], usn=doc["usn"], error=message))
+    
+    errors.sort(key=lambda e: e.row)
+    
+    return ImportResult(
+        filename=file.filename or "",
+        dry_run=dry_run,
+        total_rows=total_rows,
+        valid_rows=valid_rows,
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors
     )
 
 
@@ -140,9 +340,17 @@ async def list_submissions(
     search: Optional[str] = Query(None, description="Search by name or USN"),
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from a previous page's next_cursor"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """List all submissions with filtering (Admin only)."""
+    """
+    List all submissions with filtering (Admin only).
+    
+    Pass `cursor` (from `next_cursor`) to page by keyset instead of skip, so
+    deep pages cost the same as page 1. `count=estimated|none` avoids a full
+    count on every request.
+    """
     collection = get_submissions_collection()
     
     # Build query
@@ -153,19 +361,43 @@ async def list_submissions(
         query["branch"] = branch
     if semester:
         query["semester"] = semester
+    recheck = False
     if search:
-        query["$or"] = [
-            {"student_name": {"$regex": search, "$options": "i"}},
-            {"usn": {"$regex": search, "$options": "i"}}
-        ]
+        query.update(build_search_filter(search))
+        recheck = needs_recheck(search)
     
     # Get total count
-    total = await collection.count_documents(query)
+    total = None
+    total_is_estimate = False
+    if count == "exact":
+        total = await collection.count_documents(query)
+    elif count == "estimated":
+        if query:
+            total = await collection.count_documents(query, limit=ESTIMATED_COUNT_CAP)
+            total_is_estimate = total >= ESTIMATED_COUNT_CAP
+        else:
+            total = await collection.estimated_document_count()
+            total_is_estimate = True
+    # Index matches for truncated terms are an upper bound
+    if total is not None and recheck:
+        total_is_estimate = True
     
-    # Get paginated results
-    skip = (page - 1) * per_page
-    cursor = collection.find(query).sort("submitted_at", -1).skip(skip).limit(per_page)
-    docs = await cursor.to_list(length=per_page)
+    # Get paginated results (one extra row tells us whether another page exists)
+    page_query = query
+    if cursor:
+        page_query = {"$and": [query, decode_cursor(cursor)]} if query else decode_cursor(cursor)
+    
+    db_cursor = collection.find(page_query, LIST_PROJECTION).sort([("submitted_at", -1), ("_id", -1)])
+    if not cursor:
+        db_cursor = db_cursor.skip((page - 1) * per_page)
+    if recheck:
+        docs = await rechecked_docs(db_cursor, search, per_page + 1)
+    else:
+        docs = await db_cursor.limit(per_page + 1).to_list(length=per_page + 1)
+    
+    has_more = len(docs) > per_page
+    docs = docs[:per_page]
+    next_cursor = encode_cursor(docs[-1]) if has_more and docs else None
     
     submissions = [
         {
@@ -178,8 +410,8 @@ async def list_submissions(
             "sln": doc.get("sln"),
             "submitted_at": doc["submitted_at"],
             "reviewed_at": doc.get("reviewed_at"),
-            "photo_base64": doc.get("photo_base64"),
-            "signature_base64": doc.get("signature_base64"),
+            "photo_url": blob_url(doc.get("photo_blob")),
+            "signature_url": blob_url(doc.get("signature_blob")),
             "date_of_birth": doc.get("date_of_birth"),
             "blood_group": doc.get("blood_group"),
             "phone": doc.get("phone"),
@@ -194,12 +426,61 @@ async def list_submissions(
     return {
         "submissions": submissions,
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "page": page,
         "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
+        "pages": (total + per_page - 1) // per_page if total is not None else None,
+        "has_more": has_more,
+        "next_cursor": next_cursor
     }
 
 
+@router.get("/search/autocomplete")
+async def autocomplete_submissions(
+    q: str = Query(..., min_length=1, description="Name or USN prefix"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(8, ge=1, le=25),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Ranked name/USN suggestions served from the prefix index (Admin only)."""
+    collection = get_submissions_collection()
+    
+    query = build_search_filter(q)
+    if not query:
+        return []
+    if status:
+        query["status"] = status
+    
+    exact_query = build_exact_filter(q)
+    if status:
+        exact_query["status"] = status
+    
+    # Whole-token hits first, so they are never crowded out of the candidate
+    # window by longer names sharing the prefix
+    projection = {"student_name": 1, "usn": 1, "branch": 1, "semester": 1, "status": 1}
+    candidates = await collection.find(exact_query, projection).limit(AUTOCOMPLETE_CANDIDATES).to_list(
+        length=AUTOCOMPLETE_CANDIDATES
+    )
+    seen = [doc["_id"] for doc in candidates]
+    if seen:
+        query["_id"] = {"$nin": seen}
+    candidates += await collection.find(query, projection).limit(AUTOCOMPLETE_CANDIDATES).to_list(
+        length=AUTOCOMPLETE_CANDIDATES
+    )
+    
+    return [
+        {
+            "id": str(doc["_id"]),
+            "student_name": doc["student_name"],
+            "usn": doc["usn"],
+            "branch": doc.get("branch"),
+            "semester": doc.get("semester"),
+            "status": doc.get("status")
+        }
+        for doc in rank(candidates, q, limit=limit)
+    ]
+
+
 @router.get("/{submission_id}")
 async def get_submission(
     submission_id: str,
@@ -219,6 +500,9 @@ async def get_submission(
         raise HTTPException(status_code=404, detail="Submission not found")
     
     doc["id"] = str(doc.pop("_id"))
+    doc.pop("search_keys", None)
+    doc["photo_url"] = blob_url(doc.get("photo_blob"))
+    doc["signature_url"] = blob_url(doc.get("signature_blob"))
     return doc
 
 
@@ -244,6 +528,11 @@ async def update_submission_status(
     # 1. Prepare Update Dictionary
     update_fields = update_data.model_dump(exclude_unset=True)
     
+    # Keep the prefix search index in step with name/USN edits
+    search_keys = search_keys_update(update_fields, doc)
+    if search_keys is not None:
+        update_fields["search_keys"] = search_keys
+    
     # Handle logic if Status is changing
     if "status" in update_fields:
         update_fields["reviewed_at"] = datetime.utcnow()
@@ -251,15 +540,11 @@ async def update_submission_status(
         
         # If approving, assign SLN if not present
         if update_fields["status"] == "approved" and not doc.get("sln"):
-            max_sln = await collection.find_one(
-                {"sln": {"$ne": None}},
-                sort=[("sln", -1)]
-            )
-            update_fields["sln"] = (max_sln.get("sln", 0) if max_sln else 0) + 1
+            update_fields["sln"] = await allocate_sln()
 
             # Blockchain Log (use new USN if updated, else old)
             target_usn = update_fields.get("usn", doc["usn"])
-            hash_value = blockchain.log_action(
+            hash_value = await blockchain.log_action(
                 usn=target_usn,
                 event_id=0,
                 action="approved",
@@ -269,62 +554,23 @@ async def update_submission_status(
             update_fields["blockchain_hash"] = hash_value
             
     # 2. Perform MongoDB Update
+    # Approved students (new approvals or edits) are queued for the Postgres
+    # sync worker in the same write, so this request never waits on Postgres.
     if update_fields:
-        await collection.update_one({"_id": obj_id}, {"$set": update_fields})
-    
-    # 3. Fetch Updated Document
-    updated = await collection.find_one({"_id": obj_id})
-    
-    # 4. Sync to PostgreSQL if Status is Approved (or if just updating details for an already approved student)
-    if updated["status"] == "approved":
-        from app.db.postgres import get_postgres_session
-        from app.models.sql_models import Student
-        from sqlalchemy import select
+        if update_fields.get("status", doc["status"]) == "approved":
+            update = outbox_update(update_fields)
+        else:
+            update = {"$set": update_fields}
         
-        gen = get_postgres_session()
-        pg_session = await anext(gen)
-        
-        try:
-            # Check if student exists (by USN)
-            result = await pg_session.execute(select(Student).where(Student.usn == updated["usn"]))
-            existing_student = result.scalar_one_or_none()
-            
-            if existing_student:
-                # Update existing
-                existing_student.name = updated["student_name"]
-                existing_student.email = updated.get("email")
-                existing_student.branch = updated["branch"]
-                existing_student.semester = updated["semester"]
-                existing_student.phone = updated.get("phone")
-                existing_student.dob = updated.get("date_of_birth")
-                existing_student.blood_group = updated.get("blood_group")
-                existing_student.parent_name = updated.get("parent_name")
-                existing_student.mother_name = updated.get("mother_name")
-                existing_student.address = updated.get("contact_address")
-            else:
-                # Create new
-                new_student = Student(
-                    usn=updated["usn"],
-                    name=updated["student_name"],
-                    email=updated.get("email"),
-                    branch=updated["branch"],
-                    semester=updated["semester"],
-                    phone=updated.get("phone"),
-                    dob=updated.get("date_of_birth"),
-                    blood_group=updated.get("blood_group"),
-                    parent_name=updated.get("parent_name"),
-                    mother_name=updated.get("mother_name"),
-                    address=updated.get("contact_address")
-                )
-                pg_session.add(new_student)
-            
-            await pg_session.commit()
-            print(f"✅ Synced student {updated['usn']} to PostgreSQL.")
-            
-        except Exception as e:
-            print(f"❌ Failed to sync to Postgres: {e}")
-        finally:
-            await pg_session.close()
+        # 3. Fetch Updated Document
+        updated = await collection.find_one_and_update(
+            {"_id": obj_id}, update, return_document=ReturnDocument.AFTER
+        )
+        if "pg_sync.pending" in update["$set"]:
+            student_sync_worker.notify()
+        identity_cache.invalidate_submission(doc, new_email=update_fields.get("email"))
+    else:
+        updated = doc
 
     return StudentSubmissionResponse(
         id=str(updated["_id"]),
@@ -345,7 +591,123 @@ async def update_submission_status(
         contact_address=updated.get("contact_address"),
         email=updated.get("email"),
         photo_base64=updated.get("photo_base64"),
-        signature_base64=updated.get("signature_base64")
+        signature_base64=updated.get("signature_base64"),
+        photo_url=blob_url(updated.get("photo_blob")),
+        signature_url=blob_url(updated.get("signature_blob"))
+    )
+
+
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_submission_status(
+    request: BulkStatusUpdate,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Approve or reject many submissions at once (Admin only).
+    
+    Uses one MongoDB bulk_write, one SLN block reservation and one batch of
+    blockchain entries. Approved students are queued in the same write for
+    the Postgres sync worker, which upserts them in multi-row batches. Each
+    ID gets its own success/failure entry in the response.
+    """
+    collection = get_submissions_collection()
+    results = {}
+    
+    # 1. Parse IDs (keep request order, drop repeats)
+    obj_ids = []
+    requested_id = {}
+    for submission_id in dict.fromkeys(request.ids):
+        try:
+            obj_id = ObjectId(submission_id)
+            obj_ids.append(obj_id)
+            requested_id[obj_id] = submission_id
+        except Exception:
+            results[submission_id] = BulkStatusItemResult(id=submission_id, success=False, error="Invalid submission ID")
+    
+    # 2. Load all targets in one query
+    cursor = collection.find({"_id": {"$in": obj_ids}}, LIST_PROJECTION)
+    docs = {doc["_id"]: doc for doc in await cursor.to_list(length=len(obj_ids))}
+    
+    targets = []
+    for obj_id in obj_ids:
+        if obj_id in docs:
+            targets.append(docs[obj_id])
+        else:
+            key = requested_id[obj_id]
+            results[key] = BulkStatusItemResult(id=key, success=False, error="Submission not found")
+    
+    # 3. Build per-document updates
+    now = datetime.utcnow()
+    updates = {}
+    for doc in targets:
+        fields = {
+            "status": request.action,
+            "reviewed_at": now,
+            "reviewed_by": current_user.email
+        }
+        if request.action == "rejected":
+            fields["rejection_reason"] = request.rejection_reason
+        updates[doc["_id"]] = fields
+    
+    if request.action == "approved":
+        needs_sln = [doc for doc in targets if not doc.get("sln")]
+        if needs_sln:
+            slns = await reserve_slns(len(needs_sln))
+            hashes = await blockchain.log_batch([
+                {
+                    "usn": doc["usn"],
+                    "event_id": 0,
+                    "action": "approved",
+                    "admin_email": current_user.email,
+                    "event_name": "Student Registration"
+                }
+                for doc in needs_sln
+            ])
+            for doc, sln, hash_value in zip(needs_sln, slns, hashes):
+                updates[doc["_id"]]["sln"] = sln
+                updates[doc["_id"]]["blockchain_hash"] = hash_value
+    
+    # 4. Single bulk write to MongoDB
+    failed_indexes = {}
+    if targets:
+        if request.action == "approved":
+            operations = [UpdateOne({"_id": doc["_id"]}, outbox_update(updates[doc["_id"]], now)) for doc in targets]
+        else:
+            operations = [UpdateOne({"_id": doc["_id"]}, {"$set": updates[doc["_id"]]}) for doc in targets]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+    
+    written = []
+    for index, doc in enumerate(targets):
+        key = requested_id[doc["_id"]]
+        if index in failed_indexes:
+            results[key] = BulkStatusItemResult(id=key, success=False, usn=doc["usn"], error=failed_indexes[index])
+            continue
+        doc.update(updates[doc["_id"]])
+        written.append(doc)
+        identity_cache.invalidate_submission(doc)
+        results[key] = BulkStatusItemResult(
+            id=key,
+            success=True,
+            usn=doc["usn"],
+            sln=doc.get("sln"),
+            blockchain_hash=doc.get("blockchain_hash")
+        )
+    
+    # 5. Approved students reach PostgreSQL through the sync worker
+    if request.action == "approved" and written:
+        student_sync_worker.notify()
+    
+    ordered = [results[i] for i in dict.fromkeys(request.ids) if i in results]
+    succeeded = sum(1 for r in ordered if r.success)
+    
+    return BulkStatusResponse(
+        action=request.action,
+        succeeded=succeeded,
+        failed=len(ordered) - succeeded,
+        results=ordered
     )
 
 
@@ -362,10 +724,12 @@ async def delete_submission(
     except:
         raise HTTPException(status_code=400, detail="Invalid submission ID")
     
-    result = await collection.delete_one({"_id": obj_id})
+    doc = await collection.find_one_and_delete({"_id": obj_id}, {"email": 1, "firebase_uid": 1})
     
-    if result.deleted_count == 0:
+    if not doc:
         raise HTTPException(status_code=404, detail="Submission not found")
+    
+    identity_cache.invalidate_submission(doc)
 
 
 @router.get("/sports/list")
@@ -0,0 +1,64 @@
+"""In-process cache of authenticated admin principals, keyed by the JWT subject."""
+from threading import Lock
+from typing import Optional
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from app.core.config import settings
+from app.models.sql_models import User
+
+# Columns kept in the cache; the password hash never is
+PRINCIPAL_FIELDS = ("id", "email", "role", "created_at")
+
+
+class AdminPrincipalCache:
+    """Bounded TTL cache of sub (admin email) -> users row snapshot."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sub: str) -> Optional[User]:
+        with self._lock:
+            snapshot = self._cache.get(sub)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Fresh transient instance per request so handlers never share state
+        return User(**snapshot)
+
+    def put(self, sub: str, user: User):
+        snapshot = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        with self._lock:
+            self._cache[sub] = snapshot
+
+    def invalidate(self, sub: Optional[str]):
+        if not sub:
+            return
+        with self._lock:
+            self._cache.pop(sub, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+admin_principal_cache = AdminPrincipalCache(
+    maxsize=settings.ADMIN_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.ADMIN_PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_admin_principal(mapper, connection, target):
+    # Any ORM write to a users row drops its cached principal in this process;
+    # the TTL bounds staleness for changes made elsewhere
+    admin_principal_cache.invalidate(target.email)
+    for previous_email in inspect(target).attrs.email.history.deleted:
+        admin_principal_cache.invalidate(previous_email)
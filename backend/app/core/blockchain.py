@@ -1,24 +1,73 @@
-"""Simulated blockchain logging for audit trail using SHA-256 hash chain."""
+"""Blockchain-style audit ledger: a SHA-256 hash chain persisted in MongoDB.
+
+Entries live in the append-only ``blockchain_ledger`` collection. Each
+entry's ``_id`` is its position in one global sequence, so the chain
+survives restarts and is shared by every worker process. The unique ``_id``
+is also the serialization point. A writer reads the head, chains its entries
+to it and inserts them at head+1, head+2, and so on. If another process took
+those slots first, the insert hits a duplicate key and the writer retries
+from the new head. An entry therefore always links to the entry actually
+stored before it.
+
+Within a process, callers are group-committed. Entries that arrive while a
+write is in flight are queued and written together in the next
+``insert_many``, so under load one round trip serves many approvals.
+
+Every LEDGER_BLOCK_SIZE entries are sealed into a block in ``ledger_blocks``.
+A block stores the Merkle root of its entry hashes and is chained to the
+previous block's header hash. Any entry can then be proven with a
+logarithmic Merkle path instead of by replaying the chain (see
+app.services.ledger).
+"""
+import asyncio
 import hashlib
 import json
+import random
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Tuple
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.core.config import settings
+from app.core.merkle import merkle_root, block_header_hash
+from app.db.mongodb import get_ledger_collection, get_ledger_blocks_collection
+
+GENESIS_HASH = "0" * 64  # Genesis block hash
+
+DUPLICATE_KEY = 11000
+MAX_APPEND_CONFLICTS = 100
+CONFLICT_BACKOFF_SECONDS = 0.005
+
+
+class LedgerConflict(RuntimeError):
+    """Raised when a group could not be appended after repeated sequence conflicts."""
 
 
 class BlockchainLogger:
-    """Simulates a blockchain for tamper-proof approval logs."""
-    
-    _previous_hash: str = "0" * 64  # Genesis block hash
-    
+    """Tamper-evident approval log with a persisted, globally ordered hash chain."""
+
+    def __init__(self):
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._seal_lock = asyncio.Lock()
+        self.entries_written = 0
+        self.groups_written = 0
+        self.blocks_sealed = 0
+        self.largest_group = 0
+        self.conflicts = 0
+
     @classmethod
     def _calculate_hash(cls, data: dict) -> str:
         """Calculate SHA-256 hash of the data."""
         data_string = json.dumps(data, sort_keys=True, default=str)
         return hashlib.sha256(data_string.encode()).hexdigest()
-    
-    @classmethod
-    def log_action(
-        cls,
+
+    @staticmethod
+    def _entry_data(entry: dict) -> dict:
+        """The hashed part of a stored entry."""
+        return {key: value for key, value in entry.items() if key not in ("_id", "hash")} | {"seq": entry["_id"]}
+
+    async def log_action(
+        self,
         usn: str,
         event_id: int,
         action: str,  # "approved" or "rejected" or "selected" or "dropped"
@@ -26,33 +75,184 @@ class BlockchainLogger:
         event_name: Optional[str] = None
     ) -> str:
         """
-        Create a new block in the hash chain.
-        
-        Returns the hash of this block which can be stored for verification.
+        Append an entry to the ledger.
+
+        Returns the hash of this entry which can be stored for verification.
         """
-        block_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+        hashes = await self.log_batch([{
             "usn": usn,
             "event_id": event_id,
             "event_name": event_name,
             "action": action,
-            "admin_email": admin_email,
-            "previous_hash": cls._previous_hash
-        }
-        
-        current_hash = cls._calculate_hash(block_data)
-        cls._previous_hash = current_hash
-        
-        print(f"🔗 Blockchain: {action.upper()} | USN: {usn} | Event: {event_id} | Hash: {current_hash[:16]}...")
-        
-        return current_hash
-    
+            "admin_email": admin_email
+        }])
+        print(f"🔗 Blockchain: {action.upper()} | USN: {usn} | Event: {event_id} | Hash: {hashes[0][:16]}...")
+        return hashes[0]
+
+    async def log_batch(self, actions: List[dict]) -> List[str]:
+        """
+        Append several entries to the ledger.
+
+        Each item takes the same keyword arguments as log_action.
+        Returns the hashes in the same order as the input.
+        """
+        if not actions:
+            return []
+        loop = asyncio.get_running_loop()
+        futures = []
+        for action in actions:
+            future = loop.create_future()
+            self._pending.append(({
+                "usn": action["usn"],
+                "event_id": action["event_id"],
+                "event_name": action.get("event_name"),
+                "action": action["action"],
+                "admin_email": action["admin_email"]
+            }, future))
+            futures.append(future)
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return list(await asyncio.gather(*futures))
+
+    async def _flush(self):
+        while self._pending:
+            if settings.LEDGER_GROUP_COMMIT_WAIT_MS:
+                # Let concurrent callers join this group
+                await asyncio.sleep(settings.LEDGER_GROUP_COMMIT_WAIT_MS / 1000)
+            group = self._pending[:settings.LEDGER_GROUP_COMMIT_MAX]
+            del self._pending[:len(group)]
+            try:
+                hashes = await self._append([entry for entry, _ in group])
+            except Exception as e:
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), hash_value in zip(group, hashes):
+                if not future.done():
+                    future.set_result(hash_value)
+            try:
+                await self.seal_blocks()
+            except Exception as e:
+                # Sealing catches up on the next group
+                print(f"⚠️ Ledger block sealing failed: {e}")
+
+    async def head(self) -> Tuple[int, str]:
+        """(seq, hash) of the newest entry; (0, GENESIS_HASH) for an empty ledger."""
+        entry = await get_ledger_collection().find_one({}, {"hash": 1}, sort=[("_id", DESCENDING)])
+        return (entry["_id"], entry["hash"]) if entry else (0, GENESIS_HASH)
+
+    async def _append(self, entries: List[dict]) -> List[str]:
+        """Write entries as consecutive ledger entries after the current head."""
+        collection = get_ledger_collection()
+        hashes = []
+        conflicts = 0
+        while entries:
+            seq, previous_hash = await self.head()
+            timestamp = datetime.utcnow().isoformat()
+            docs = []
+            for entry in entries:
+                seq += 1
+                doc = {"_id": seq, "timestamp": timestamp, **entry, "previous_hash": previous_hash}
+                doc["hash"] = previous_hash = self._calculate_hash(self._entry_data(doc))
+                docs.append(doc)
+
+            try:
+                await collection.insert_many(docs, ordered=True)
+                written = len(docs)
+            except BulkWriteError as e:
+                if any(error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+                    raise
+                written = e.details.get("nInserted", 0)
+            except DuplicateKeyError:
+                written = 0
+
+            hashes.extend(doc["hash"] for doc in docs[:written])
+            entries = entries[written:]
+            if entries:
+                # Another process appended first; rebuild the rest on the new head
+                conflicts += 1
+                self.conflicts += 1
+                if conflicts > MAX_APPEND_CONFLICTS:
+                    raise LedgerConflict(f"Gave up appending {len(entries)} entries after {conflicts} conflicts")
+                # Jittered backoff so competing writers stop colliding
+                await asyncio.sleep(random.uniform(0, min(conflicts, 10) * CONFLICT_BACKOFF_SECONDS))
+
+        self.entries_written += len(hashes)
+        self.groups_written += 1
+        self.largest_group = max(self.largest_group, len(hashes))
+        if len(hashes) > 1:
+            print(f"🔗 Blockchain: group of {len(hashes)} entries | Head: {hashes[-1][:16]}...")
+        return hashes
+
+    async def last_sealed_block(self) -> Optional[dict]:
+        return await get_ledger_blocks_collection().find_one({}, sort=[("_id", DESCENDING)])
+
+    async def seal_blocks(self) -> int:
+        """
+        Seal every complete run of LEDGER_BLOCK_SIZE unsealed entries into a
+        Merkle block. Safe to race with other processes: block contents are
+        deterministic and the block number is the unique _id.
+        """
+        async with self._seal_lock:
+            last = await self.last_sealed_block()
+            number = last["_id"] + 1 if last else 1
+            first_seq = last["last_seq"] + 1 if last else 1
+            previous_block_hash = last["block_hash"] if last else GENESIS_HASH
+            head_seq, _ = await self.head()
+            sealed = 0
+
+            while first_seq + settings.LEDGER_BLOCK_SIZE - 1 <= head_seq:
+                last_seq = first_seq + settings.LEDGER_BLOCK_SIZE - 1
+                entries = await get_ledger_collection().find(
+                    {"_id": {"$gte": first_seq, "$lte": last_seq}}, {"hash": 1}
+                ).sort("_id", 1).to_list(length=settings.LEDGER_BLOCK_SIZE)
+                root = merkle_root([entry["hash"] for entry in entries])
+                header = {
+                    "_id": number,
+                    "first_seq": first_seq,
+                    "last_seq": last_seq,
+                    "merkle_root": root,
+                    "previous_block_hash": previous_block_hash,
+                    "block_hash": block_header_hash(number, first_seq, last_seq, root, previous_block_hash),
+                    "sealed_at": datetime.utcnow()
+                }
+                try:
+                    await get_ledger_blocks_collection().insert_one(header)
+                    sealed += 1
+                except DuplicateKeyError:
+                    # Sealed concurrently by another process
+                    header = await get_ledger_blocks_collection().find_one({"_id": number})
+
+                number, first_seq, previous_block_hash = number + 1, header["last_seq"] + 1, header["block_hash"]
+
+            if sealed:
+                self.blocks_sealed += sealed
+                print(f"🧱 Ledger: sealed {sealed} block(s) up to entry {first_seq - 1}")
+            return sealed
+
     @classmethod
     def verify_hash(cls, data: dict, expected_hash: str) -> bool:
         """Verify that the data matches the expected hash."""
         calculated = cls._calculate_hash(data)
         return calculated == expected_hash
 
+    @classmethod
+    def verify_entry(cls, entry: dict, previous_hash: str) -> bool:
+        """Verify a stored entry's hash and its link to the previous entry."""
+        return entry["previous_hash"] == previous_hash and cls.verify_hash(cls._entry_data(entry), entry["hash"])
+
+    def stats(self) -> dict:
+        return {
+            "entries_written": self.entries_written,
+            "groups_written": self.groups_written,
+            "blocks_sealed": self.blocks_sealed,
+            "largest_group": self.largest_group,
+            "pending": len(self._pending),
+            "conflicts": self.conflicts
+        }
+
 
 # Singleton instance
 blockchain = BlockchainLogger()
@@ -28,6 +28,11 @@ class Settings(BaseSettings):
     FIREBASE_STORAGE_BUCKET: Optional[str] = None
     FIREBASE_MESSAGING_SENDER_ID: Optional[str] = None
     FIREBASE_APP_ID: Optional[str] = None
+    # "sdk": Admin SDK if initialized, else unverified decode (development)
+    # "jwks": verify locally against prefetched Google signing keys
+    FIREBASE_TOKEN_VERIFICATION: str = "sdk"
+    FIREBASE_JWKS_FILE: Optional[str] = None  # Local JWKS key source (tests)
+    FIREBASE_CLAIMS_CACHE_SIZE: int = 10000
     
     # Hardcoded Admin (as per spec)
     ADMIN_EMAIL: str = "khan2228zeenat@gmail.com"
@@ -41,6 +46,59 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAIL_FROM: str = "no-reply@rvce.edu.in"
     MAX_EMAILS_PER_BATCH: int = 100
+    SMTP_STARTTLS: bool = True
+    SMTP_TRANSPORT: str = "asyncio"  # asyncio (native, pipelined) or smtplib (threads)
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Delivery engine: pooled connections shared by concurrent senders
+    SMTP_POOL_SIZE: int = 4
+    SMTP_SENDERS: int = 4
+    SMTP_RATE_LIMIT_PER_SECOND: float = 0  # Provider limit; 0 disables
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100  # Recycle after this many
+    SMTP_POOL_IDLE_SECONDS: float = 60.0
+    # Per-recipient email outbox (retries / dead letters)
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BASE_BACKOFF_SECONDS: float = 30.0
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = 3600.0
+    EMAIL_OUTBOX_SENDING_TIMEOUT_SECONDS: float = 600.0  # Requeue rows stuck in "sending"
+    EMAIL_PROGRESS_INTERVAL_SECONDS: float = 1.0  # Max gap between SSE progress events (poll fallback)
+    EMAIL_PROGRESS_KEEPALIVE_SECONDS: float = 15.0  # Comment line so proxies keep idle streams open
+    EMAIL_PROGRESS_RATE_WINDOW_SECONDS: float = 10.0
+
+    # Mongo -> Postgres student sync worker
+    STUDENT_SYNC_BATCH_SIZE: int = 200
+    STUDENT_SYNC_POLL_SECONDS: float = 2.0
+    STUDENT_SYNC_BASE_BACKOFF_SECONDS: float = 5.0
+    STUDENT_SYNC_MAX_BACKOFF_SECONDS: float = 600.0
+
+    # Student identity cache (firebase uid/email -> USN)
+    IDENTITY_CACHE_SIZE: int = 10000
+    IDENTITY_CACHE_TTL_SECONDS: float = 60.0
+
+    # Admin principal cache (JWT sub -> users row)
+    ADMIN_PRINCIPAL_CACHE_SIZE: int = 1000
+    ADMIN_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+
+    # Durable background job queue
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BASE_BACKOFF_SECONDS: float = 10.0
+    JOB_MAX_BACKOFF_SECONDS: float = 600.0
+
+    # Blockchain ledger (group commit, Merkle blocks)
+    LEDGER_GROUP_COMMIT_MAX: int = 500  # Entries per insert_many
+    LEDGER_GROUP_COMMIT_WAIT_MS: float = 2.0  # Linger so concurrent approvals share a write; 0 disables
+    LEDGER_BLOCK_SIZE: int = 256  # Entries per sealed Merkle block
+    LEDGER_VERIFY_WORKERS: int = 0  # Verifier process pool size; 0 = CPU count
+
+    # Public events catalogue response cache
+    EVENTS_CACHE_SIZE: int = 256
+    EVENTS_CACHE_TTL_SECONDS: float = 30.0
+
+    # Blob Storage (student photos and signatures)
+    BLOB_STORAGE_DIR: str = "./blobs"
 
     class Config:
         env_file = ".env"
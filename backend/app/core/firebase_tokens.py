@@ -0,0 +1,209 @@
+"""Firebase ID token verification with claim caching and prefetched signing keys.
+
+Decoded claims are cached by token digest until the token's ``exp`` claim, so
+repeated student requests skip verification entirely. In ``jwks`` mode tokens
+are verified locally against Google's signing certificates, which are
+prefetched and refreshed in the background; the key source can be swapped for
+a local JWKS file (FIREBASE_JWKS_FILE) in tests.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+import httpx
+from jose import jwt, JWTError
+from app.core.config import settings
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class TokenVerificationError(Exception):
+    """Raised when a token cannot be verified."""
+
+
+class ClaimsCache:
+    """Bounded LRU of token digest -> decoded claims, each entry valid until its exp."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        key = self.digest(token)
+        self._entries[key] = (exp, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class GoogleCertKeySource:
+    """Google's x509 signing certificates for Firebase ID tokens (kid -> PEM)."""
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL):
+        self.url = url
+
+    async def fetch(self) -> tuple:
+        """Returns (keys, max_age_seconds)."""
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        match = MAX_AGE_PATTERN.search(response.headers.get("cache-control", ""))
+        max_age = int(match.group(1)) if match else 3600
+        return response.json(), max_age
+
+
+class JWKSFileKeySource:
+    """Signing keys from a local JWKS file (kid -> JWK dict). Used in tests."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def fetch(self) -> tuple:
+        with open(self.path) as f:
+            jwks = json.load(f)
+        keys = {key["kid"]: key for key in jwks.get("keys", []) if key.get("kid")}
+        return keys, 3600
+
+
+class SigningKeyCache:
+    """Holds the current signing keys and refreshes them before they expire."""
+
+    # Minimum gap between refetches triggered by an unknown kid
+    UNKNOWN_KID_REFETCH_SECONDS = 60
+
+    def __init__(self, source):
+        self.source = source
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _fetch(self):
+        keys, max_age = await self.source.fetch()
+        self._keys = keys
+        self._fetched_at = time.time()
+        self._expires_at = self._fetched_at + max_age
+        print(f"🔑 Loaded {len(keys)} Firebase signing keys (valid {max_age}s)")
+
+    async def refresh(self):
+        async with self._lock:
+            await self._fetch()
+
+    def _needs_fetch(self, kid: str) -> bool:
+        now = time.time()
+        if now >= self._expires_at:
+            return True
+        # Unknown kid usually means Google rotated keys since the last fetch
+        return kid not in self._keys and now - self._fetched_at >= self.UNKNOWN_KID_REFETCH_SECONDS
+
+    async def get(self, kid: str):
+        if self._needs_fetch(kid):
+            async with self._lock:
+                # Another request may have refreshed while we waited
+                if self._needs_fetch(kid):
+                    await self._fetch()
+        return self._keys.get(kid)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+                # Refresh at half-life so requests never wait on a fetch
+                delay = max((self._expires_at - time.time()) / 2, 60)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Firebase signing key refresh failed: {e}")
+                delay = 30
+            await asyncio.sleep(delay)
+
+
+def build_key_source():
+    if settings.FIREBASE_JWKS_FILE:
+        return JWKSFileKeySource(settings.FIREBASE_JWKS_FILE)
+    return GoogleCertKeySource()
+
+
+claims_cache = ClaimsCache(maxsize=settings.FIREBASE_CLAIMS_CACHE_SIZE)
+signing_keys = SigningKeyCache(build_key_source())
+
+
+async def verify_with_signing_keys(id_token: str) -> dict:
+    """Verify a Firebase ID token locally against the cached signing keys."""
+    project_id = settings.FIREBASE_PROJECT_ID
+    if not project_id:
+        raise TokenVerificationError("FIREBASE_PROJECT_ID is not configured")
+
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except JWTError as e:
+        raise TokenVerificationError(f"Malformed token: {e}")
+
+    kid = header.get("kid")
+    if header.get("alg") != "RS256" or not kid:
+        raise TokenVerificationError("Token must be RS256-signed with a key id")
+
+    key = await signing_keys.get(kid)
+    if key is None:
+        raise TokenVerificationError("Token signed with an unknown key")
+
+    try:
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"leeway": 60}
+        )
+    except JWTError as e:
+        raise TokenVerificationError(str(e))
+
+    if not claims.get("sub"):
+        raise TokenVerificationError("Token has no subject")
+    return claims
@@ -0,0 +1,66 @@
+"""Merkle trees over ledger entry hashes.
+
+Leaves and interior nodes are hashed with different prefixes (RFC 6962
+style), so a leaf can never be passed off as an interior node. When a level
+has an odd number of nodes, the last node is carried up unchanged. An
+inclusion proof is the list of sibling hashes from leaf to root, and checking
+it takes log2(n) hash operations.
+"""
+import hashlib
+from typing import List, Tuple
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+# Proof step: (sibling hash, "left" | "right" = side the sibling is on)
+ProofStep = Tuple[str, str]
+
+
+def leaf_hash(entry_hash: str) -> str:
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(entry_hash)).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def _next_level(level: List[str]) -> List[str]:
+    parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(entry_hashes: List[str]) -> str:
+    if not entry_hashes:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+    level = [leaf_hash(h) for h in entry_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_proof(entry_hashes: List[str], index: int) -> List[ProofStep]:
+    """Sibling path for the leaf at `index`."""
+    level = [leaf_hash(h) for h in entry_hashes]
+    proof = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], "left" if sibling < index else "right"))
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_proof(entry_hash: str, proof: List[ProofStep], root: str) -> bool:
+    current = leaf_hash(entry_hash)
+    for sibling, side in proof:
+        current = node_hash(sibling, current) if side == "left" else node_hash(current, sibling)
+    return current == root
+
+
+def block_header_hash(number: int, first_seq: int, last_seq: int, merkle_root_hash: str, previous_block_hash: str) -> str:
+    """Hash that chains a block's Merkle root to the previous block."""
+    data = f"{number}|{first_seq}|{last_seq}|{merkle_root_hash}|{previous_block_hash}"
+    return hashlib.sha256(data.encode()).hexdigest()
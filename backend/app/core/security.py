@@ -5,12 +5,14 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 import firebase_admin
 from firebase_admin import auth as firebase_auth, credentials
 from app.core.config import settings
-from app.db.postgres import get_postgres_session
+from app.core.firebase_tokens import claims_cache, verify_with_signing_keys, TokenVerificationError
+from app.core.admin_cache import admin_principal_cache
+from app.db.postgres import AsyncSessionLocal
 from app.models.sql_models import User
 
 # Password hashing
@@ -50,12 +52,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 async def get_current_admin_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_postgres_session)
+    token: Optional[str] = Depends(oauth2_scheme)
 ) -> User:
     """
     Dependency to get current authenticated admin user.
     Raises HTTPException if not authenticated.
+    
+    Principals are served from a short-TTL cache keyed by the token subject,
+    so most admin requests authenticate without touching PostgreSQL.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,18 +78,24 @@ async def get_current_admin_user(
     except JWTError:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    user = admin_principal_cache.get(email)
+    if user is not None:
+        return user
+    
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
     
     if user is None:
         raise credentials_exception
     
+    admin_principal_cache.put(email, user)
     return user
 
 
-def verify_firebase_token(id_token: str) -> dict:
+def _decode_firebase_token(id_token: str) -> dict:
     """
-    Verify a Firebase ID token and return the decoded claims.
+    Verify a Firebase ID token and return the decoded claims (blocking).
     
     For production, you need a Firebase service account.
     For development, we'll do client-side only verification.
@@ -122,6 +132,36 @@ def verify_firebase_token(id_token: str) -> dict:
             )
 
 
+async def verify_firebase_token(id_token: str) -> dict:
+    """
+    Verify a Firebase ID token, serving repeat tokens from the claims cache.
+    
+    Claims are cached by token digest until the token's exp claim. Misses
+    are verified in the threadpool (Admin SDK) or locally against cached
+    Google signing keys (FIREBASE_TOKEN_VERIFICATION=jwks).
+    """
+    cached = claims_cache.get(id_token)
+    if cached is not None:
+        return cached
+    
+    if settings.FIREBASE_TOKEN_VERIFICATION == "jwks":
+        try:
+            decoded = await verify_with_signing_keys(id_token)
+        except TokenVerificationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Invalid Firebase token: {str(e)}"
+            )
+    elif firebase_initialized:
+        # verify_id_token blocks (and may refresh certs), keep it off the event loop
+        decoded = await run_in_threadpool(_decode_firebase_token, id_token)
+    else:
+        decoded = _decode_firebase_token(id_token)
+    
+    claims_cache.put(id_token, decoded)
+    return decoded
+
+
 def check_rvce_domain(email: str) -> bool:
     """Check if email is from @rvce.edu.in domain."""
     return email.endswith("@rvce.edu.in")
@@ -141,7 +181,7 @@ async def get_current_student(
         )
     
     token = authorization.replace("Bearer ", "")
-    decoded = verify_firebase_token(token)
+    decoded = await verify_firebase_token(token)
     
     email = decoded.get("email")
     if not email:
@@ -1,11 +1,77 @@
 """MongoDB async connection using Motor."""
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.core.config import settings
 
 # Global database variables
 _client: AsyncIOMotorClient = None
 _db = None
 
+# Declared indexes for student_submissions.
+# Every list-view index ends in (submitted_at, _id) so filtered listings can
+# walk the keyset cursor straight off the index without an in-memory sort.
+SUBMISSION_INDEXES = [
+    # Enforce unique USN at database level
+    IndexModel([("usn", ASCENDING)], unique=True),
+    IndexModel([("submitted_at", DESCENDING), ("_id", DESCENDING)], name="list_all"),
+    IndexModel([("status", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)], name="list_status"),
+    IndexModel([("status", ASCENDING), ("branch", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)], name="list_status_branch"),
+    IndexModel([("status", ASCENDING), ("semester", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)], name="list_status_semester"),
+    IndexModel(
+        [("status", ASCENDING), ("branch", ASCENDING), ("semester", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)],
+        name="list_status_branch_semester"
+    ),
+    # Student portal identity lookups ($or on email / firebase_uid)
+    IndexModel([("email", ASCENDING)], name="email"),
+    IndexModel([("firebase_uid", ASCENDING)], name="firebase_uid"),
+    # Highest SLN lookup when seeding the counters collection
+    IndexModel([("sln", DESCENDING)], name="sln"),
+    # Multikey prefix index maintained by app.services.search_index
+    IndexModel([("search_keys", ASCENDING)], name="search_keys"),
+    IndexModel([("status", ASCENDING), ("search_keys", ASCENDING)], name="status_search_keys"),
+    # Postgres sync outbox (only pending records are indexed)
+    IndexModel(
+        [("pg_sync.next_attempt_at", ASCENDING)],
+        name="pg_sync_due",
+        partialFilterExpression={"pg_sync.pending": True}
+    ),
+    IndexModel(
+        [("pg_sync.queued_at", ASCENDING)],
+        name="pg_sync_lag",
+        partialFilterExpression={"pg_sync.pending": True}
+    ),
+]
+
+# Declared indexes for event_participation_requests
+PARTICIPATION_INDEXES = [
+    # Event rosters by status; also covers the usn-only projection used to
+    # join an event's selected participants to their submissions
+    IndexModel([("event_id", ASCENDING), ("status", ASCENDING), ("usn", ASCENDING)], name="event_status_usn"),
+    # Duplicate-request check and a student's own requests
+    IndexModel([("usn", ASCENDING), ("event_id", ASCENDING)], name="usn_event"),
+]
+
+# Declared indexes for the blockchain ledger (_id is the global entry sequence)
+LEDGER_INDEXES = [
+    IndexModel([("hash", ASCENDING)], name="hash"),
+    IndexModel([("usn", ASCENDING), ("_id", ASCENDING)], name="usn_seq"),
+]
+
+# Declared indexes for sealed Merkle blocks (_id is the block number)
+LEDGER_BLOCK_INDEXES = [
+    # Find the block containing an entry seq
+    IndexModel([("last_seq", ASCENDING)], name="last_seq", unique=True),
+]
+
+# Declared indexes for the durable background job queue (app.services.job_queue)
+JOB_INDEXES = [
+    # Claim the oldest due queued job
+    IndexModel([("status", ASCENDING), ("run_after", ASCENDING), ("created_at", ASCENDING)], name="claim_queued"),
+    # Reclaim running jobs whose worker lease expired (crash / restart)
+    IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="claim_expired"),
+    IndexModel([("type", ASCENDING), ("created_at", DESCENDING)], name="list_by_type"),
+]
+
 
 async def connect_to_mongo():
     """Connect to MongoDB Atlas."""
@@ -29,8 +95,11 @@ async def connect_to_mongo():
         # -----------------------------------------------------
         # Ensure Indexes
         # -----------------------------------------------------
-        # Enforce unique USN at database level
-        await _db["student_submissions"].create_index("usn", unique=True)
+        await _db["student_submissions"].create_indexes(SUBMISSION_INDEXES)
+        await _db["event_participation_requests"].create_indexes(PARTICIPATION_INDEXES)
+        await _db["jobs"].create_indexes(JOB_INDEXES)
+        await _db["blockchain_ledger"].create_indexes(LEDGER_INDEXES)
+        await _db["ledger_blocks"].create_indexes(LEDGER_BLOCK_INDEXES)
         
     except Exception as e:
         print(f"❌ MongoDB Connection Failed: {e}")
@@ -67,3 +136,18 @@ def get_participation_collection():
 def get_audit_logs_collection():
     """Get audit logs collection."""
     return get_database()["audit_logs"]
+
+
+def get_jobs_collection():
+    """Get background jobs collection."""
+    return get_database()["jobs"]
+
+
+def get_ledger_collection():
+    """Get the append-only blockchain ledger collection."""
+    return get_database()["blockchain_ledger"]
+
+
+def get_ledger_blocks_collection():
+    """Get the sealed Merkle blocks of the blockchain ledger."""
+    return get_database()["ledger_blocks"]
@@ -1,4 +1,5 @@
 """PostgreSQL async database connection using SQLAlchemy."""
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
@@ -51,10 +52,23 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def _create_missing_indexes(sync_conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                # Savepoint, so one failed index does not abort startup
+                with sync_conn.begin_nested():
+                    index.create(sync_conn, checkfirst=True)
+            except IntegrityError as e:
+                print(f"⚠️ Unique index {index.name} not created, {table.name} has duplicate rows: {e.orig}")
+
+
 async def init_postgres_db():
     """Create all tables in the PostgreSQL database."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all only indexes new tables; add indexes declared since then
+        await conn.run_sync(_create_missing_indexes)
     print("✅ PostgreSQL tables created successfully")
 
 
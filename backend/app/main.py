@@ -5,9 +5,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.mongodb import connect_to_mongo, close_mongo_connection
 from app.db.postgres import init_postgres_db
+from app.services.counters import ensure_sln_counter
+from app.services.student_sync import student_sync_worker
+from app.services.identity_cache import identity_cache
+from app.core.firebase_tokens import claims_cache, signing_keys
+from app.core.admin_cache import admin_principal_cache
+from app.services.events_cache import events_cache
+from app.services.job_queue import job_queue
+from app.services.email_service import email_service
+from app.services.email_outbox import email_outbox_worker
+from app.core.blockchain import blockchain
+from app.services.ledger import shutdown_verify_pool
 
 # Import routers
-from app.api import auth, submissions, events, participation, export, email, attendance, analytics
+from app.api import auth, submissions, events, participation, export, email, attendance, analytics, blobs, jobs, ledger
 
 
 @asynccontextmanager
@@ -18,16 +29,30 @@ async def lifespan(app: FastAPI):
     
     # Connect to MongoDB
     await connect_to_mongo()
+    await ensure_sln_counter()
     
     # Initialize PostgreSQL tables
     await init_postgres_db()
     
+    # Background workers
+    student_sync_worker.start()
+    job_queue.start()
+    email_outbox_worker.start()
+    if settings.FIREBASE_TOKEN_VERIFICATION == "jwks":
+        signing_keys.start()
+    
     print("✅ All systems operational!")
     
     yield
     
     # Shutdown
     print("👋 Shutting down...")
+    await student_sync_worker.stop()
+    await job_queue.stop()
+    await email_outbox_worker.stop()
+    await email_service.close()
+    await signing_keys.stop()
+    await shutdown_verify_pool()
     await close_mongo_connection()
 
 
@@ -61,6 +86,9 @@ app.include_router(export.router, prefix="/api")
 app.include_router(email.router, prefix="/api")
 app.include_router(attendance.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
+app.include_router(blobs.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(ledger.router, prefix="/api")
 
 
 @app.get("/")
@@ -81,5 +109,14 @@ async def health_check():
         "databases": {
             "mongodb": "connected",
             "postgresql": "connected"
-        }
+        },
+        "student_sync": await student_sync_worker.metrics(),
+        "job_queue": await job_queue.metrics(),
+        "smtp_pool": email_service.pool.stats(),
+        "email_outbox": await email_outbox_worker.metrics(),
+        "identity_cache": identity_cache.stats(),
+        "firebase_claims_cache": claims_cache.stats(),
+        "admin_principal_cache": admin_principal_cache.stats(),
+        "events_cache": events_cache.stats(),
+        "blockchain_ledger": blockchain.stats()
     }
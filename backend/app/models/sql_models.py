@@ -1,6 +1,6 @@
 """SQL Models for PostgreSQL database."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date, Index, text
 from sqlalchemy.orm import relationship
 from app.db.postgres import Base
 
@@ -60,6 +60,11 @@ class Event(Base):
     # Relationships
     creator = relationship("User", back_populates="events_created")
     participants = relationship("ApprovedParticipant", back_populates="event")
+    
+    __table_args__ = (
+        # Event listing date-range filters and ordering
+        Index("ix_events_start_end", "start_date", "end_date"),
+    )
 
 
 class ApprovedParticipant(Base):
@@ -78,6 +83,11 @@ class ApprovedParticipant(Base):
     # Relationships
     event = relationship("Event", back_populates="participants")
     approver = relationship("User", back_populates="approvals_made")
+    
+    __table_args__ = (
+        # Grouped participant counts per event
+        Index("ix_approved_participants_event_status", "event_id", "status"),
+    )
 
 
 class EmailAuditLog(Base):
@@ -99,6 +109,71 @@ class EmailAuditLog(Base):
     sender = relationship("User")
 
 
+class EmailCampaign(Base):
+    """Full subject/body of a bulk email, kept so outbox rows can be retried."""
+    __tablename__ = "email_campaigns"
+    
+    audit_log_id = Column(Integer, ForeignKey("email_audit_logs.id", ondelete="CASCADE"), primary_key=True)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmailOutbox(Base):
+    """Per-recipient delivery record of a bulk email (queued, sending, sent, failed, dead)."""
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    audit_log_id = Column(Integer, ForeignKey("email_audit_logs.id", ondelete="CASCADE"), nullable=False)
+    email = Column(String(255), nullable=False)
+    # Template variables
+    name = Column(String(255))
+    usn = Column(String(20))
+    branch = Column(String(100))
+    semester = Column(String(10))
+    status = Column(String(10), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(Text)
+    sent_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Worker claims due rows; the partial index stays small once rows are sent
+        Index(
+            "ix_email_outbox_due", "next_attempt_at",
+            postgresql_where=text("status IN ('queued', 'failed')")
+        ),
+        Index("ix_email_outbox_log_status", "audit_log_id", "status"),
+    )
+
+
+class EmailAuditChainLink(Base):
+    """
+    Position of an EmailAuditLog in the hash chain. Appends are serialized by
+    an advisory lock; the unique seq turns any fork into a constraint error.
+    """
+    __tablename__ = "email_audit_chain"
+    
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    audit_log_id = Column(Integer, ForeignKey("email_audit_logs.id"), nullable=False, unique=True)
+    prev_hash = Column(String(128), nullable=False)
+    chain_hash = Column(String(128), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmailAuditCheckpoint(Base):
+    """A chain prefix (up to seq) that a verification run found intact."""
+    __tablename__ = "email_audit_checkpoints"
+    
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False, index=True)
+    chain_hash = Column(String(128), nullable=False)
+    verified_at = Column(DateTime, default=datetime.utcnow)
+    verified_by = Column(Integer, ForeignKey("users.id"))
+
+
 class EventAttendance(Base):
     """Attendance records for event participants."""
     __tablename__ = "event_attendance"
@@ -115,3 +190,9 @@ class EventAttendance(Base):
     # Relationships
     event = relationship("Event")
     admin = relationship("User")
+    
+    __table_args__ = (
+        # One mark per participant per day; the conflict target of attendance upserts.
+        # Existing duplicates must be removed first: python dedupe_attendance.py
+        Index("uq_event_attendance_event_usn_date", "event_id", "usn", "attendance_date", unique=True),
+    )
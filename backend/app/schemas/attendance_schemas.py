@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict
 from datetime import date, datetime
 
 
@@ -31,3 +31,38 @@ class EventDateInfo(BaseModel):
     start_date: date
     end_date: date
     dates: List[date]
+
+
+class AttendanceMatrixRow(BaseModel):
+    usn: str
+    student_name: Optional[str] = None
+    statuses: str  # One character per event day, see AttendanceMatrixResponse.legend
+
+
+class AttendanceCellChange(BaseModel):
+    usn: str
+    day: int  # Index into dates
+    status: str  # Status code
+
+
+class AttendanceMatrixResponse(BaseModel):
+    event_id: int
+    dates: List[date]
+    legend: Dict[str, Optional[str]]  # Status code -> status
+    version: Optional[datetime] = None  # Pass back as `since` to fetch a delta
+    full: bool  # False for a delta
+    roster_size: int  # Refetch in full if this differs from the client's roster after applying the delta
+    participants: List[AttendanceMatrixRow]  # Delta: only participants selected since `since`
+    changes: List[AttendanceCellChange] = []  # Delta: cells marked since `since`
+    dropped: List[str] = []  # Delta: USNs dropped from the roster since `since`
+
+
+class AttendanceCellEdit(BaseModel):
+    usn: str
+    student_name: Optional[str] = None
+    attendance_date: date
+    status: Optional[str] = None  # "present", "absent", or null
+
+
+class AttendanceMatrixUpdate(BaseModel):
+    changes: List[AttendanceCellEdit]
@@ -24,8 +24,59 @@ class EmailLogResponse(BaseModel):
     success_count: int
     sent_at: datetime
     filters_used: str
+    progress_url: Optional[str] = None  # SSE stream while the campaign is delivering
 
 class EmailPreviewResponse(BaseModel):
     recipient_count: int
     sample_recipients: List[str]  # List of names
     estimated_time: str
+
+
+class OutboxEntryResponse(BaseModel):
+    id: int
+    audit_log_id: int
+    email: str
+    name: Optional[str] = None
+    usn: Optional[str] = None
+    status: str  # queued, sending, sent, failed, dead
+    attempts: int
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CampaignStatusResponse(BaseModel):
+    audit_log_id: int
+    total: int
+    counts: Dict[str, int]  # Outbox rows per status
+
+class OutboxRedriveRequest(BaseModel):
+    ids: Optional[List[int]] = None  # Specific outbox rows; all failed/dead rows when omitted
+    include_dead: bool = True
+
+class OutboxRedriveResponse(BaseModel):
+    audit_log_id: int
+    requeued: int
+
+class CampaignProgress(BaseModel):
+    audit_log_id: int
+    total: int
+    sent: int
+    failed: int  # Failed (awaiting retry) + dead
+    retrying: int  # Failed rows that will be retried after backoff
+    remaining: int  # Queued + sending
+    rate_per_second: float  # Messages completed per second over the recent window
+    done: bool  # Nothing left queued or sending
+
+class AuditChainVerifyResponse(BaseModel):
+    valid: bool
+    full: bool  # False when resumed from the latest checkpoint
+    start_seq: int  # First link recomputed by this run
+    checked: int
+    head_seq: int
+    head_hash: Optional[str] = None
+    broken_seq: Optional[int] = None
+    broken_log_id: Optional[int] = None
+    reason: Optional[str] = None
@@ -1,6 +1,6 @@
 """Pydantic schemas for API request/response validation."""
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Optional, List, Any, Dict
 from datetime import datetime, date
 from enum import Enum
 
@@ -64,6 +64,10 @@ class EventResponse(BaseModel):
         from_attributes = True
 
 
+class EventCreateResponse(EventResponse):
+    announcement_job_id: Optional[str] = None  # Poll GET /api/jobs/{id} for progress
+
+
 # ==================== STUDENT SUBMISSION ====================
 
 class StudentSubmissionCreate(BaseModel):
@@ -101,6 +105,44 @@ class StudentSubmissionUpdate(BaseModel):
     email: Optional[str] = None
 
 
+class BulkStatusUpdate(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+    action: str = Field(..., pattern="^(approved|rejected)$")
+    rejection_reason: Optional[str] = None
+
+
+class BulkStatusItemResult(BaseModel):
+    id: str
+    success: bool
+    error: Optional[str] = None
+    usn: Optional[str] = None
+    sln: Optional[int] = None
+    blockchain_hash: Optional[str] = None
+
+
+class BulkStatusResponse(BaseModel):
+    action: str
+    succeeded: int
+    failed: int
+    results: List[BulkStatusItemResult]
+
+
+class ImportRowError(BaseModel):
+    row: int
+    usn: Optional[str] = None
+    error: str
+
+
+class ImportResult(BaseModel):
+    filename: str
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+
+
 class StudentSubmissionResponse(BaseModel):
     id: str
     student_name: str
@@ -123,9 +165,11 @@ class StudentSubmissionResponse(BaseModel):
     contact_address: Optional[str] = None
     email: Optional[str] = None
     
-    # Files
+    # Files (legacy inline base64, or blob URLs served by /api/blobs)
     photo_base64: Optional[str] = None
     signature_base64: Optional[str] = None
+    photo_url: Optional[str] = None
+    signature_url: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -152,6 +196,30 @@ class ParticipationUpdate(BaseModel):
     status: str  # selected, dropped
 
 
+class ParticipationBulkUpdate(BaseModel):
+    status: str = Field(..., pattern="^(selected|dropped)$")
+    # Omit to apply the decision to every pending request for the event
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=2000)
+    notify: bool = True
+
+
+class ParticipationBulkItemResult(BaseModel):
+    id: str
+    success: bool
+    error: Optional[str] = None
+    usn: Optional[str] = None
+    blockchain_hash: Optional[str] = None
+
+
+class ParticipationBulkResponse(BaseModel):
+    event_id: int
+    status: str
+    succeeded: int
+    failed: int
+    notifications_queued: int = 0
+    results: List[ParticipationBulkItemResult]
+
+
 # ==================== EXPORT ====================
 
 class ExportRequest(BaseModel):
@@ -159,3 +227,58 @@ class ExportRequest(BaseModel):
     status: Optional[str] = "approved"
     include_header: bool = True
     include_footer: bool = True
+
+
+# ==================== BACKGROUND JOBS ====================
+
+class JobStatusResponse(BaseModel):
+    id: str
+    type: str
+    status: str  # queued, running, completed, failed
+    total: int = 0
+    processed: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0  # Possibly delivered before a worker crash; never resent
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+# ==================== LEDGER ====================
+
+class LedgerBlockHeader(BaseModel):
+    number: int
+    first_seq: int
+    last_seq: int
+    merkle_root: str
+    previous_block_hash: str
+    block_hash: str  # sha256("number|first_seq|last_seq|merkle_root|previous_block_hash")
+    sealed_at: Optional[datetime] = None
+
+
+class LedgerProofStep(BaseModel):
+    hash: str
+    side: str  # Side of the sibling: "left" -> H(01|sibling|node), "right" -> H(01|node|sibling)
+
+
+class LedgerProofResponse(BaseModel):
+    entry_hash: str
+    seq: int
+    entry: Dict[str, Any]
+    sealed: bool  # False until the entry's block is full; no proof yet
+    leaf_index: Optional[int] = None
+    proof: List[LedgerProofStep] = []
+    block: Optional[LedgerBlockHeader] = None
+
+
+class LedgerVerifyResponse(BaseModel):
+    valid: bool
+    blocks_checked: int
+    entries_checked: int
+    unsealed_entries: int
+    workers: int
+    elapsed_seconds: float
+    errors: List[str] = []
@@ -0,0 +1,55 @@
+"""Event announcement emails, delivered through the durable job queue."""
+from typing import List, Tuple
+from app.models.sql_models import Event
+from app.services.email_service import email_service
+from app.services.job_queue import JobHandler, job_queue
+from app.services.recipients import RecipientResolver
+
+EVENT_ANNOUNCEMENT_JOB = "event_announcement"
+
+
+def announcement_email(event: Event) -> Tuple[str, str]:
+    """Subject and body template for a new-event announcement."""
+    subject = f"New Event: {event.name} - RVCE Sports"
+    body = f"""
+            <div style="font-family: Arial, sans-serif; padding: 20px;">
+                <h2 style="color: #1e40af;">🏆 New Sports Event Announced!</h2>
+                <p>Dear <strong>{{{{student_name}}}}</strong>,</p>
+                <p>A new sports event has been announced:</p>
+                <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                    <h3 style="margin: 0; color: #1e293b;">{event.name}</h3>
+                    <p style="margin: 8px 0 0 0; color: #64748b;">📍 {event.location or 'TBD'}</p>
+                    <p style="margin: 4px 0 0 0; color: #64748b;">📅 {event.start_date} - {event.end_date}</p>
+                </div>
+                <p>Log in to the Student Portal to register your participation.</p>
+                <p>Best regards,<br>RVCE Sports Department</p>
+            </div>
+            """
+    return subject, body
+
+
+class EventAnnouncementHandler(JobHandler):
+    """Emails every approved student about a new event."""
+
+    async def prepare(self, job: dict) -> List[dict]:
+        recipients = []
+        async for batch in RecipientResolver(None).batches():
+            recipients.extend(batch)
+        return recipients
+
+    async def process(self, job: dict, items: List[dict]) -> Tuple[int, int]:
+        payload = job["payload"]
+        return await email_service.send_batch(items, payload["subject"], payload["body"])
+
+
+job_queue.register(EVENT_ANNOUNCEMENT_JOB, EventAnnouncementHandler())
+
+
+async def enqueue_event_announcement(event: Event, created_by: str = None) -> str:
+    """Queue announcement emails for a new event. Returns the job id."""
+    subject, body = announcement_email(event)
+    return await job_queue.enqueue(
+        EVENT_ANNOUNCEMENT_JOB,
+        {"event_id": event.id, "subject": subject, "body": body},
+        created_by=created_by
+    )
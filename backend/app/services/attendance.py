@@ -0,0 +1,184 @@
+"""Event attendance persistence helpers and the participants x days attendance matrix."""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from sqlalchemy import Table, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.mongodb import get_participation_collection
+from app.models.sql_models import Event, EventAttendance
+
+# 7 bound parameters per row; stays well below asyncpg's 32767 limit
+UPSERT_CHUNK_SIZE = 1000
+
+CONFLICT_KEY = ("event_id", "usn", "attendance_date")
+
+
+def attendance_rows(event_id: int, attendance_date: date, records: Iterable, marked_by: int) -> List[dict]:
+    """
+    Rows for one day of marks. A USN listed twice keeps its last mark, since
+    one INSERT ... ON CONFLICT cannot touch the same row twice.
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for record in records:
+        rows[record.usn] = {
+            "event_id": event_id,
+            "usn": record.usn,
+            "student_name": record.student_name,
+            "attendance_date": attendance_date,
+            "status": record.status,
+            "marked_by": marked_by,
+            "marked_at": now
+        }
+    return list(rows.values())
+
+
+def attendance_edit_rows(event_id: int, edits: Iterable, marked_by: int) -> List[dict]:
+    """Rows for individual cell edits across any days (last edit of a cell wins)."""
+    now = datetime.utcnow()
+    rows = {}
+    for edit in edits:
+        rows[(edit.usn, edit.attendance_date)] = {
+            "event_id": event_id,
+            "usn": edit.usn,
+            "student_name": edit.student_name,
+            "attendance_date": edit.attendance_date,
+            "status": edit.status,
+            "marked_by": marked_by,
+            "marked_at": now
+        }
+    return list(rows.values())
+
+
+def upsert_statement(rows: List[dict], table: Table = EventAttendance.__table__):
+    """Multi-row INSERT ... ON CONFLICT (event_id, usn, attendance_date) DO UPDATE."""
+    statement = pg_insert(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c[column] for column in CONFLICT_KEY],
+        set_={
+            "status": statement.excluded.status,
+            "marked_by": statement.excluded.marked_by,
+            "marked_at": statement.excluded.marked_at
+        }
+    )
+
+
+async def upsert_attendance(session: AsyncSession, rows: List[dict]) -> int:
+    """Insert or update attendance marks in one statement per chunk (caller commits)."""
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        await session.execute(upsert_statement(rows[start:start + UPSERT_CHUNK_SIZE]))
+    return len(rows)
+
+
+# ==================== ATTENDANCE MATRIX ====================
+
+# One character per event day in a participant's status string
+STATUS_CODES = {"present": "P", "absent": "A", None: "-"}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+UNKNOWN_CODE = "?"
+
+# Delta reads re-send marks this far before `since`, so a save that committed
+# after the client's read, with a slightly older marked_at, is not missed
+DELTA_OVERLAP = timedelta(seconds=5)
+
+PARTICIPANT_PROJECTION = {"_id": 0, "usn": 1, "student_name": 1, "processed_at": 1}
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; convert an aware `since` to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def status_code(status: Optional[str]) -> str:
+    return STATUS_CODES.get(status.lower() if status else None, UNKNOWN_CODE)
+
+
+def event_dates(event: Event) -> List[date]:
+    """Every day from the event's start date to its end date."""
+    days = []
+    current = event.start_date
+    while current <= event.end_date:
+        days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+@dataclass
+class AttendanceMatrix:
+    """Selected participants x event days, one status string per participant."""
+    event_id: int
+    dates: List[date]
+    participants: List[dict]  # usn, student_name, processed_at, statuses
+    changes: List[dict] = field(default_factory=list)  # Delta only: usn, day, status code
+    dropped: List[str] = field(default_factory=list)  # Delta only: USNs no longer selected
+    version: Optional[datetime] = None  # Newest marked_at seen
+    roster_size: int = 0
+    full: bool = True
+
+
+async def build_attendance_matrix(db: AsyncSession, event: Event, since: Optional[datetime] = None) -> AttendanceMatrix:
+    """
+    Build the whole grid from one roster query and one attendance query.
+    With `since` (a previous version), return only the cells marked since then,
+    participants selected since then and the USNs dropped since then.
+    """
+    dates = event_dates(event)
+    day_index = {day: i for i, day in enumerate(dates)}
+
+    roster = get_participation_collection().find(
+        {"event_id": event.id, "status": "selected"}, PARTICIPANT_PROJECTION
+    )
+    participants = [p async for p in roster]
+
+    query = select(
+        EventAttendance.usn, EventAttendance.attendance_date, EventAttendance.status, EventAttendance.marked_at
+    ).where(EventAttendance.event_id == event.id)
+    if since is not None:
+        query = query.where(EventAttendance.marked_at > since - DELTA_OVERLAP)
+    marks = (await db.execute(query)).all()
+
+    version = await db.scalar(select(func.max(EventAttendance.marked_at)).where(EventAttendance.event_id == event.id))
+    matrix = AttendanceMatrix(
+        event_id=event.id, dates=dates, participants=[], version=version,
+        roster_size=len(participants), full=since is None
+    )
+
+    if since is not None:
+        roster_usns = {p["usn"] for p in participants}
+        # Dropping sets processed_at too, so a drop plus a new selection in one
+        # interval is visible even though the roster size is unchanged
+        dropped = get_participation_collection().find(
+            {"event_id": event.id, "status": {"$ne": "selected"}, "processed_at": {"$gt": since - DELTA_OVERLAP}},
+            {"_id": 0, "usn": 1}
+        )
+        matrix.dropped = sorted({p["usn"] async for p in dropped} - roster_usns)
+
+        new_usns = set()
+        for p in participants:
+            if p.get("processed_at") and p["processed_at"] > since - DELTA_OVERLAP:
+                new_usns.add(p["usn"])
+                matrix.participants.append({**p, "statuses": "-" * len(dates)})
+        rows = {p["usn"]: p for p in matrix.participants}
+        for usn, marked_on, status, _ in marks:
+            if usn not in roster_usns or marked_on not in day_index:
+                continue
+            if usn in new_usns:
+                _set_code(rows[usn], day_index[marked_on], status_code(status))
+            else:
+                matrix.changes.append({"usn": usn, "day": day_index[marked_on], "status": status_code(status)})
+        return matrix
+
+    cells = {p["usn"]: ["-"] * len(dates) for p in participants}
+    for usn, marked_on, status, _ in marks:
+        if usn in cells and marked_on in day_index:
+            cells[usn][day_index[marked_on]] = status_code(status)
+    matrix.participants = [{**p, "statuses": "".join(cells[p["usn"]])} for p in participants]
+    return matrix
+
+
+def _set_code(row: dict, day: int, code: str):
+    statuses = row["statuses"]
+    row["statuses"] = statuses[:day] + code + statuses[day + 1:]
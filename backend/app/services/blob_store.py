@@ -0,0 +1,138 @@
+"""Content-addressed blob storage for student photos and signatures.
+
+Uploads are decoded once, written to local disk keyed by their SHA-256 digest
+and shared between every document that references the same bytes. MongoDB only
+keeps the digest plus a small metadata record in the ``blobs`` collection.
+"""
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.mongodb import get_database
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+DATA_URL_PATTERN = re.compile(r"^data:(?P<mime>[\w.+-]+/[\w.+-]+)?(;[\w=.+-]+)*;base64,", re.IGNORECASE)
+
+# Magic numbers for uploads that arrive without a data: URL prefix
+_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"RIFF", "image/webp"),
+]
+
+
+def get_blobs_collection():
+    """Get blob metadata collection from MongoDB."""
+    return get_database()["blobs"]
+
+
+def decode_base64_upload(value: str) -> tuple:
+    """
+    Decode a base64 upload (optionally a data: URL).
+
+    Returns (raw_bytes, content_type).
+    """
+    content_type = None
+    match = DATA_URL_PATTERN.match(value)
+    if match:
+        content_type = match.group("mime")
+        value = value[match.end():]
+
+    try:
+        # Line breaks from wrapped encoders are fine; any other stray character is rejected
+        data = base64.b64decode("".join(value.split()), validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 upload: {e}")
+
+    if not content_type:
+        content_type = "application/octet-stream"
+        for magic, mime in _SIGNATURES:
+            if data.startswith(magic):
+                content_type = mime
+                break
+
+    return data, content_type
+
+
+class BlobStore:
+    """Stores binary uploads on local disk, deduplicated by SHA-256."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or settings.BLOB_STORAGE_DIR)
+
+    def path_for(self, digest: str) -> str:
+        """Sharded on-disk path for a digest (ab/cd/abcd...)."""
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.isfile(self.path_for(digest))
+
+    def write_bytes(self, data: bytes) -> str:
+        """Write bytes to disk if not already present. Returns the hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if os.path.isfile(path):
+            return digest
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file in the same directory, then atomically rename
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return digest
+
+    async def put(self, data: bytes, content_type: str) -> Dict[str, Any]:
+        """Store bytes and upsert their metadata. Returns the blob reference."""
+        digest = await run_in_threadpool(self.write_bytes, data)
+        await get_blobs_collection().update_one(
+            {"_id": digest},
+            {"$setOnInsert": {
+                "size": len(data),
+                "content_type": content_type,
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        return {"hash": digest, "content_type": content_type, "size": len(data)}
+
+    async def put_base64(self, value: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Decode and store a base64 upload. Returns None for empty input."""
+        if not value:
+            return None
+        data, content_type = decode_base64_upload(value)
+        if not data:
+            return None
+        return await self.put(data, content_type)
+
+    async def get_metadata(self, digest: str) -> Optional[dict]:
+        return await get_blobs_collection().find_one({"_id": digest})
+
+
+def blob_url(ref: Optional[dict]) -> Optional[str]:
+    """API URL for a stored blob reference (requires the viewer's credentials)."""
+    if not ref or not ref.get("hash"):
+        return None
+    return f"/api/blobs/{ref['hash']}"
+
+
+# Singleton instance
+blob_store = BlobStore()
@@ -0,0 +1,57 @@
+"""Atomic sequence counters backed by the MongoDB ``counters`` collection."""
+from pymongo import ReturnDocument
+from app.db.mongodb import get_database
+
+SLN_COUNTER = "sln"
+
+
+def get_counters_collection():
+    """Get counters collection from MongoDB."""
+    return get_database()["counters"]
+
+
+async def reserve_block(name: str, count: int = 1) -> int:
+    """
+    Atomically reserve `count` consecutive numbers from a counter.
+    Returns the first number of the block; the block is [first, first + count).
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    doc = await get_counters_collection().find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc["seq"] - count + 1
+
+
+async def allocate_sln() -> int:
+    """Allocate a single SLN for an approval."""
+    return await reserve_block(SLN_COUNTER, 1)
+
+
+async def reserve_slns(count: int) -> list:
+    """Reserve SLNs for a bulk approval in one round trip."""
+    first = await reserve_block(SLN_COUNTER, count)
+    return list(range(first, first + count))
+
+
+async def ensure_sln_counter():
+    """
+    Make sure the SLN counter is never behind the highest assigned SLN.
+    Safe to call on every startup: $max never moves the counter backwards.
+    """
+    submissions = get_database()["student_submissions"]
+    top = await submissions.find_one(
+        {"sln": {"$ne": None}},
+        sort=[("sln", -1)],
+        projection={"sln": 1}
+    )
+    current_max = (top or {}).get("sln") or 0
+    await get_counters_collection().update_one(
+        {"_id": SLN_COUNTER},
+        {"$max": {"seq": current_max}},
+        upsert=True
+    )
@@ -0,0 +1,148 @@
+"""Hash chain over EmailAuditLog, with checkpointed incremental verification.
+
+Each campaign is appended to ``email_audit_chain`` in the same transaction
+that creates its log row. The append holds a transaction-scoped Postgres
+advisory lock, so concurrent campaigns get consecutive sequence numbers and
+can never both link to the same predecessor. A verification run that finds
+the chain intact records a checkpoint (seq + hash). The next run only
+recomputes the links added after it.
+
+A link hashes only fields that never change after creation. Success and
+failure counts are still being updated by the outbox when the link is
+written, so they are not part of the hash.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.sql_models import EmailAuditLog, EmailAuditChainLink, EmailAuditCheckpoint
+
+GENESIS_HASH = "GENESIS_HASH"
+
+# pg_advisory_xact_lock key reserved for email audit chain appends
+CHAIN_LOCK_KEY = 0x454D41494C  # "EMAIL"
+
+VERIFY_FETCH_SIZE = 1000
+
+
+def link_hash(prev_hash: str, seq: int, log: EmailAuditLog) -> str:
+    data = "|".join([
+        prev_hash,
+        str(seq),
+        str(log.id),
+        str(log.admin_id),
+        log.sent_at.isoformat(),
+        log.subject,
+        log.body_preview or "",
+        log.filters_used or "",
+        str(log.recipient_count or 0)
+    ])
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+async def append_to_chain(session: AsyncSession, log: EmailAuditLog) -> EmailAuditChainLink:
+    """
+    Link a flushed log row to the chain head and set its blockchain_hash.
+    Call right before committing: the advisory lock is held until the commit.
+    """
+    await session.execute(select(func.pg_advisory_xact_lock(CHAIN_LOCK_KEY)))
+
+    head = (await session.execute(
+        select(EmailAuditChainLink).order_by(desc(EmailAuditChainLink.seq)).limit(1)
+    )).scalar_one_or_none()
+    if head:
+        seq, prev_hash = head.seq + 1, head.chain_hash
+    else:
+        # First link anchors to the newest log hashed before the chain existed
+        legacy = (await session.execute(
+            select(EmailAuditLog.blockchain_hash)
+            .where(EmailAuditLog.id != log.id)
+            .order_by(desc(EmailAuditLog.id))
+            .limit(1)
+        )).scalar_one_or_none()
+        seq, prev_hash = 1, legacy or GENESIS_HASH
+
+    link = EmailAuditChainLink(
+        seq=seq,
+        audit_log_id=log.id,
+        prev_hash=prev_hash,
+        chain_hash=link_hash(prev_hash, seq, log)
+    )
+    session.add(link)
+    log.blockchain_hash = link.chain_hash
+    return link
+
+
+@dataclass
+class ChainVerification:
+    valid: bool
+    full: bool
+    start_seq: int  # Links before this were covered by the checkpoint
+    checked: int
+    head_seq: int
+    head_hash: Optional[str]
+    broken_seq: Optional[int] = None
+    broken_log_id: Optional[int] = None
+    reason: Optional[str] = None
+
+
+async def verify_chain(session: AsyncSession, full: bool = False, verified_by: Optional[int] = None) -> ChainVerification:
+    """
+    Recompute the chain from the latest checkpoint (or from the start when
+    `full`). If it is intact, records a new checkpoint at the head. The caller
+    commits.
+    """
+    checkpoint = None
+    if not full:
+        checkpoint = (await session.execute(
+            select(EmailAuditCheckpoint).order_by(desc(EmailAuditCheckpoint.seq)).limit(1)
+        )).scalar_one_or_none()
+
+    expected_prev, last_seq = None, 0
+    if checkpoint:
+        # The checkpointed link itself must still carry the recorded hash
+        anchor = await session.get(EmailAuditChainLink, checkpoint.seq)
+        if anchor is None or anchor.chain_hash != checkpoint.chain_hash:
+            return ChainVerification(
+                valid=False, full=False, start_seq=checkpoint.seq, checked=0,
+                head_seq=checkpoint.seq, head_hash=checkpoint.chain_hash,
+                broken_seq=checkpoint.seq, broken_log_id=anchor.audit_log_id if anchor else None,
+                reason="Checkpointed link was modified or removed"
+            )
+        expected_prev, last_seq = checkpoint.chain_hash, checkpoint.seq
+
+    result = ChainVerification(
+        valid=True, full=full, start_seq=last_seq + 1, checked=0, head_seq=last_seq, head_hash=expected_prev
+    )
+    rows = await session.stream(
+        select(EmailAuditChainLink, EmailAuditLog)
+        .join(EmailAuditLog, EmailAuditLog.id == EmailAuditChainLink.audit_log_id)
+        .where(EmailAuditChainLink.seq > last_seq)
+        .order_by(EmailAuditChainLink.seq)
+        .execution_options(yield_per=VERIFY_FETCH_SIZE)
+    )
+    async for link, log in rows:
+        reason = None
+        if link.seq != last_seq + 1:
+            reason = f"Missing link(s) after seq {last_seq}"
+        elif expected_prev is not None and link.prev_hash != expected_prev:
+            reason = "prev_hash does not match the previous link"
+        elif link.chain_hash != link_hash(link.prev_hash, link.seq, log):
+            reason = "Log contents do not match the stored hash"
+        elif log.blockchain_hash != link.chain_hash:
+            reason = "Log blockchain_hash differs from the chain"
+
+        if reason:
+            result.valid = False
+            result.broken_seq, result.broken_log_id, result.reason = link.seq, log.id, reason
+            await rows.close()
+            return result
+
+        expected_prev, last_seq = link.chain_hash, link.seq
+        result.checked += 1
+        result.head_seq, result.head_hash = last_seq, expected_prev
+
+    if result.checked:
+        session.add(EmailAuditCheckpoint(seq=result.head_seq, chain_hash=result.head_hash, verified_by=verified_by))
+    return result
@@ -0,0 +1,325 @@
+"""Per-recipient outbox for bulk emails (email_outbox, linked to EmailAuditLog).
+
+Every recipient of a campaign gets a row that moves through these states:
+queued -> sending -> sent, or failed (retried with exponential backoff) ->
+dead. Workers claim rows with ``FOR UPDATE SKIP LOCKED``, so several workers
+or processes never send the same row concurrently.
+
+A campaign interrupted by a restart resumes by itself: its queued rows are
+still due, and rows stuck in ``sending`` are requeued after
+EMAIL_OUTBOX_SENDING_TIMEOUT_SECONDS.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import select, update, func, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.postgres import AsyncSessionLocal
+from app.models.sql_models import EmailAuditLog, EmailCampaign, EmailOutbox
+from app.services.email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+DUE_STATUSES = ("queued", "failed")
+IN_FLIGHT_STATUSES = ("queued", "sending")
+
+
+class ProgressSignal:
+    """Wakes everyone waiting for outbox progress; each publish arms a fresh event."""
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def publish(self):
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, timeout: float):
+        event = self._event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Published after every committed outbox batch (progress streams listen to it)
+outbox_progress = ProgressSignal()
+
+
+def outbox_backoff_delay(attempts: int) -> float:
+    delay = settings.EMAIL_OUTBOX_BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS)
+
+
+async def enqueue_campaign(session: AsyncSession, log: EmailAuditLog, body: str, recipients: List[dict] = ()):
+    """Store the campaign body and one queued outbox row per recipient (caller commits)."""
+    session.add(EmailCampaign(audit_log_id=log.id, subject=log.subject, body=body, created_at=datetime.utcnow()))
+    await enqueue_recipients(session, log.id, recipients)
+
+
+async def enqueue_recipients(session: AsyncSession, audit_log_id: int, recipients: List[dict]):
+    """Queue one outbox row per recipient with a single multi-row insert (caller commits)."""
+    if not recipients:
+        return
+    now = datetime.utcnow()
+    await session.execute(EmailOutbox.__table__.insert(), [
+        {
+            "audit_log_id": audit_log_id,
+            "email": r["email"],
+            "name": r.get("name"),
+            "usn": r.get("usn"),
+            "branch": r.get("branch"),
+            "semester": str(r.get("semester", "")),
+            "status": "queued",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        for r in recipients
+    ])
+
+
+async def campaign_counts(session: AsyncSession, audit_log_id: int) -> Dict[str, int]:
+    """Outbox rows per status for one campaign."""
+    result = await session.execute(
+        select(EmailOutbox.status, func.count())
+        .where(EmailOutbox.audit_log_id == audit_log_id)
+        .group_by(EmailOutbox.status)
+    )
+    return dict(result.all())
+
+
+async def refresh_log_counts(session: AsyncSession, audit_log_ids):
+    """Mirror outbox progress into EmailAuditLog.success_count / failure_count."""
+    for log_id in audit_log_ids:
+        counts = await campaign_counts(session, log_id)
+        await session.execute(
+            update(EmailAuditLog)
+            .where(EmailAuditLog.id == log_id)
+            .values(
+                success_count=counts.get("sent", 0),
+                failure_count=counts.get("failed", 0) + counts.get("dead", 0)
+            )
+        )
+
+
+async def redrive(session: AsyncSession, audit_log_id: int, ids: Optional[List[int]] = None,
+                  statuses=("failed", "dead")) -> int:
+    """Requeue failed/dead rows of a campaign for immediate delivery (caller commits)."""
+    query = (
+        update(EmailOutbox)
+        .where(EmailOutbox.audit_log_id == audit_log_id)
+        .where(EmailOutbox.status.in_(statuses))
+        .values(status="queued", attempts=0, next_attempt_at=datetime.utcnow(), updated_at=datetime.utcnow())
+    )
+    if ids:
+        query = query.where(EmailOutbox.id.in_(ids))
+    result = await session.execute(query)
+    return result.rowcount
+
+
+class EmailOutboxWorker:
+    """Background task that delivers due outbox rows and schedules retries."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.sent_total = 0
+        self.failed_total = 0
+        self.dead_total = 0
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            print("📮 Email outbox worker started")
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=10)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {e}")
+                self.last_error = str(e)
+                processed = 0
+
+            if processed >= settings.MAX_EMAILS_PER_BATCH:
+                continue  # More work is probably waiting
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, session: AsyncSession, audit_log_id: Optional[int]) -> List[EmailOutbox]:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.EMAIL_OUTBOX_SENDING_TIMEOUT_SECONDS)
+
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                (EmailOutbox.status.in_(DUE_STATUSES) & (EmailOutbox.next_attempt_at <= now))
+                # Rows left in "sending" by a crashed worker
+                | ((EmailOutbox.status == "sending") & (EmailOutbox.updated_at <= stale))
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(settings.MAX_EMAILS_PER_BATCH)
+            .with_for_update(skip_locked=True)
+        )
+        if audit_log_id is not None:
+            due = due.where(EmailOutbox.audit_log_id == audit_log_id)
+
+        result = await session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(status="sending", attempts=EmailOutbox.attempts + 1, updated_at=now)
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.scalars().all()
+        await session.commit()
+        return rows
+
+    async def drain_once(self, audit_log_id: Optional[int] = None) -> int:
+        """Deliver one batch of due rows (optionally for one campaign). Returns rows handled."""
+        async with AsyncSessionLocal() as session:
+            rows = await self._claim(session, audit_log_id)
+            if not rows:
+                return 0
+
+            by_campaign = defaultdict(list)
+            for row in rows:
+                by_campaign[row.audit_log_id].append(row)
+
+            campaigns = (await session.execute(
+                select(EmailCampaign).where(EmailCampaign.audit_log_id.in_(list(by_campaign)))
+            )).scalars().all()
+            campaigns = {c.audit_log_id: c for c in campaigns}
+
+            outcomes = {}  # row id -> (status, error)
+            for log_id, campaign_rows in by_campaign.items():
+                outcomes.update(await self._deliver(campaigns.get(log_id), campaign_rows))
+
+            # One executemany for the whole batch
+            now = datetime.utcnow()
+            params = []
+            for row in rows:
+                status, error = outcomes[row.id]
+                params.append({
+                    "row_id": row.id,
+                    "new_status": status,
+                    "error": error,
+                    "sent": now if status == "sent" else None,
+                    "next_at": now + timedelta(seconds=outbox_backoff_delay(row.attempts)) if status == "failed" else now
+                })
+            table = EmailOutbox.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    status=bindparam("new_status"),
+                    last_error=bindparam("error"),
+                    sent_at=bindparam("sent"),
+                    next_attempt_at=bindparam("next_at"),
+                    updated_at=now
+                ),
+                params
+            )
+
+            await refresh_log_counts(session, by_campaign)
+            await session.commit()
+        outbox_progress.publish()
+
+        statuses = [status for status, _ in outcomes.values()]
+        sent, failed, dead = statuses.count("sent"), statuses.count("failed"), statuses.count("dead")
+        self.sent_total += sent
+        self.failed_total += failed
+        self.dead_total += dead
+        if failed or dead:
+            print(f"📮 Outbox batch: {sent} sent, {failed} to retry, {dead} dead")
+        return len(rows)
+
+    @staticmethod
+    def _failure(row: EmailOutbox, error: str, permanent: bool = False) -> tuple:
+        if permanent or row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            return "dead", error[:1000]
+        return "failed", error[:1000]
+
+    async def _deliver(self, campaign: Optional[EmailCampaign], rows: List[EmailOutbox]) -> dict:
+        """Send one campaign's claimed rows. Returns row id -> (status, error)."""
+        if campaign is None:
+            return {row.id: ("dead", "Campaign body missing") for row in rows}
+
+        if not email_service.configured:
+            return {row.id: self._failure(row, "SMTP credentials not configured.") for row in rows}
+
+        recipients = [
+            {"email": row.email, "name": row.name or "Student", "usn": row.usn or "N/A",
+             "branch": row.branch or "N/A", "semester": row.semester or ""}
+            for row in rows
+        ]
+        try:
+            messages = email_service.render_messages(
+                recipients, campaign.subject, campaign.body, refs=[row.id for row in rows]
+            )
+        except ValueError as e:
+            # Template can never render; retrying will not help
+            return {row.id: ("dead", str(e)) for row in rows}
+
+        report = await email_service.deliver(messages)
+        outcomes = {}
+        for row in rows:
+            if row.id in report.failed_refs:
+                error, permanent = report.failed_refs[row.id]
+                outcomes[row.id] = self._failure(row, error, permanent)
+            else:
+                outcomes[row.id] = ("sent", None)
+        return outcomes
+
+    async def drain_campaign(self, audit_log_id: int) -> Dict[str, int]:
+        """Deliver everything currently due for one campaign; returns its status counts."""
+        while await self.drain_once(audit_log_id):
+            pass
+        async with AsyncSessionLocal() as session:
+            return await campaign_counts(session, audit_log_id)
+
+    async def metrics(self) -> dict:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(EmailOutbox.status, func.count())
+                .where(EmailOutbox.status.in_(("queued", "sending", "failed")))
+                .group_by(EmailOutbox.status)
+            )
+            pending = dict(result.all())
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "pending": pending,
+            "sent_total": self.sent_total,
+            "failed_total": self.failed_total,
+            "dead_total": self.dead_total,
+            "last_error": self.last_error
+        }
+
+
+# Singleton instance
+email_outbox_worker = EmailOutboxWorker()
@@ -1,8 +1,10 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from app.core.config import settings
+from app.services.email_templates import MessageSkeleton, compile_template
+from app.services.smtp_async import AsyncSMTPTransport
+from app.services.smtp_delivery import (
+    DeliveryEngine, DeliveryReport, OutboundMessage, RateLimiter, SMTPConnectionPool, SmtplibTransport
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,112 +17,90 @@ class EmailService:
         self.user = settings.SMTP_USER
         self.password = settings.SMTP_PASSWORD
         self.sender = settings.EMAIL_FROM
+        self.pool = SMTPConnectionPool(
+            self._new_transport,
+            size=settings.SMTP_POOL_SIZE,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            idle_seconds=settings.SMTP_POOL_IDLE_SECONDS
+        )
+        self.engine = DeliveryEngine(
+            self.pool,
+            senders=settings.SMTP_SENDERS,
+            rate_limiter=RateLimiter(settings.SMTP_RATE_LIMIT_PER_SECOND)
+        )
 
-    def _connect_smtp(self):
-        try:
-            server = smtplib.SMTP(self.server, self.port)
-            server.starttls()
-            server.login(self.user, self.password)
-            return server
-        except Exception as e:
-            logger.error(f"Failed to connect to SMTP server: {e}")
-            raise e
+    def _new_transport(self):
+        transport_class = SmtplibTransport if settings.SMTP_TRANSPORT == "smtplib" else AsyncSMTPTransport
+        return transport_class(
+            self.server, self.port, self.user, self.password,
+            starttls=settings.SMTP_STARTTLS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS
+        )
 
-    def send_batch(self, recipients: List[Dict[str, str]], subject: str, body_template: str) -> Tuple[int, int]:
+    @property
+    def configured(self) -> bool:
+        return bool(self.user and self.password)
+
+    def render_messages(self, recipients: List[Dict[str, str]], subject: str, body_template: str,
+                        refs: Optional[list] = None) -> List[OutboundMessage]:
+        """
+        Personalize a template for each recipient. `refs` (parallel to recipients)
+        tags messages so per-message outcomes can be read from the DeliveryReport.
+        Raises UnknownPlaceholderError if the template cannot be filled.
+        """
+        template = compile_template(body_template)
+        skeleton = MessageSkeleton(self.sender, subject)
+        refs = refs or [None] * len(recipients)
+        return [
+            OutboundMessage(
+                self.sender,
+                [recipient['email']],
+                skeleton.build(recipient['email'], template.render(recipient)),
+                ref
+            )
+            for recipient, ref in zip(recipients, refs)
+        ]
+
+    async def deliver(self, messages: List[OutboundMessage]) -> DeliveryReport:
+        return await self.engine.send_many(messages)
+
+    async def send_batch(self, recipients: List[Dict[str, str]], subject: str, body_template: str) -> Tuple[int, int]:
         """
-        Sends emails to a batch of recipients.
+        Sends emails to a batch of recipients over the pooled delivery engine.
         recipients arguments: List of dicts with 'email' and replacement variables like 'name', 'usn'.
+        Raises UnknownPlaceholderError before sending if the template cannot be filled.
         Returns: (success_count, failure_count)
         """
-        if not self.user or not self.password:
-            logger.error("SMTP credentials not configured.")
-            return 0, len(recipients)
+        messages = self.render_messages(recipients, subject, body_template)
 
-        success = 0
-        failure = 0
-        
-        try:
-            server = self._connect_smtp()
-        except Exception:
+        if not self.configured:
+            logger.error("SMTP credentials not configured.")
             return 0, len(recipients)
 
-        for recipient in recipients:
-            try:
-                # Personalize body
-                personal_body = body_template.replace("\n", "<br>")
-                # Default replacements
-                replacements = {
-                    "{{student_name}}": recipient.get("name", "Student"),
-                    "{{usn}}": recipient.get("usn", "N/A"),
-                    "{{branch}}": recipient.get("branch", "N/A"),
-                    "{{semester}}": str(recipient.get("semester", "")),
-                }
-                
-                # Apply replacements
-                for key, value in replacements.items():
-                    personal_body = personal_body.replace(key, value)
+        report = await self.deliver(messages)
+        return report.success, report.failure
 
-                # Create Message
-                msg = MIMEMultipart()
-                msg['From'] = self.sender
-                msg['To'] = recipient['email']
-                msg['Subject'] = subject
-                msg.attach(MIMEText(personal_body, 'html'))
-
-                # Send
-                server.send_message(msg)
-                success += 1
-            except Exception as e:
-                logger.error(f"Failed to send to {recipient.get('email')}: {e}")
-                failure += 1
-                # Try reconnecting if connection dropped
-                try:
-                    server.noop()
-                except:
-                    try:
-                        server = self._connect_smtp()
-                    except:
-                        break # Abort if server totally lost
-
-        try:
-            server.quit()
-        except:
-            pass
-
-        return success, failure
-
-    def send_single_email(self, to_email: str, subject: str, body: str, recipient_name: str = "Student") -> bool:
+    async def send_single_email(self, to_email: str, subject: str, body: str, recipient_name: str = "Student") -> bool:
         """
         Send a single email. Used for event notifications.
+        Reuses a pooled connection instead of a fresh TLS handshake per message.
         Returns True if successful, False otherwise.
         """
-        if not self.user or not self.password:
+        if not self.configured:
             logger.error("SMTP credentials not configured.")
             return False
-        
+
         if not to_email or "@" not in to_email:
             logger.warning(f"Invalid email address: {to_email}")
             return False
 
-        try:
-            server = self._connect_smtp()
-            
-            # Replace variables
-            personal_body = body.replace("\n", "<br>")
-            personal_body = personal_body.replace("{{student_name}}", recipient_name)
-            
-            msg = MIMEMultipart()
-            msg['From'] = self.sender
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            msg.attach(MIMEText(personal_body, 'html'))
-            
-            server.send_message(msg)
-            server.quit()
+        success, _ = await self.send_batch([{"email": to_email, "name": recipient_name}], subject, body)
+        if success:
             logger.info(f"Email sent successfully to {to_email}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {e}")
-            return False
+        return success == 1
+
+    async def close(self):
+        """Close pooled SMTP connections (application shutdown)."""
+        await self.pool.close()
 
 email_service = EmailService()
@@ -0,0 +1,100 @@
+"""Compiled email templates and pre-serialized MIME skeletons.
+
+A body template is parsed once into a list of literal and placeholder
+segments, so each recipient is rendered in a single join. The message
+headers and MIME part headers are serialized once per batch. Per recipient,
+only the To header and the base64-encoded body are produced.
+"""
+import base64
+import re
+import uuid
+from email.header import Header
+from email.utils import formatdate
+from typing import Dict, List, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Placeholder -> (recipient dict key, default)
+PLACEHOLDERS: Dict[str, Tuple[str, str]] = {
+    "student_name": ("name", "Student"),
+    "usn": ("usn", "N/A"),
+    "branch": ("branch", "N/A"),
+    "semester": ("semester", ""),
+}
+
+
+class UnknownPlaceholderError(ValueError):
+    """Raised when a template uses placeholders that cannot be filled."""
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        super().__init__(
+            "Unknown placeholder(s): " + ", ".join("{{" + name + "}}" for name in names)
+            + ". Supported: " + ", ".join("{{" + name + "}}" for name in PLACEHOLDERS)
+        )
+
+
+class CompiledTemplate:
+    """A template split into literal strings (even slots) and placeholder names (odd slots)."""
+
+    __slots__ = ("segments", "placeholders")
+
+    def __init__(self, segments: List[str]):
+        self.segments = segments
+        self.placeholders = segments[1::2]
+
+    def render(self, recipient: dict) -> str:
+        parts = self.segments[:]
+        for i in range(1, len(parts), 2):
+            key, default = PLACEHOLDERS[parts[i]]
+            parts[i] = str(recipient.get(key, default))
+        return "".join(parts)
+
+
+def compile_template(template: str, newline_to_br: bool = True) -> CompiledTemplate:
+    """Parse a body template once. Raises UnknownPlaceholderError before anything is sent."""
+    if newline_to_br:
+        template = template.replace("\n", "<br>")
+    # re.split with one group alternates literal, name, literal, ...
+    segments = PLACEHOLDER_PATTERN.split(template)
+    unknown = sorted({name for name in segments[1::2] if name not in PLACEHOLDERS})
+    if unknown:
+        raise UnknownPlaceholderError(unknown)
+    return CompiledTemplate(segments)
+
+
+def _header_value(value: str) -> str:
+    # Strip CR/LF so values cannot inject extra headers
+    value = value.replace("\r", " ").replace("\n", " ")
+    return value if value.isascii() else Header(value, "utf-8").encode()
+
+
+class MessageSkeleton:
+    """
+    Pre-serialized multipart/mixed message with one text/html part, matching
+    what MIMEMultipart + MIMEText(html) produced, minus the per-recipient parts.
+    """
+
+    def __init__(self, sender: str, subject: str):
+        boundary = "===============" + uuid.uuid4().hex + "=="
+        self.head = (
+            f'Content-Type: multipart/mixed; boundary="{boundary}"\r\n'
+            "MIME-Version: 1.0\r\n"
+            f"From: {_header_value(sender)}\r\n"
+            "To: "
+        ).encode()
+        self.middle = (
+            f"Subject: {_header_value(subject)}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            "\r\n"
+            f"--{boundary}\r\n"
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "MIME-Version: 1.0\r\n"
+            "Content-Transfer-Encoding: base64\r\n"
+            "\r\n"
+        ).encode()
+        self.tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def build(self, to_email: str, html_body: str) -> bytes:
+        body = base64.encodebytes(html_body.encode("utf-8")).replace(b"\n", b"\r\n")
+        return b"".join((self.head, _header_value(to_email).encode(), b"\r\n", self.middle, body, self.tail))
@@ -0,0 +1,103 @@
+"""Versioned response cache for the public events catalogue (GET /api/events/).
+
+Rendered JSON bodies are cached per query together with a strong ETag. Any
+write that changes what the catalogue shows (event create/update/delete,
+participant selection) calls ``invalidate()``, which bumps the version so
+older entries are never served again. Concurrent misses for the same query
+share one build (single-flight).
+"""
+import asyncio
+import hashlib
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+from cachetools import TTLCache
+from app.core.config import settings
+
+
+class CachedResponse:
+    __slots__ = ("version", "body", "etag")
+
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return self.etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+class EventsCatalogueCache:
+    """Query key -> rendered response body, valid for the current version only."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        # The TTL bounds staleness for writes made by other worker processes
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == self.version:
+                return entry
+            return None
+
+    async def get_or_build(self, key: Hashable, build: Callable[[], Awaitable[bytes]]) -> CachedResponse:
+        """Return the cached response for `key`, building it at most once per version."""
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._build(key, build, self.version))
+            self._inflight[key] = future
+        # A cancelled request must not cancel the build other requests wait on
+        return await asyncio.shield(future)
+
+    async def _build(self, key: Hashable, build: Callable[[], Awaitable[bytes]], version: int) -> CachedResponse:
+        try:
+            entry = CachedResponse(version, await build())
+            self.builds += 1
+            with self._lock:
+                # Skip storing if a write invalidated the catalogue mid-build
+                if version == self.version:
+                    self._entries[key] = entry
+            return entry
+        finally:
+            # invalidate() may have replaced this build with a newer one for the same key
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+        # Requests arriving after a write must not join a build that started before it
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "builds": self.builds
+        }
+
+
+# Singleton instance
+events_cache = EventsCatalogueCache(
+    maxsize=settings.EVENTS_CACHE_SIZE,
+    ttl=settings.EVENTS_CACHE_TTL_SECONDS
+)
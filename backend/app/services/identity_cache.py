@@ -0,0 +1,119 @@
+"""In-process cache mapping a Firebase identity (uid / email) to a student registration."""
+from threading import Lock
+from typing import Any, Dict, Optional, Set
+from cachetools import TTLCache
+from app.core.config import settings
+from app.db.mongodb import get_submissions_collection
+
+IDENTITY_PROJECTION = {"usn": 1, "student_name": 1, "status": 1, "email": 1, "firebase_uid": 1}
+
+
+class IdentityCache:
+    """
+    Bounded TTL/LRU cache of uid/email -> {id, usn, student_name, status}.
+
+    An entry is stored under the requesting student's uid/email, which may not
+    match the submission (imported rows have no firebase_uid), so the keys are
+    also recorded per submission id for invalidation.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._doc_keys: Dict[Any, Set[str]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _keys(uid: Optional[str], email: Optional[str]) -> list:
+        keys = []
+        if uid:
+            keys.append(f"uid:{uid}")
+        if email:
+            keys.append(f"email:{email.lower()}")
+        return keys
+
+    def get(self, uid: Optional[str], email: Optional[str]) -> Optional[dict]:
+        with self._lock:
+            for key in self._keys(uid, email):
+                value = self._cache.get(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, identity: dict, uid: Optional[str] = None, email: Optional[str] = None):
+        with self._lock:
+            keys = self._keys(uid or identity.get("firebase_uid"), email or identity.get("email"))
+            for key in keys:
+                self._cache[key] = identity
+            self._doc_keys.setdefault(identity["id"], set()).update(keys)
+            if len(self._doc_keys) > self._cache.maxsize:
+                # Forget ids whose entries have all expired or been evicted
+                self._doc_keys = {
+                    doc_id: live for doc_id, doc_keys in self._doc_keys.items()
+                    if (live := {key for key in doc_keys if key in self._cache})
+                }
+
+    def invalidate(self, uid: Optional[str] = None, email: Optional[str] = None):
+        with self._lock:
+            for key in self._keys(uid, email):
+                self._cache.pop(key, None)
+
+    def invalidate_submission(self, doc: Optional[dict], new_email: Optional[str] = None):
+        """Drop every cache entry that could point at this submission."""
+        if not doc:
+            return
+        with self._lock:
+            for key in self._doc_keys.pop(doc.get("_id", doc.get("id")), ()):
+                self._cache.pop(key, None)
+        self.invalidate(doc.get("firebase_uid"), doc.get("email"))
+        if new_email:
+            self.invalidate(email=new_email)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._doc_keys.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+identity_cache = IdentityCache(
+    maxsize=settings.IDENTITY_CACHE_SIZE,
+    ttl=settings.IDENTITY_CACHE_TTL_SECONDS
+)
+
+
+async def resolve_student_identity(student: dict) -> Optional[dict]:
+    """
+    Resolve an authenticated student (from get_current_student) to their
+    registration: {"id", "usn", "student_name", "status"}. Returns None if
+    they have not submitted a registration yet.
+    """
+    cached = identity_cache.get(student.get("uid"), student.get("email"))
+    if cached is not None:
+        return cached
+
+    doc = await get_submissions_collection().find_one(
+        {"$or": [
+            {"email": student["email"]},
+            {"firebase_uid": student["uid"]}
+        ]},
+        IDENTITY_PROJECTION
+    )
+    if not doc:
+        return None
+
+    identity = {
+        "id": doc["_id"],
+        "usn": doc["usn"],
+        "student_name": doc["student_name"],
+        "status": doc.get("status"),
+        "email": doc.get("email"),
+        "firebase_uid": doc.get("firebase_uid"),
+    }
+    identity_cache.put(identity, uid=student.get("uid"), email=student.get("email"))
+    return identity
@@ -0,0 +1,259 @@
+"""Durable background job queue stored in the MongoDB ``jobs`` collection.
+
+A job is a list of items (e.g. email recipients) processed in chunks by a
+registered handler. Workers claim jobs with a lease, so a job left behind by a
+crashed or restarted process is picked up again once its lease expires.
+
+Delivery is at-most-once per item. Before a chunk is handed to the handler
+it is recorded as ``inflight``. If a worker dies mid-chunk, the next worker
+counts that chunk as ``skipped`` instead of sending it again. If the handler
+raises instead, the chunk is known not to be finished, so ``inflight`` is
+cleared and the retry processes it again. Every progress write is conditional
+on the worker still holding the lease.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.db.mongodb import get_jobs_collection
+
+logger = logging.getLogger(__name__)
+
+# Fields returned when claiming / reporting (items can be large)
+JOB_SUMMARY_PROJECTION = {"items": 0}
+
+
+class JobHandler:
+    """Base class for job types. Subclasses implement prepare() and process()."""
+
+    chunk_size = 25
+
+    async def prepare(self, job: dict) -> List[dict]:
+        """Resolve the items to process. Runs once per job; the result is persisted."""
+        raise NotImplementedError
+
+    async def process(self, job: dict, items: List[dict]) -> Tuple[int, int]:
+        """
+        Process one chunk. Returns (succeeded, failed). Raising means the chunk
+        was not delivered; it is retried from its first item.
+        """
+        raise NotImplementedError
+
+
+class LeaseLost(Exception):
+    """Another worker took over the job (our lease expired)."""
+
+
+def job_backoff_delay(attempts: int) -> float:
+    delay = settings.JOB_BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.JOB_MAX_BACKOFF_SECONDS)
+
+
+class JobQueue:
+    """Enqueues jobs and runs the worker tasks that drain them."""
+
+    def __init__(self):
+        self.handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.completed_total = 0
+        self.failed_total = 0
+        self.last_error: Optional[str] = None
+
+    def register(self, job_type: str, handler: JobHandler):
+        self.handlers[job_type] = handler
+
+    async def enqueue(self, job_type: str, payload: dict, created_by: Optional[str] = None) -> str:
+        """Persist a new job and wake a worker. Returns the job id."""
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        now = datetime.utcnow()
+        result = await get_jobs_collection().insert_one({
+            "type": job_type,
+            "status": "queued",
+            "payload": payload,
+            "created_by": created_by,
+            "created_at": now,
+            "run_after": now,
+            "attempts": 0,
+            "prepared": False,
+            "total": 0,
+            "cursor": 0,
+            "sent": 0,
+            "failed": 0,
+            "skipped": 0,
+            "inflight": None,
+            "lease_id": None,
+            "lease_expires_at": None,
+            "last_error": None
+        })
+        self._wakeup.set()
+        return str(result.inserted_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        try:
+            obj_id = ObjectId(job_id)
+        except Exception:
+            return None
+        return await get_jobs_collection().find_one({"_id": obj_id}, JOB_SUMMARY_PROJECTION)
+
+    # ----------------------------------------------------------------- workers
+
+    def start(self):
+        self._stopping = False
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < settings.JOB_WORKER_CONCURRENCY:
+            self._tasks.append(asyncio.create_task(self._run()))
+        print(f"🧵 Job queue started ({len(self._tasks)} workers)")
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._tasks:
+            # Unfinished jobs keep their lease and resume after it expires
+            done, pending = await asyncio.wait(self._tasks, timeout=10)
+            for task in pending:
+                task.cancel()
+            self._tasks = []
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.error(f"Job queue claim error: {e}")
+                self.last_error = str(e)
+                job = None
+
+            if job:
+                await self.run_job(job)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def claim(self) -> Optional[dict]:
+        """Atomically take the oldest due job, or one whose lease expired."""
+        now = datetime.utcnow()
+        return await get_jobs_collection().find_one_and_update(
+            {"$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {"status": "running", "lease_expires_at": {"$lte": now}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_id": uuid.uuid4().hex,
+                    "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+                },
+                "$min": {"started_at": now},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            projection=JOB_SUMMARY_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _update(self, job: dict, update: dict):
+        """Apply a progress update only while we still hold the lease."""
+        update.setdefault("$set", {})["lease_expires_at"] = (
+            datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        )
+        result = await get_jobs_collection().update_one(
+            {"_id": job["_id"], "lease_id": job["lease_id"]},
+            update
+        )
+        if result.matched_count == 0:
+            raise LeaseLost()
+
+    async def run_job(self, job: dict):
+        handler = self.handlers.get(job["type"])
+        release_chunk = False
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for job type {job['type']}")
+
+            if job.get("prepared"):
+                stored = await get_jobs_collection().find_one({"_id": job["_id"]}, {"items": 1})
+                items = stored["items"]
+            else:
+                # Items are snapshotted once so a resumed job walks the same list
+                items = await handler.prepare(job)
+                await self._update(job, {"$set": {"items": items, "prepared": True, "total": len(items), "cursor": 0}})
+
+            cursor = job.get("cursor", 0)
+            inflight = job.get("inflight")
+            if inflight:
+                # The previous worker may have delivered this chunk; never resend it
+                skipped = inflight["end"] - inflight["start"]
+                cursor = inflight["end"]
+                await self._update(job, {"$set": {"cursor": cursor, "inflight": None}, "$inc": {"skipped": skipped}})
+                logger.warning(f"Job {job['_id']}: skipped {skipped} possibly-delivered items after takeover")
+
+            while cursor < len(items):
+                end = min(cursor + handler.chunk_size, len(items))
+                await self._update(job, {"$set": {"inflight": {"start": cursor, "end": end}}})
+                release_chunk = True
+                succeeded, failed = await handler.process(job, items[cursor:end])
+                release_chunk = False
+                await self._update(job, {
+                    "$set": {"cursor": end, "inflight": None},
+                    "$inc": {"sent": succeeded, "failed": failed}
+                })
+                cursor = end
+
+            await self._update(job, {"$set": {
+                "status": "completed",
+                "finished_at": datetime.utcnow(),
+                "lease_id": None,
+                "last_error": None
+            }})
+            self.completed_total += 1
+            print(f"✅ Job {job['_id']} ({job['type']}) completed: {len(items)} items")
+
+        except LeaseLost:
+            logger.warning(f"Job {job['_id']}: lease lost, another worker took over")
+        except Exception as e:
+            logger.error(f"Job {job['_id']} failed: {e}")
+            self.last_error = str(e)
+            attempts = job.get("attempts", 1)
+            if attempts >= settings.JOB_MAX_ATTEMPTS:
+                update = {"status": "failed", "finished_at": datetime.utcnow()}
+                self.failed_total += 1
+            else:
+                update = {
+                    "status": "queued",
+                    "run_after": datetime.utcnow() + timedelta(seconds=job_backoff_delay(attempts))
+                }
+            if release_chunk:
+                # The handler raised here, so the chunk is not a takeover
+                # candidate; the cursor still points at its first item
+                update["inflight"] = None
+            await get_jobs_collection().update_one(
+                {"_id": job["_id"], "lease_id": job["lease_id"]},
+                {"$set": {**update, "lease_id": None, "last_error": str(e)[:500]}}
+            )
+
+    async def metrics(self) -> dict:
+        collection = get_jobs_collection()
+        return {
+            "workers": sum(1 for task in self._tasks if not task.done()),
+            "queued": await collection.count_documents({"status": "queued"}),
+            "running": await collection.count_documents({"status": "running"}),
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total,
+            "last_error": self.last_error
+        }
+
+
+# Singleton instance
+job_queue = JobQueue()
@@ -0,0 +1,188 @@
+"""Inclusion proofs and parallel verification for the blockchain ledger.
+
+An entry's proof is its Merkle path up to the root of its sealed block, plus
+the block header. A client recomputes the root from the entry hash in
+log2(LEDGER_BLOCK_SIZE) hashes and compares it with the header. The header
+hash chains the blocks together.
+
+The whole-ledger verifier streams the sealed blocks and fans each one out to
+a process pool. Each worker recomputes the entry hashes, the entry links and
+the Merkle root of its block. The main process checks the header chain and
+the links between blocks, so the blocks can be checked in any order.
+
+The pool is created on first use and kept for the life of the process (the
+app shuts it down on stop), so a verification request never pays for process
+start-up or blocks the event loop waiting for a pool to shut down.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from app.core.blockchain import blockchain, BlockchainLogger, GENESIS_HASH
+from app.core.config import settings
+from app.core.merkle import merkle_root, merkle_proof, block_header_hash
+from app.db.mongodb import get_ledger_collection, get_ledger_blocks_collection
+
+MAX_REPORTED_ERRORS = 20
+
+_verify_pool: Optional[ProcessPoolExecutor] = None
+_verify_pool_size = 0
+
+
+def get_verify_pool(size: Optional[int] = None) -> ProcessPoolExecutor:
+    """The shared verification pool, created on first use with `size` workers."""
+    global _verify_pool, _verify_pool_size
+    if _verify_pool is None:
+        _verify_pool_size = size or settings.LEDGER_VERIFY_WORKERS or os.cpu_count() or 1
+        # spawn: forking a process that runs the event loop and driver threads is unsafe
+        _verify_pool = ProcessPoolExecutor(
+            max_workers=_verify_pool_size, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _verify_pool
+
+
+def _discard_verify_pool():
+    """Drop a broken pool without waiting for its workers; the next call creates a new one."""
+    global _verify_pool
+    if _verify_pool is not None:
+        _verify_pool.shutdown(wait=False, cancel_futures=True)
+        _verify_pool = None
+
+
+async def shutdown_verify_pool():
+    """Stop the pool's worker processes without blocking the event loop."""
+    global _verify_pool
+    pool, _verify_pool = _verify_pool, None
+    if pool is not None:
+        await asyncio.get_running_loop().run_in_executor(None, lambda: pool.shutdown(wait=True, cancel_futures=True))
+
+
+async def _block_entries(block: dict, projection: Optional[dict] = None) -> List[dict]:
+    return await get_ledger_collection().find(
+        {"_id": {"$gte": block["first_seq"], "$lte": block["last_seq"]}}, projection
+    ).sort("_id", 1).to_list(length=None)
+
+
+async def _block_for_seq(seq: int) -> Optional[dict]:
+    block = await get_ledger_blocks_collection().find_one({"last_seq": {"$gte": seq}}, sort=[("last_seq", 1)])
+    return block if block and block["first_seq"] <= seq else None
+
+
+async def entry_proof(entry_hash: str) -> Optional[dict]:
+    """Merkle inclusion proof for a ledger entry, or None if the hash is unknown."""
+    entry = await get_ledger_collection().find_one({"hash": entry_hash})
+    if entry is None:
+        return None
+
+    seq = entry.pop("_id")
+    block = await _block_for_seq(seq)
+    if block is None and await blockchain.seal_blocks():
+        block = await _block_for_seq(seq)
+    if block is None:
+        return {"entry_hash": entry_hash, "seq": seq, "entry": entry, "sealed": False}
+
+    hashes = [e["hash"] for e in await _block_entries(block, {"hash": 1})]
+    index = seq - block["first_seq"]
+    return {
+        "entry_hash": entry_hash,
+        "seq": seq,
+        "entry": entry,
+        "sealed": True,
+        "leaf_index": index,
+        "proof": [{"hash": sibling, "side": side} for sibling, side in merkle_proof(hashes, index)],
+        "block": {"number": block.pop("_id"), **block}
+    }
+
+
+def verify_block_entries(block: dict, entries: List[dict], previous_entry_hash: str) -> Optional[str]:
+    """Process pool worker: check one sealed block. Returns an error, or None if intact."""
+    number = block["_id"]
+    if [entry["_id"] for entry in entries] != list(range(block["first_seq"], block["last_seq"] + 1)):
+        return f"Block {number}: entries missing from seq {block['first_seq']}-{block['last_seq']}"
+
+    previous = previous_entry_hash
+    for entry in entries:
+        if not BlockchainLogger.verify_entry(entry, previous):
+            return f"Block {number}: entry {entry['_id']} was modified or re-linked"
+        previous = entry["hash"]
+
+    if merkle_root([entry["hash"] for entry in entries]) != block["merkle_root"]:
+        return f"Block {number}: Merkle root mismatch"
+    expected = block_header_hash(
+        number, block["first_seq"], block["last_seq"], block["merkle_root"], block["previous_block_hash"]
+    )
+    if expected != block["block_hash"]:
+        return f"Block {number}: header hash mismatch"
+    return None
+
+
+async def verify_ledger(workers: Optional[int] = None) -> dict:
+    """
+    Verify every sealed block across the process pool, then the unsealed tail
+    inline. `workers` bounds how many blocks this run keeps in the pool.
+    """
+    pool = get_verify_pool(workers)
+    workers = min(workers or _verify_pool_size, _verify_pool_size)
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    errors: List[str] = []
+    blocks_checked = entries_checked = 0
+    expected_number, expected_seq = 1, 1
+    previous_block_hash = previous_entry_hash = GENESIS_HASH
+    pending = set()
+
+    async def collect(return_when):
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        errors.extend(error for error in (task.result() for task in done) if error)
+
+    try:
+        async for block in get_ledger_blocks_collection().find().sort("_id", 1):
+            if block["_id"] != expected_number or block["first_seq"] != expected_seq:
+                errors.append(f"Block {block['_id']}: expected block {expected_number} starting at entry {expected_seq}")
+            if block["previous_block_hash"] != previous_block_hash:
+                errors.append(f"Block {block['_id']}: not chained to block {block['_id'] - 1}")
+
+            entries = await _block_entries(block)
+            pending.add(loop.run_in_executor(pool, verify_block_entries, block, entries, previous_entry_hash))
+            blocks_checked += 1
+            entries_checked += len(entries)
+
+            expected_number, expected_seq = block["_id"] + 1, block["last_seq"] + 1
+            previous_block_hash = block["block_hash"]
+            previous_entry_hash = entries[-1]["hash"] if entries else previous_entry_hash
+
+            # Bound the blocks held in memory while workers are busy
+            if len(pending) >= workers * 2:
+                await collect(asyncio.FIRST_COMPLETED)
+        if pending:
+            await collect(asyncio.ALL_COMPLETED)
+    except BrokenProcessPool:
+        _discard_verify_pool()
+        raise
+    finally:
+        # On an error, drop this run's queued blocks instead of waiting for them
+        for future in pending:
+            future.cancel()
+
+    # Entries after the last sealed block (fewer than LEDGER_BLOCK_SIZE)
+    unsealed = 0
+    async for entry in get_ledger_collection().find({"_id": {"$gte": expected_seq}}).sort("_id", 1):
+        if entry["_id"] != expected_seq + unsealed or not BlockchainLogger.verify_entry(entry, previous_entry_hash):
+            errors.append(f"Unsealed entry {entry['_id']} was modified, re-linked or follows a gap")
+            break
+        previous_entry_hash = entry["hash"]
+        unsealed += 1
+
+    return {
+        "valid": not errors,
+        "blocks_checked": blocks_checked,
+        "entries_checked": entries_checked + unsealed,
+        "unsealed_entries": unsealed,
+        "workers": workers,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "errors": errors[:MAX_REPORTED_ERRORS]
+    }
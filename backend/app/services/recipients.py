@@ -0,0 +1,121 @@
+"""Streaming recipient resolution for bulk email.
+
+Recipients are read from cursors with a projection, so base64 photos and
+signatures never leave MongoDB. They are de-duplicated by email and handed
+out in chunks of MAX_EMAILS_PER_BATCH, so the number of recipients is not
+capped and memory use stays flat.
+
+When ``event_id`` is set, the selected participants of that event drive the
+query. Their USNs are read from ``event_participation_requests`` through the
+``event_status_usn`` index (a covered query). Each chunk is then looked up in
+``student_submissions`` through the unique ``usn`` index.
+"""
+from typing import AsyncIterator, Dict, List, Optional
+from app.core.config import settings
+from app.db.mongodb import get_participation_collection, get_submissions_collection
+from app.schemas.email_schemas import RecipientFilter
+
+RECIPIENT_PROJECTION = {"_id": 0, "email": 1, "student_name": 1, "usn": 1, "branch": 1, "semester": 1}
+
+# Participation status that counts as "taking part" when targeting an event
+EVENT_TARGET_STATUS = "selected"
+
+
+def submission_query(filters: Optional[RecipientFilter]) -> dict:
+    """MongoDB query for approved students matching the semester/branch/usn filters."""
+    query = {"status": "approved"}  # Only approved students
+    if not filters:
+        return query
+
+    if filters.semester:
+        if isinstance(filters.semester, list):
+            query["semester"] = {"$in": filters.semester}
+        else:
+            query["semester"] = filters.semester
+    if filters.branch:
+        query["branch"] = {"$in": filters.branch}
+    if filters.usn:
+        query["usn"] = {"$in": filters.usn}
+    return query
+
+
+class RecipientResolver:
+    """
+    Resolves a RecipientFilter into de-duplicated recipient batches.
+    After iterating, `matched` holds the number of student documents read and
+    `recipients` the number of unique, valid email addresses yielded.
+    """
+
+    def __init__(self, filters: Optional[RecipientFilter], batch_size: int = None):
+        self.filters = filters
+        self.batch_size = batch_size or settings.MAX_EMAILS_PER_BATCH
+        self.matched = 0
+        self.recipients = 0
+        self._seen = set()
+
+    async def _event_usns(self, event_id: int) -> AsyncIterator[List[str]]:
+        cursor = get_participation_collection().find(
+            {"event_id": event_id, "status": EVENT_TARGET_STATUS},
+            {"_id": 0, "usn": 1}
+        ).batch_size(self.batch_size)
+        chunk = []
+        async for doc in cursor:
+            chunk.append(doc["usn"])
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def _students(self) -> AsyncIterator[dict]:
+        collection = get_submissions_collection()
+        query = submission_query(self.filters)
+
+        if self.filters and self.filters.event_id is not None:
+            allowed = set(self.filters.usn) if self.filters.usn else None
+            async for usns in self._event_usns(self.filters.event_id):
+                if allowed is not None:
+                    usns = [usn for usn in usns if usn in allowed]
+                    if not usns:
+                        continue
+                async for student in collection.find({**query, "usn": {"$in": usns}}, RECIPIENT_PROJECTION):
+                    yield student
+            return
+
+        async for student in collection.find(query, RECIPIENT_PROJECTION).batch_size(self.batch_size):
+            yield student
+
+    def _recipient(self, student: dict) -> Optional[Dict[str, str]]:
+        email = (student.get("email") or "").strip()
+        key = email.lower()
+        if "@" not in email or key in self._seen:
+            return None
+        self._seen.add(key)
+        return {
+            "email": email,
+            "name": student.get("student_name", "Student"),
+            "usn": student.get("usn", "N/A"),
+            "branch": student.get("branch", "N/A"),
+            "semester": student.get("semester", "")
+        }
+
+    async def batches(self) -> AsyncIterator[List[Dict[str, str]]]:
+        batch = []
+        async for student in self._students():
+            self.matched += 1
+            recipient = self._recipient(student)
+            if recipient is None:
+                continue
+            batch.append(recipient)
+            self.recipients += 1
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def count(self) -> int:
+        """Unique valid recipients, without keeping them in memory."""
+        async for _ in self.batches():
+            pass
+        return self.recipients
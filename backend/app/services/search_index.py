@@ -0,0 +1,156 @@
+"""Prefix search index for student submissions.
+
+Each submission carries a ``search_keys`` array with the lowercase edge
+n-grams (prefixes) of every name token and of the USN. A multikey index on
+that array turns "name or USN starts with ..." into index lookups instead of
+an unanchored case-insensitive regex over the whole collection.
+
+Whole tokens are stored once more behind ``EXACT_MARK`` (``=ravi``), so the
+same index can also answer "has a name token equal to ...". Documents
+indexed before these keys existed need ``backfill_search_keys.py --all``.
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+# Longer query tokens are truncated to this length and re-checked in Python
+MAX_PREFIX_LEN = 15
+
+# Prefix of the whole-token keys; never produced by tokenize()
+EXACT_MARK = "="
+
+TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+# RVCE USNs look like 1RV23CS001; a term that starts with a digit is treated as one
+USN_LIKE = re.compile(r"^\d[0-9a-z]*$")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and strip accents/punctuation for indexing and querying."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    ascii_text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return ascii_text.lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [t for t in TOKEN_SPLIT.split(normalize(text)) if t]
+
+
+def _prefixes(token: str) -> List[str]:
+    return [token[:i] for i in range(1, min(len(token), MAX_PREFIX_LEN) + 1)]
+
+
+def build_search_keys(student_name: Optional[str], usn: Optional[str]) -> List[str]:
+    """Build the ``search_keys`` array stored on a submission document."""
+    keys = set()
+    for token in tokenize(student_name):
+        keys.update(_prefixes(token))
+        keys.add(EXACT_MARK + token)
+    usn_key = "".join(tokenize(usn))
+    if usn_key:
+        keys.update(_prefixes(usn_key))
+        keys.add(EXACT_MARK + usn_key)
+    return sorted(keys)
+
+
+def search_keys_update(fields: dict, current: Optional[dict] = None) -> Optional[List[str]]:
+    """
+    Recompute search keys when an update touches the name or USN.
+    Returns None if the indexed fields are unchanged.
+    """
+    if "student_name" not in fields and "usn" not in fields:
+        return None
+    current = current or {}
+    return build_search_keys(
+        fields.get("student_name", current.get("student_name")),
+        fields.get("usn", current.get("usn"))
+    )
+
+
+def build_search_filter(term: str) -> dict:
+    """
+    MongoDB filter for a search term.
+    USN-shaped terms use an anchored regex on the unique ``usn`` index;
+    anything else must match a stored prefix for every query token.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return {}
+
+    if len(tokens) == 1 and USN_LIKE.match(tokens[0]):
+        # Anchored, case-sensitive prefix regex is answered from the usn index
+        return {"usn": {"$regex": "^" + re.escape(tokens[0].upper())}}
+
+    return {"search_keys": {"$all": [t[:MAX_PREFIX_LEN] for t in tokens]}}
+
+
+def build_exact_filter(term: str) -> dict:
+    """
+    MongoDB filter for documents matching every query token as a whole token
+    (or the whole USN). Used to fetch exact hits before prefix candidates.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return {}
+
+    if len(tokens) == 1 and USN_LIKE.match(tokens[0]):
+        return {"usn": tokens[0].upper()}
+
+    return {"search_keys": {"$all": [EXACT_MARK + t for t in tokens]}}
+
+
+def needs_recheck(term: str) -> bool:
+    """
+    True when ``build_search_filter`` had to truncate a token, so index
+    matches must be confirmed with ``score(doc, term) > 0``.
+    """
+    tokens = tokenize(term)
+    if len(tokens) == 1 and USN_LIKE.match(tokens[0]):
+        return False
+    return any(len(t) > MAX_PREFIX_LEN for t in tokens)
+
+
+def score(doc: dict, term: str) -> int:
+    """
+    Rank a candidate. Higher is better; 0 means it does not really match
+    (only possible for tokens longer than MAX_PREFIX_LEN).
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return 0
+
+    usn = "".join(tokenize(doc.get("usn")))
+    name_tokens = tokenize(doc.get("student_name"))
+    joined = " ".join(tokens)
+
+    if len(tokens) == 1 and usn:
+        if usn == tokens[0]:
+            return 1000
+        if usn.startswith(tokens[0]):
+            return 800 - (len(usn) - len(tokens[0]))
+
+    total = 0
+    for token in tokens:
+        if token in name_tokens:
+            total += 100
+        elif any(n.startswith(token) for n in name_tokens):
+            total += 50
+        else:
+            return 0
+
+    if " ".join(name_tokens).startswith(joined):
+        total += 200
+    elif name_tokens and name_tokens[0].startswith(tokens[0]):
+        total += 25
+
+    return total
+
+
+def rank(docs: List[dict], term: str, limit: Optional[int] = None) -> List[dict]:
+    """Order candidates by score, dropping false positives."""
+    scored = [(score(doc, term), doc) for doc in docs]
+    scored = [item for item in scored if item[0] > 0]
+    scored.sort(key=lambda item: (-item[0], item[1].get("student_name", "")))
+    ranked = [doc for _, doc in scored]
+    return ranked[:limit] if limit else ranked
@@ -0,0 +1,185 @@
+"""Asyncio-native SMTP client transport.
+
+Speaks SMTP directly over ``asyncio.open_connection``, with STARTTLS, AUTH
+PLAIN/LOGIN and RFC 2920 command pipelining. No threads are used, so an
+in-flight message costs one coroutine. Server rejections raise the same
+``smtplib`` exception types as ``SmtplibTransport``, so the delivery engine
+classifies errors the same way for both transports.
+"""
+import asyncio
+import base64
+import re
+import smtplib
+import ssl
+from typing import Optional, Tuple
+
+from app.services.smtp_delivery import OutboundMessage
+
+LINE_ENDINGS = re.compile(rb"\r\n|\n|\r(?!\n)")
+LEADING_DOT = re.compile(rb"(?m)^\.")
+
+
+def prepare_data(data: bytes) -> bytes:
+    """Normalize line endings, dot-stuff and terminate a DATA payload."""
+    data = LEADING_DOT.sub(b"..", LINE_ENDINGS.sub(b"\r\n", data))
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data + b".\r\n"
+
+
+class AsyncSMTPTransport:
+    """One SMTP session on the event loop."""
+
+    def __init__(self, host: str, port: int, user: Optional[str], password: Optional[str],
+                 starttls: bool = True, timeout: float = 30, ssl_context: Optional[ssl.SSLContext] = None,
+                 local_hostname: str = "localhost"):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.local_hostname = local_hostname
+        self.capabilities: dict = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    # ------------------------------------------------------------ protocol io
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            if not line:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            text = line.decode("utf-8", "replace").rstrip("\r\n")
+            try:
+                code = int(text[:3])
+            except ValueError:
+                raise smtplib.SMTPResponseException(-1, f"Malformed reply: {text!r}")
+            lines.append(text[4:])
+            if text[3:4] != "-":
+                return code, "\n".join(lines)
+
+    async def _command(self, line: str) -> Tuple[int, str]:
+        self._writer.write(line.encode() + b"\r\n")
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _ehlo(self):
+        code, text = await self._command(f"EHLO {self.local_hostname}")
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, text)
+        self.capabilities = {}
+        for line in text.split("\n")[1:]:
+            keyword, _, params = line.partition(" ")
+            self.capabilities[keyword.upper()] = params
+
+    async def _auth(self):
+        mechanisms = self.capabilities.get("AUTH", "").upper().split()
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{self.user}\0{self.password}".encode()).decode()
+            code, text = await self._command(f"AUTH PLAIN {token}")
+        else:
+            code, text = await self._command("AUTH LOGIN")
+            if code == 334:
+                code, text = await self._command(base64.b64encode(self.user.encode()).decode())
+            if code == 334:
+                code, text = await self._command(base64.b64encode(self.password.encode()).decode())
+        if code != 235:
+            raise smtplib.SMTPAuthenticationError(code, text)
+
+    # -------------------------------------------------------------- transport
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            code, text = await self._read_reply()
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, text)
+            await self._ehlo()
+
+            if self.starttls:
+                if "STARTTLS" not in self.capabilities:
+                    raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server")
+                code, text = await self._command("STARTTLS")
+                if code != 220:
+                    raise smtplib.SMTPResponseException(code, text)
+                await asyncio.wait_for(
+                    self._writer.start_tls(self.ssl_context or ssl.create_default_context(), server_hostname=self.host),
+                    self.timeout
+                )
+                # Capabilities may differ once the session is encrypted
+                await self._ehlo()
+
+            if self.user and self.password:
+                await self._auth()
+        except BaseException:
+            self._abort()
+            raise
+
+    async def send(self, message: OutboundMessage):
+        envelope = [f"MAIL FROM:<{message.sender}>"] + [f"RCPT TO:<{r}>" for r in message.recipients] + ["DATA"]
+
+        if "PIPELINING" in self.capabilities:
+            # One round trip for the whole envelope
+            self._writer.write("".join(f"{line}\r\n" for line in envelope).encode())
+            await self._writer.drain()
+            replies = [await self._read_reply() for _ in envelope]
+        else:
+            replies = []
+            for line in envelope:
+                reply = await self._command(line)
+                replies.append(reply)
+                # Without pipelining a rejected sender ends the envelope early
+                if line.startswith("MAIL") and reply[0] != 250:
+                    break
+
+        mail_reply, rcpt_replies = replies[0], replies[1:1 + len(message.recipients)]
+        data_reply = replies[-1] if len(replies) == len(envelope) else None
+        refused = {
+            recipient: reply for recipient, reply in zip(message.recipients, rcpt_replies)
+            if reply[0] not in (250, 251)
+        }
+
+        if mail_reply[0] != 250 or len(refused) == len(message.recipients) or data_reply[0] != 354:
+            if data_reply is not None and data_reply[0] == 354:
+                # Server opened DATA anyway; close it empty so the session stays in sync
+                self._writer.write(b".\r\n")
+                await self._writer.drain()
+                await self._read_reply()
+            await self.reset()
+            if mail_reply[0] != 250:
+                raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], message.sender)
+            if len(refused) == len(message.recipients):
+                raise smtplib.SMTPRecipientsRefused(refused)
+            raise smtplib.SMTPDataError(*data_reply)
+
+        self._writer.write(prepare_data(message.data))
+        await self._writer.drain()
+        code, text = await self._read_reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, text)
+
+    async def reset(self):
+        code, text = await self._command("RSET")
+        if code != 250:
+            raise smtplib.SMTPResponseException(code, text)
+
+    def _abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self):
+        if self._writer is None:
+            return
+        try:
+            await asyncio.wait_for(self._command("QUIT"), 5)
+        except Exception:
+            pass
+        finally:
+            self._abort()
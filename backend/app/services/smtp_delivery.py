@@ -0,0 +1,260 @@
+"""Pooled, rate-limited SMTP delivery engine.
+
+``DeliveryEngine.send_many`` fans a batch of pre-built messages out to N
+concurrent senders. The senders share a bounded pool of authenticated SMTP
+connections and a messages-per-second limit. A connection is recycled after
+a configurable number of messages, after sitting idle too long, or after a
+transport error.
+"""
+import asyncio
+import logging
+import smtplib
+import ssl
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rejections that concern one message; the connection itself is still usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class OutboundMessage:
+    """A fully rendered message ready for the wire. `ref` identifies it in the report."""
+
+    __slots__ = ("sender", "recipients", "data", "ref")
+
+    def __init__(self, sender: str, recipients: List[str], data: bytes, ref=None):
+        self.sender = sender
+        self.recipients = recipients
+        self.data = data
+        self.ref = ref
+
+
+def is_permanent(error: Exception) -> bool:
+    """True for 5xx rejections, which will fail the same way if retried."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    code = getattr(error, "smtp_code", None)
+    return isinstance(error, MESSAGE_ERRORS) and isinstance(code, int) and code >= 500
+
+
+class DeliveryReport:
+    __slots__ = ("success", "failure", "errors", "sent_refs", "failed_refs")
+
+    # Keep the first few errors for logs / audit records
+    MAX_ERRORS = 50
+
+    def __init__(self):
+        self.success = 0
+        self.failure = 0
+        self.errors: List[Tuple[str, str]] = []
+        # Outcomes of messages that carry a ref: ref -> (error, permanent)
+        self.sent_refs: list = []
+        self.failed_refs: dict = {}
+
+    def sent(self, message: OutboundMessage):
+        self.success += 1
+        if message.ref is not None:
+            self.sent_refs.append(message.ref)
+
+    def failed(self, message: OutboundMessage, error: Exception):
+        self.failure += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((", ".join(message.recipients), str(error)))
+        if message.ref is not None:
+            self.failed_refs[message.ref] = (str(error), is_permanent(error))
+
+
+class RateLimiter:
+    """Async token bucket. A rate of 0 disables limiting."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SmtplibTransport:
+    """One blocking smtplib connection, driven from worker threads."""
+
+    def __init__(self, host: str, port: int, user: Optional[str], password: Optional[str],
+                 starttls: bool = True, timeout: float = 30, ssl_context: Optional[ssl.SSLContext] = None):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls(context=self.ssl_context)
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    async def connect(self):
+        self._server = await asyncio.to_thread(self._connect)
+
+    async def send(self, message: OutboundMessage):
+        await asyncio.to_thread(self._server.sendmail, message.sender, message.recipients, message.data)
+
+    async def reset(self):
+        await asyncio.to_thread(self._server.rset)
+
+    async def close(self):
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        try:
+            await asyncio.to_thread(server.quit)
+        except Exception:
+            server.close()
+
+
+class PooledConnection:
+    __slots__ = ("transport", "sent", "last_used")
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Bounded pool of connected, authenticated SMTP transports."""
+
+    def __init__(self, factory: Callable[[], object], size: int, max_messages: int, idle_seconds: float):
+        self.factory = factory
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self._idle: List[PooledConnection] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+        self.recycled = 0
+
+    async def acquire(self) -> PooledConnection:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if time.monotonic() - conn.last_used < self.idle_seconds:
+                    return conn
+                # Servers drop idle sessions; do not bet a message on it
+                await self._discard(conn)
+            transport = self.factory()
+            await transport.connect()
+            self.opened += 1
+            return PooledConnection(transport)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, conn: PooledConnection, broken: bool = False):
+        try:
+            if broken or conn.sent >= self.max_messages:
+                await self._discard(conn)
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    async def _discard(self, conn: PooledConnection):
+        self.recycled += 1
+        try:
+            await conn.transport.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._discard(conn)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "idle": len(self._idle), "opened": self.opened, "recycled": self.recycled}
+
+
+class DeliveryEngine:
+    """Sends messages with N concurrent senders over a shared connection pool."""
+
+    def __init__(self, pool: SMTPConnectionPool, senders: int, rate_limiter: RateLimiter):
+        self.pool = pool
+        self.senders = senders
+        self.rate_limiter = rate_limiter
+
+    async def _deliver(self, message: OutboundMessage, report: DeliveryReport):
+        # A dead pooled connection gets one retry on a fresh one
+        for attempt in range(2):
+            try:
+                conn = await self.pool.acquire()
+            except Exception as e:
+                report.failed(message, e)
+                return
+            try:
+                await conn.transport.send(message)
+            except MESSAGE_ERRORS as e:
+                # Rejected by the server: do not retry; keep the session if it resets cleanly
+                report.failed(message, e)
+                try:
+                    await conn.transport.reset()
+                    broken = False
+                except Exception:
+                    broken = True
+                await self.pool.release(conn, broken=broken)
+                return
+            except Exception as e:
+                await self.pool.release(conn, broken=True)
+                if attempt == 1:
+                    report.failed(message, e)
+                continue
+            conn.sent += 1
+            await self.pool.release(conn)
+            report.sent(message)
+            return
+
+    async def send_many(self, messages: Iterable[OutboundMessage]) -> DeliveryReport:
+        report = DeliveryReport()
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+
+        async def sender():
+            while True:
+                try:
+                    message = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.rate_limiter.acquire()
+                await self._deliver(message, report)
+
+        workers = min(self.senders, queue.qsize())
+        await asyncio.gather(*(sender() for _ in range(workers)))
+        for recipient, error in report.errors:
+            logger.error(f"Failed to send to {recipient}: {error}")
+        return report
@@ -0,0 +1,239 @@
+"""Sync approved student submissions from MongoDB into the PostgreSQL students table.
+
+Approvals never talk to PostgreSQL directly. Instead the same MongoDB update
+that approves a submission marks it with a ``pg_sync`` outbox record, and
+``StudentSyncWorker`` drains those records in batches in the background.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+from pymongo import UpdateOne
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.mongodb import get_submissions_collection
+from app.db.postgres import AsyncSessionLocal
+from app.models.sql_models import Student
+
+logger = logging.getLogger(__name__)
+
+# Fields the worker needs to build a students row
+SYNC_PROJECTION = {
+    "usn": 1, "student_name": 1, "email": 1, "branch": 1, "semester": 1,
+    "phone": 1, "date_of_birth": 1, "blood_group": 1, "parent_name": 1,
+    "mother_name": 1, "contact_address": 1, "status": 1, "pg_sync": 1
+}
+
+# Columns refreshed when a student row already exists
+UPSERT_COLUMNS = [
+    "name", "email", "branch", "semester", "phone", "dob",
+    "blood_group", "parent_name", "mother_name", "address"
+]
+
+
+def student_row_from_submission(doc: dict) -> dict:
+    """Map a student_submissions document onto a students table row."""
+    return {
+        "usn": doc["usn"],
+        "name": doc["student_name"],
+        "email": doc.get("email"),
+        "branch": doc["branch"],
+        "semester": doc["semester"],
+        "phone": doc.get("phone"),
+        "dob": doc.get("date_of_birth"),
+        "blood_group": doc.get("blood_group"),
+        "parent_name": doc.get("parent_name"),
+        "mother_name": doc.get("mother_name"),
+        "address": doc.get("contact_address"),
+    }
+
+
+async def upsert_students(session: AsyncSession, rows: List[dict]):
+    """Insert or update many students in a single INSERT ... ON CONFLICT statement."""
+    if not rows:
+        return
+
+    # One statement cannot touch the same row twice; keep the last row per USN
+    unique_rows = list({row["usn"]: row for row in rows}.values())
+    now = datetime.utcnow()
+    for row in unique_rows:
+        row.setdefault("created_at", now)
+        row["updated_at"] = now
+
+    stmt = insert(Student).values(unique_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Student.usn],
+        set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS + ["updated_at"]}
+    )
+    await session.execute(stmt)
+
+
+def outbox_update(set_fields: dict, now: Optional[datetime] = None) -> dict:
+    """
+    Build an update that applies `set_fields` and enqueues the submission
+    for PostgreSQL sync in the same atomic write.
+    """
+    now = now or datetime.utcnow()
+    return {
+        "$set": {
+            **set_fields,
+            "pg_sync.pending": True,
+            "pg_sync.queued_at": now,
+            "pg_sync.next_attempt_at": now,
+            "pg_sync.attempts": 0,
+            "pg_sync.last_error": None
+        },
+        # Bumped on every enqueue so a stale worker ack cannot clear a newer change
+        "$inc": {"pg_sync.version": 1}
+    }
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff in seconds, capped at STUDENT_SYNC_MAX_BACKOFF_SECONDS."""
+    delay = settings.STUDENT_SYNC_BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.STUDENT_SYNC_MAX_BACKOFF_SECONDS)
+
+
+class StudentSyncWorker:
+    """Background task that drains the pg_sync outbox into PostgreSQL."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.synced_total = 0
+        self.failed_total = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            print("🔄 Student sync worker started")
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=10)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+
+    def notify(self):
+        """Wake the worker early, e.g. right after an approval."""
+        self._wakeup.set()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                # Mongo unavailable etc. - keep the worker alive
+                logger.error(f"Student sync worker error: {e}")
+                self.last_error = str(e)
+                processed = 0
+
+            if processed >= settings.STUDENT_SYNC_BATCH_SIZE:
+                continue  # More work is probably waiting
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.STUDENT_SYNC_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """Sync one batch of due outbox records. Returns how many were handled."""
+        collection = get_submissions_collection()
+        now = datetime.utcnow()
+        self.last_run_at = now
+
+        cursor = collection.find(
+            {"pg_sync.pending": True, "pg_sync.next_attempt_at": {"$lte": now}},
+            SYNC_PROJECTION
+        ).sort("pg_sync.next_attempt_at", 1).limit(settings.STUDENT_SYNC_BATCH_SIZE)
+        docs = await cursor.to_list(length=settings.STUDENT_SYNC_BATCH_SIZE)
+        if not docs:
+            return 0
+
+        # Rejected-after-approval documents have nothing to write; just ack them
+        approved = [doc for doc in docs if doc.get("status") == "approved"]
+        errors = {}
+
+        try:
+            async with AsyncSessionLocal() as session:
+                await upsert_students(session, [student_row_from_submission(doc) for doc in approved])
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Batch student sync failed ({e}); retrying rows individually")
+            # Isolate poison rows so one bad record does not block the whole outbox
+            for doc in approved:
+                try:
+                    async with AsyncSessionLocal() as session:
+                        await upsert_students(session, [student_row_from_submission(doc)])
+                        await session.commit()
+                except Exception as row_error:
+                    errors[doc["_id"]] = str(row_error)
+
+        operations = []
+        for doc in docs:
+            sync = doc.get("pg_sync") or {}
+            # Only ack the version we actually read
+            match = {"_id": doc["_id"], "pg_sync.version": sync.get("version")}
+            if doc["_id"] in errors:
+                attempts = sync.get("attempts", 0) + 1
+                operations.append(UpdateOne(match, {"$set": {
+                    "pg_sync.attempts": attempts,
+                    "pg_sync.next_attempt_at": now + timedelta(seconds=backoff_delay(attempts)),
+                    "pg_sync.last_error": errors[doc["_id"]][:500]
+                }}))
+            else:
+                operations.append(UpdateOne(match, {"$set": {
+                    "pg_sync.pending": False,
+                    "pg_sync.synced_at": now,
+                    "pg_sync.last_error": None
+                }}))
+
+        await collection.bulk_write(operations, ordered=False)
+
+        synced = len(docs) - len(errors)
+        self.synced_total += synced
+        self.failed_total += len(errors)
+        if errors:
+            self.last_error = next(iter(errors.values()))
+            print(f"❌ Failed to sync {len(errors)} students to Postgres (will retry)")
+        if synced:
+            print(f"✅ Synced {synced} students to PostgreSQL.")
+
+        return len(docs)
+
+    async def metrics(self) -> dict:
+        """Outbox depth and lag (age of the oldest unsynced approval)."""
+        collection = get_submissions_collection()
+        pending = await collection.count_documents({"pg_sync.pending": True})
+        oldest = await collection.find_one(
+            {"pg_sync.pending": True},
+            sort=[("pg_sync.queued_at", 1)],
+            projection={"pg_sync.queued_at": 1}
+        )
+        lag_seconds = 0.0
+        if oldest:
+            lag_seconds = (datetime.utcnow() - oldest["pg_sync"]["queued_at"]).total_seconds()
+
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "pending": pending,
+            "lag_seconds": round(lag_seconds, 3),
+            "synced_total": self.synced_total,
+            "failed_total": self.failed_total,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error
+        }
+
+
+# Singleton instance
+student_sync_worker = StudentSyncWorker()
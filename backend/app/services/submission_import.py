@@ -0,0 +1,116 @@
+"""Streaming readers for bulk student registration imports (CSV / XLSX)."""
+import codecs
+import csv
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from email_validator import validate_email, EmailNotValidError
+
+# Spreadsheet header -> StudentSubmissionCreate field
+HEADER_ALIASES = {
+    "name": "student_name",
+    "student": "student_name",
+    "sem": "semester",
+    "dob": "date_of_birth",
+    "birth_date": "date_of_birth",
+    "address": "contact_address",
+    "father_name": "parent_name",
+    "mother": "mother_name",
+    "aadhaar": "aadhaar_number",
+    "aadhar_number": "aadhaar_number",
+    "phone_number": "phone",
+    "mobile": "phone",
+    "email_id": "email",
+}
+
+# Uploads are never taken from spreadsheets
+IGNORED_COLUMNS = {"photo_base64", "signature_base64"}
+
+
+def normalize_header(header) -> str:
+    key = str(header or "").strip().lower().replace(" ", "_").replace("-", "_").replace(".", "")
+    return HEADER_ALIASES.get(key, key)
+
+
+def normalize_cell(value):
+    """Turn spreadsheet cell values into the strings/ints the schema expects."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Phone numbers and Aadhaar arrive as floats from Excel
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    value = str(value).strip()
+    return value or None
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    """
+    Lowercase and validate an imported email, so it matches the Firebase
+    login email used by identity lookups and recipient resolution.
+    """
+    if not value:
+        return None
+    try:
+        validated = validate_email(value.strip(), check_deliverability=False)
+    except EmailNotValidError as e:
+        raise ValueError(str(e))
+    return validated.normalized.lower()
+
+
+def _rows_from_headers(headers: List[str], rows: Iterator) -> Iterator[Tuple[int, dict]]:
+    # Header is row 1, so data starts at row 2
+    for row_number, values in enumerate(rows, start=2):
+        record = {}
+        for header, value in zip(headers, values):
+            if header and header not in IGNORED_COLUMNS:
+                record[header] = normalize_cell(value)
+        if any(v is not None for v in record.values()):
+            yield row_number, record
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Yield (row_number, record) from a CSV file without loading it whole."""
+    text = codecs.getreader("utf-8-sig")(file, errors="replace")
+    reader = csv.reader(text)
+    try:
+        headers = [normalize_header(h) for h in next(reader)]
+    except StopIteration:
+        return
+    yield from _rows_from_headers(headers, reader)
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Yield (row_number, record) from the first sheet using openpyxl read-only mode."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        try:
+            headers = [normalize_header(h) for h in next(rows)]
+        except StopIteration:
+            return
+        yield from _rows_from_headers(headers, rows)
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(file: BinaryIO, filename: str) -> Iterator[Tuple[int, dict]]:
+    name = (filename or "").lower()
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(file)
+    if name.endswith(".csv"):
+        return iter_csv_rows(file)
+    raise ValueError("Unsupported file type. Upload a .csv or .xlsx file.")
+
+
+def next_chunk(rows: Iterator, size: int) -> list:
+    """Pull the next `size` rows from a row iterator."""
+    return list(islice(rows, size))
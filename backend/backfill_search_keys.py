@@ -0,0 +1,50 @@
+"""
+Populate search_keys on existing student_submissions.
+
+Usage: python backfill_search_keys.py [--all]
+By default only documents without search_keys are touched; --all rebuilds every document
+(run it once to add the whole-token keys used for exact autocomplete hits).
+"""
+import asyncio
+import sys
+import os
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from pymongo import UpdateOne
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_submissions_collection
+from app.services.search_index import build_search_keys
+
+BATCH_SIZE = 1000
+
+
+async def backfill_search_keys(rebuild_all: bool = False):
+    await connect_to_mongo()
+    collection = get_submissions_collection()
+
+    query = {} if rebuild_all else {"search_keys": {"$exists": False}}
+    projection = {"student_name": 1, "usn": 1}
+
+    updated = 0
+    batch = []
+    async for doc in collection.find(query, projection):
+        keys = build_search_keys(doc.get("student_name"), doc.get("usn"))
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_keys": keys}}))
+        if len(batch) >= BATCH_SIZE:
+            result = await collection.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+            batch = []
+
+    if batch:
+        result = await collection.bulk_write(batch, ordered=False)
+        updated += result.modified_count
+
+    print(f"✅ Updated search keys on {updated} submissions.")
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(backfill_search_keys(rebuild_all="--all" in sys.argv))
@@ -0,0 +1,103 @@
+"""
+Benchmark saving an attendance roster: per-record SELECT + INSERT/UPDATE versus
+one multi-row INSERT ... ON CONFLICT DO UPDATE.
+
+Runs against DATABASE_URL on a temporary copy of event_attendance (dropped when
+the connection closes), so real attendance data is never touched. Each approach
+saves the roster twice: a first save (all inserts) and a re-save (all updates).
+
+Usage: python benchmark_attendance.py [--participants 300] [--repeat 3]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from datetime import date
+from types import SimpleNamespace
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import MetaData, select, insert, update, text
+from app.db.postgres import engine
+from app.models.sql_models import EventAttendance
+from app.services.attendance import attendance_rows, upsert_statement, UPSERT_CHUNK_SIZE
+
+BENCH_TABLE = "bench_event_attendance"
+EVENT_ID = 1
+MARKED_BY = 1
+
+
+def roster(count: int, status: str) -> list:
+    return [SimpleNamespace(usn=f"1RV23CS{i:04d}", student_name=f"Student {i}", status=status) for i in range(count)]
+
+
+async def save_per_record(conn, table, rows):
+    """The previous save_attendance: one SELECT per record, then INSERT or UPDATE."""
+    for row in rows:
+        existing = (await conn.execute(
+            select(table.c.id).where(
+                table.c.event_id == row["event_id"],
+                table.c.usn == row["usn"],
+                table.c.attendance_date == row["attendance_date"]
+            )
+        )).scalar_one_or_none()
+        if existing:
+            await conn.execute(
+                update(table).where(table.c.id == existing)
+                .values(status=row["status"], marked_by=row["marked_by"], marked_at=row["marked_at"])
+            )
+        else:
+            await conn.execute(insert(table).values(**row))
+
+
+async def save_upsert(conn, table, rows):
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        await conn.execute(upsert_statement(rows[start:start + UPSERT_CHUNK_SIZE], table))
+
+
+async def timed(conn, table, save, rows) -> float:
+    started = time.perf_counter()
+    await save(conn, table, rows)
+    await conn.commit()
+    return time.perf_counter() - started
+
+
+async def main(args):
+    table = EventAttendance.__table__.to_metadata(MetaData(), name=BENCH_TABLE)
+    day = date.today()
+    first = attendance_rows(EVENT_ID, day, roster(args.participants, "present"), MARKED_BY)
+    second = attendance_rows(EVENT_ID, day, roster(args.participants, "absent"), MARKED_BY)
+
+    print(f"📋 Roster of {args.participants} participants, best of {args.repeat} runs")
+    async with engine.connect() as conn:
+        # Same columns, own id identity (the real id sequence is left alone), no foreign keys
+        await conn.execute(text(f"CREATE TEMP TABLE {BENCH_TABLE} (LIKE event_attendance)"))
+        await conn.execute(text(f"ALTER TABLE {BENCH_TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"))
+        await conn.execute(text(f"CREATE INDEX ON {BENCH_TABLE} (usn)"))
+        await conn.execute(text(f"CREATE UNIQUE INDEX ON {BENCH_TABLE} (event_id, usn, attendance_date)"))
+        await conn.commit()
+
+        for name, save in (("per-record", save_per_record), ("upsert", save_upsert)):
+            inserts, updates = [], []
+            for _ in range(args.repeat):
+                await conn.execute(text(f"TRUNCATE {BENCH_TABLE}"))
+                await conn.commit()
+                inserts.append(await timed(conn, table, save, first))
+                updates.append(await timed(conn, table, save, second))
+            print(f"   {name:<11} first save {min(inserts) * 1000:8.1f} ms   re-save {min(updates) * 1000:8.1f} ms")
+
+        count = (await conn.execute(text(f"SELECT count(*) FROM {BENCH_TABLE}"))).scalar()
+        print(f"   rows after both approaches: {count} (expected {args.participants})")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+"""
+Benchmark the pooled SMTP delivery engine against the local SMTP sink.
+
+Runs entirely offline: an in-process SMTPSink stands in for the provider.
+Compares one connection / one sender (the old send_batch behaviour) with the
+pooled, concurrent configuration, for both the threaded smtplib transport and
+the native asyncio transport.
+
+Usage: python benchmark_email.py [--messages 500] [--latency-ms 20] [--senders 8] [--pool 8] [--rate 0] [--tls]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from smtp_sink import SMTPSink, self_signed_context, insecure_client_context
+from app.services.smtp_async import AsyncSMTPTransport
+from app.services.smtp_delivery import (
+    DeliveryEngine, OutboundMessage, RateLimiter, SMTPConnectionPool, SmtplibTransport
+)
+
+TRANSPORTS = {"smtplib": SmtplibTransport, "asyncio": AsyncSMTPTransport}
+
+
+def build_messages(count: int) -> list:
+    body = ("<p>Dear student, this is a benchmark message.</p>" * 20).encode()
+    return [
+        OutboundMessage(
+            "no-reply@rvce.edu.in",
+            [f"student{i}@rvce.edu.in"],
+            b"Subject: Benchmark\r\nContent-Type: text/html\r\n\r\n" + body
+        )
+        for i in range(count)
+    ]
+
+
+async def run(sink: SMTPSink, messages: list, transport: str, pool_size: int, senders: int, rate: float,
+              max_messages: int):
+    tls = sink.ssl_context is not None
+    pool = SMTPConnectionPool(
+        lambda: TRANSPORTS[transport](
+            sink.host, sink.port, "bench", "bench",
+            starttls=tls, ssl_context=insecure_client_context() if tls else None
+        ),
+        size=pool_size,
+        max_messages=max_messages,
+        idle_seconds=60
+    )
+    engine = DeliveryEngine(pool, senders=senders, rate_limiter=RateLimiter(rate))
+    started = time.perf_counter()
+    report = await engine.send_many(messages)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+    print(
+        f"   {transport:<8} pool={pool_size:<3} senders={senders:<3} rate={rate or '∞':<5} "
+        f"sent={report.success:<5} failed={report.failure:<3} "
+        f"{elapsed:7.2f}s  {report.success / elapsed:8.1f} msg/s  "
+        f"(connections opened {pool.opened}, recycled {pool.recycled})"
+    )
+
+
+async def main(args):
+    sink = await SMTPSink(
+        port=0,
+        latency=args.latency_ms / 1000,
+        drop_after=args.drop_after,
+        ssl_context=self_signed_context() if args.tls else None
+    ).start()
+    messages = build_messages(args.messages)
+    print(f"📬 {args.messages} messages, sink latency {args.latency_ms}ms per message, STARTTLS {'on' if args.tls else 'off'}")
+    try:
+        await run(sink, messages, "smtplib", 1, 1, args.rate, args.max_per_connection)
+        for transport in TRANSPORTS:
+            await run(sink, messages, transport, args.pool, args.senders, args.rate, args.max_per_connection)
+    finally:
+        await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--senders", type=int, default=8)
+    parser.add_argument("--pool", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0.0, help="Messages per second limit (0 = none)")
+    parser.add_argument("--max-per-connection", type=int, default=100)
+    parser.add_argument("--drop-after", type=int, default=0, help="Sink closes sessions after N messages")
+    parser.add_argument("--tls", action="store_true", help="Use STARTTLS with a self-signed sink certificate")
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(parser.parse_args()))
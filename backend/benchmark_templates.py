@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: per-message CPU cost of personalizing and serializing an email.
+
+Compares the old path (str.replace chain + fresh MIMEMultipart per recipient)
+with the compiled template + pre-serialized MIME skeleton used by EmailService.
+
+Usage: python benchmark_templates.py [--recipients 2000]
+"""
+import argparse
+import sys
+import os
+import time
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from app.services.email_templates import MessageSkeleton, compile_template
+
+SENDER = "no-reply@rvce.edu.in"
+SUBJECT = "New Event: Inter-College Athletics Meet - RVCE Sports"
+TEMPLATE = (
+    "Dear {{student_name}},\n\n"
+    "Your registration ({{usn}}, {{branch}}, semester {{semester}}) has been confirmed.\n"
+    + "<p>Please report to the Sports Department with your ID card. Details follow below.</p>\n" * 30
+    + "Regards,\nRVCE Sports Dept"
+)
+
+
+def legacy_message(recipient: dict) -> bytes:
+    personal_body = TEMPLATE.replace("\n", "<br>")
+    replacements = {
+        "{{student_name}}": recipient.get("name", "Student"),
+        "{{usn}}": recipient.get("usn", "N/A"),
+        "{{branch}}": recipient.get("branch", "N/A"),
+        "{{semester}}": str(recipient.get("semester", "")),
+    }
+    for key, value in replacements.items():
+        personal_body = personal_body.replace(key, value)
+    msg = MIMEMultipart()
+    msg['From'] = SENDER
+    msg['To'] = recipient['email']
+    msg['Subject'] = SUBJECT
+    msg.attach(MIMEText(personal_body, 'html'))
+    return msg.as_bytes()
+
+
+def compiled_messages(recipients: list) -> list:
+    template = compile_template(TEMPLATE)
+    skeleton = MessageSkeleton(SENDER, SUBJECT)
+    return [skeleton.build(r["email"], template.render(r)) for r in recipients]
+
+
+def measure(label: str, fn, recipients: list):
+    started = time.process_time()
+    fn(recipients)
+    elapsed = time.process_time() - started
+    per_message = elapsed / len(recipients) * 1e6
+    print(f"   {label:<28} {elapsed * 1000:8.1f} ms total  {per_message:8.1f} µs/message")
+    return per_message
+
+
+def main(count: int):
+    recipients = [
+        {"email": f"student{i}@rvce.edu.in", "name": f"Student {i}", "usn": f"1RV23CS{i:03d}",
+         "branch": "CSE", "semester": 5}
+        for i in range(count)
+    ]
+    print(f"✉️  {count} recipients, template {len(TEMPLATE)} chars")
+    legacy = measure("replace chain + MIMEMultipart", lambda rs: [legacy_message(r) for r in rs], recipients)
+    compiled = measure("compiled template + skeleton", compiled_messages, recipients)
+    print(f"   speed-up: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=2000)
+    main(parser.parse_args().recipients)
@@ -0,0 +1,54 @@
+"""
+Remove duplicate event_attendance rows and add the unique (event_id, usn, attendance_date) index.
+
+For every (event, usn, date) the most recently marked row is kept (ties: highest id).
+Usage: python dedupe_attendance.py [--dry-run]
+"""
+import asyncio
+import sys
+import os
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+from app.db.postgres import engine
+from app.models.sql_models import EventAttendance
+
+RANKED = """
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY event_id, usn, attendance_date
+        ORDER BY marked_at DESC NULLS LAST, id DESC
+    ) AS rn
+    FROM event_attendance
+"""
+
+UNIQUE_INDEX = next(index for index in EventAttendance.__table__.indexes if index.name == "uq_event_attendance_event_usn_date")
+
+
+async def dedupe_attendance(dry_run: bool = False):
+    async with engine.begin() as conn:
+        # Block concurrent saves so no new duplicate sneaks in before the index exists
+        await conn.execute(text("LOCK TABLE event_attendance IN SHARE ROW EXCLUSIVE MODE"))
+
+        duplicates = (await conn.execute(text(f"SELECT count(*) FROM ({RANKED}) ranked WHERE rn > 1"))).scalar()
+        print(f"🔍 Found {duplicates} duplicate attendance rows.")
+        if dry_run:
+            print("Dry run: nothing changed.")
+            return
+
+        result = await conn.execute(text(
+            f"DELETE FROM event_attendance a USING ({RANKED}) ranked WHERE a.id = ranked.id AND ranked.rn > 1"
+        ))
+        print(f"🗑️ Deleted {result.rowcount} duplicate rows.")
+
+        await conn.run_sync(lambda sync_conn: UNIQUE_INDEX.create(sync_conn, checkfirst=True))
+        print(f"✅ Unique index {UNIQUE_INDEX.name} is in place.")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(dedupe_attendance(dry_run="--dry-run" in sys.argv))
@@ -0,0 +1,69 @@
+"""
+Move inline base64 photos/signatures out of student_submissions into the blob store.
+
+Usage: python migrate_blobs.py [--dry-run]
+Safe to re-run: already-migrated documents no longer match the query.
+"""
+import asyncio
+import sys
+import os
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_submissions_collection
+from app.services.blob_store import blob_store
+
+FIELDS = [("photo_base64", "photo_blob"), ("signature_base64", "signature_blob")]
+
+
+async def migrate_blobs(dry_run: bool = False):
+    await connect_to_mongo()
+    collection = get_submissions_collection()
+
+    query = {"$or": [
+        {"photo_base64": {"$nin": [None, ""]}},
+        {"signature_base64": {"$nin": [None, ""]}}
+    ]}
+    projection = {"usn": 1, "photo_base64": 1, "signature_base64": 1}
+
+    migrated = 0
+    failed = 0
+    saved_bytes = 0
+
+    async for doc in collection.find(query, projection):
+        update_set = {}
+        update_unset = {}
+        try:
+            for inline_field, blob_field in FIELDS:
+                value = doc.get(inline_field)
+                if not value:
+                    continue
+                if dry_run:
+                    saved_bytes += len(value)
+                    continue
+                update_set[blob_field] = await blob_store.put_base64(value)
+                update_unset[inline_field] = ""
+                saved_bytes += len(value)
+        except ValueError as e:
+            print(f"  ❌ {doc.get('usn')}: {e}")
+            failed += 1
+            continue
+
+        if not dry_run and update_set:
+            await collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": update_set, "$unset": update_unset}
+            )
+        migrated += 1
+        print(f"  ✅ {doc.get('usn')}")
+
+    action = "Would migrate" if dry_run else "Migrated"
+    print(f"{action} {migrated} submissions ({saved_bytes / 1024 / 1024:.1f} MB inline base64), {failed} failed.")
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(migrate_blobs(dry_run="--dry-run" in sys.argv))
@@ -0,0 +1,77 @@
+"""
+Renumber SLNs of approved submissions so they run 1..N without gaps,
+then reset the SLN counter to N.
+
+Usage: python renumber_sln.py [--dry-run]
+Existing order is preserved (by current SLN, then reviewed_at). Approved
+submissions without an SLN are appended at the end, and stale SLNs on
+non-approved submissions are cleared so a later re-approval draws a fresh
+number instead of reusing one. Run this while no
+admin is approving, since it rewrites the counter.
+"""
+import asyncio
+import sys
+import os
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from datetime import datetime
+from pymongo import UpdateOne
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_submissions_collection
+from app.services.counters import get_counters_collection, SLN_COUNTER
+
+BATCH_SIZE = 1000
+
+
+async def renumber_sln(dry_run: bool = False):
+    await connect_to_mongo()
+    collection = get_submissions_collection()
+
+    cursor = collection.find(
+        {"status": "approved"},
+        {"usn": 1, "sln": 1, "reviewed_at": 1}
+    )
+    docs = await cursor.to_list(length=None)
+
+    # Numbered students first (keep their relative order), then the unnumbered
+    docs.sort(key=lambda d: (
+        d.get("sln") is None,
+        d.get("sln") or 0,
+        d.get("reviewed_at") or datetime.min
+    ))
+
+    operations = []
+    for new_sln, doc in enumerate(docs, start=1):
+        if doc.get("sln") != new_sln:
+            print(f"  {doc.get('usn')}: {doc.get('sln')} -> {new_sln}")
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"sln": new_sln}}))
+
+    if dry_run:
+        print(f"Would renumber {len(operations)} of {len(docs)} approved submissions.")
+        await close_mongo_connection()
+        return
+
+    for i in range(0, len(operations), BATCH_SIZE):
+        await collection.bulk_write(operations[i:i + BATCH_SIZE], ordered=False)
+
+    # Clear SLNs left on non-approved submissions so numbers are not reused twice
+    cleared = await collection.update_many(
+        {"status": {"$ne": "approved"}, "sln": {"$ne": None}},
+        {"$set": {"sln": None}}
+    )
+
+    await get_counters_collection().update_one(
+        {"_id": SLN_COUNTER},
+        {"$set": {"seq": len(docs)}},
+        upsert=True
+    )
+
+    print(f"✅ Renumbered {len(operations)} submissions, cleared {cleared.modified_count} stale SLNs. Counter = {len(docs)}.")
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(renumber_sln(dry_run="--dry-run" in sys.argv))
@@ -0,0 +1,188 @@
+"""
+Local stand-in SMTP server for offline email throughput benchmarks.
+
+Accepts any AUTH, advertises PIPELINING and discards every message. An
+optional per-message latency simulates a real provider.
+
+Usage: python smtp_sink.py [--port 1025] [--latency-ms 20] [--drop-after N] [--tls]
+Then point SMTP_HOST/SMTP_PORT at it with SMTP_STARTTLS=false (or --tls with
+a client that skips certificate verification).
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import ssl
+import sys
+import tempfile
+import time
+
+
+def self_signed_context() -> ssl.SSLContext:
+    """Server SSL context with a throwaway self-signed certificate for STARTTLS."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path, key_path = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        with open(cert_path, "wb") as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(key_path, "wb") as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()
+            ))
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+def insecure_client_context() -> ssl.SSLContext:
+    """Client context that accepts the sink's self-signed certificate."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025, latency: float = 0.0,
+                 drop_after: int = 0, ssl_context=None, reject: str = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        # Close the session after this many messages (exercises connection recycling)
+        self.drop_after = drop_after
+        self.ssl_context = ssl_context
+        # Refuse recipients containing this substring (exercises per-message failures)
+        self.reject = reject
+        self.messages = 0
+        self.sessions = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _capabilities(self, tls_active: bool) -> list:
+        capabilities = ["sink", "PIPELINING", "8BITMIME", "AUTH PLAIN LOGIN"]
+        if self.ssl_context and not tls_active:
+            capabilities.append("STARTTLS")
+        return capabilities
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.sessions += 1
+        session_messages = 0
+        tls_active = False
+
+        async def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        try:
+            await reply("220 sink ESMTP ready")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb in ("EHLO", "HELO"):
+                    capabilities = self._capabilities(tls_active)
+                    for capability in capabilities[:-1]:
+                        writer.write(f"250-{capability}\r\n".encode())
+                    await reply(f"250 {capabilities[-1]}")
+                elif verb == "STARTTLS" and self.ssl_context and not tls_active:
+                    await reply("220 Ready to start TLS")
+                    await writer.start_tls(self.ssl_context)
+                    tls_active = True
+                elif verb == "AUTH":
+                    parts = command.split()
+                    mechanism = parts[1].upper() if len(parts) > 1 else ""
+                    if mechanism == "LOGIN":
+                        await reply("334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif mechanism == "PLAIN" and len(parts) == 2:
+                        await reply("334 ")
+                        await reader.readline()
+                    await reply("235 Authentication successful")
+                elif verb == "RCPT" and self.reject and self.reject in command:
+                    await reply("550 Mailbox unavailable")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.messages += 1
+                    session_messages += 1
+                    await reply("250 OK queued")
+                    if self.drop_after and session_messages >= self.drop_after:
+                        break
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(args):
+    ssl_context = self_signed_context() if args.tls else None
+    sink = await SMTPSink(args.host, args.port, args.latency_ms / 1000, args.drop_after, ssl_context, args.reject).start()
+    print(f"📭 SMTP sink listening on {sink.host}:{sink.port} (latency {args.latency_ms}ms)")
+    last, last_time = 0, time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(5)
+            now = time.monotonic()
+            if sink.messages != last:
+                rate = (sink.messages - last) / (now - last_time)
+                print(f"   {sink.messages} messages, {sink.sessions} sessions, {rate:.1f} msg/s")
+            last, last_time = sink.messages, now
+    finally:
+        await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--drop-after", type=int, default=0)
+    parser.add_argument("--tls", action="store_true", help="Offer STARTTLS with a self-signed certificate")
+    parser.add_argument("--reject", help="Refuse recipients containing this text")
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,134 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.services import attendance as attendance_module
+from app.services.attendance import (
+    attendance_rows, attendance_edit_rows, build_attendance_matrix, event_dates, naive_utc, status_code
+)
+
+EVENT = SimpleNamespace(id=7, start_date=date(2026, 3, 1), end_date=date(2026, 3, 3))
+SINCE = datetime(2026, 3, 2, 12, 0, 0)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+
+class FakeParticipation:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        def matches(doc):
+            wanted = query["status"]
+            if isinstance(wanted, dict):
+                if doc["status"] == wanted["$ne"]:
+                    return False
+            elif doc["status"] != wanted:
+                return False
+            # Naive vs aware comparison raises here just as it does on real rows
+            return "processed_at" not in query or doc["processed_at"] > query["processed_at"]["$gt"]
+        return FakeCursor([
+            {key: doc[key] for key in ("usn", "student_name", "processed_at") if key in doc}
+            for doc in self.docs if doc["event_id"] == query["event_id"] and matches(doc)
+        ])
+
+
+class FakeSession:
+    def __init__(self, marks):
+        self.marks = marks
+
+    async def execute(self, query):
+        return SimpleNamespace(all=lambda: self.marks)
+
+    async def scalar(self, query):
+        return max((mark[3] for mark in self.marks), default=None)
+
+
+def build(monkeypatch, participants, marks, since=None):
+    monkeypatch.setattr(attendance_module, "get_participation_collection", lambda: FakeParticipation(participants))
+    return asyncio.run(build_attendance_matrix(FakeSession(marks), EVENT, since))
+
+
+def test_status_codes():
+    assert status_code("present") == "P"
+    assert status_code("Absent") == "A"
+    assert status_code(None) == "-"
+    assert status_code("late") == "?"
+
+
+def test_event_dates_are_inclusive():
+    assert event_dates(EVENT) == [date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)]
+
+
+def test_attendance_rows_keep_last_mark_per_usn():
+    records = [
+        SimpleNamespace(usn="U1", student_name="A", status="present"),
+        SimpleNamespace(usn="U2", student_name="B", status="absent"),
+        SimpleNamespace(usn="U1", student_name="A", status="absent"),
+    ]
+    rows = attendance_rows(7, date(2026, 3, 1), records, marked_by=1)
+    assert {row["usn"]: row["status"] for row in rows} == {"U1": "absent", "U2": "absent"}
+
+
+def test_attendance_edit_rows_keep_last_edit_per_cell():
+    edits = [
+        SimpleNamespace(usn="U1", student_name="A", attendance_date=date(2026, 3, 1), status="present"),
+        SimpleNamespace(usn="U1", student_name="A", attendance_date=date(2026, 3, 2), status="present"),
+        SimpleNamespace(usn="U1", student_name="A", attendance_date=date(2026, 3, 1), status=None),
+    ]
+    rows = attendance_edit_rows(7, edits, marked_by=1)
+    assert sorted((row["attendance_date"].day, row["status"]) for row in rows) == [(1, None), (2, "present")]
+
+
+def test_naive_utc():
+    aware = datetime(2026, 3, 2, 17, 30, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    assert naive_utc(aware) == SINCE
+    assert naive_utc(SINCE) is SINCE
+    assert naive_utc(None) is None
+
+
+def test_full_matrix_encodes_one_character_per_day(monkeypatch):
+    participants = [
+        {"event_id": 7, "usn": "U1", "student_name": "A", "status": "selected", "processed_at": SINCE},
+        {"event_id": 7, "usn": "U2", "student_name": "B", "status": "selected", "processed_at": SINCE},
+    ]
+    marks = [
+        ("U1", date(2026, 3, 1), "present", SINCE),
+        ("U1", date(2026, 3, 3), "absent", SINCE),
+        ("U2", date(2026, 3, 2), "present", SINCE),
+        ("GONE", date(2026, 3, 2), "present", SINCE),
+        ("U2", date(2026, 4, 1), "present", SINCE),
+    ]
+    matrix = build(monkeypatch, participants, marks)
+    assert matrix.full and matrix.roster_size == 2
+    assert {p["usn"]: p["statuses"] for p in matrix.participants} == {"U1": "P-A", "U2": "-P-"}
+
+
+def test_delta_with_aware_since_reports_drop_and_new_selection(monkeypatch):
+    later = SINCE + timedelta(minutes=10)
+    participants = [
+        {"event_id": 7, "usn": "U1", "student_name": "A", "status": "selected", "processed_at": SINCE - timedelta(days=1)},
+        {"event_id": 7, "usn": "U2", "student_name": "B", "status": "dropped", "processed_at": later},
+        {"event_id": 7, "usn": "U3", "student_name": "C", "status": "selected", "processed_at": later},
+    ]
+    marks = [
+        ("U1", date(2026, 3, 2), "absent", later),
+        ("U3", date(2026, 3, 1), "present", later),
+    ]
+    since = naive_utc(SINCE.replace(tzinfo=timezone.utc))
+    matrix = build(monkeypatch, participants, marks, since)
+
+    # Roster size stays 2, so only `dropped` tells the client U2 left
+    assert not matrix.full and matrix.roster_size == 2
+    assert matrix.dropped == ["U2"]
+    assert [(p["usn"], p["statuses"]) for p in matrix.participants] == [("U3", "P--")]
+    assert matrix.changes == [{"usn": "U1", "day": 1, "status": "A"}]
+    assert matrix.version == later
@@ -0,0 +1,34 @@
+import base64
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.blob_store import decode_base64_upload
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+HASH = "ab" * 32
+
+
+def test_decode_data_url_and_sniffed_type():
+    encoded = base64.b64encode(PNG).decode()
+    assert decode_base64_upload(f"data:image/png;base64,{encoded}") == (PNG, "image/png")
+    # Wrapped base64 is accepted; the type is sniffed from the bytes
+    wrapped = "\n".join(encoded[i:i + 8] for i in range(0, len(encoded), 8))
+    assert decode_base64_upload(wrapped) == (PNG, "image/png")
+
+
+@pytest.mark.parametrize("value", ["data:image/png;base64,iVBOR*w0K", "not base64 at all!", "abc"])
+def test_decode_rejects_corrupt_input(value):
+    with pytest.raises(ValueError):
+        decode_base64_upload(value)
+
+
+def test_blob_requires_credentials():
+    client = TestClient(app)
+    response = client.get(f"/api/blobs/{HASH}")
+    assert response.status_code == 401
+
+
+def test_blob_rejects_unknown_bearer_token():
+    client = TestClient(app)
+    response = client.get(f"/api/blobs/{HASH}", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
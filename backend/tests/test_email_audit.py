@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from app.services.email_audit import GENESIS_HASH, link_hash, verify_chain
+
+
+def audit_log(log_id, **fields):
+    values = {
+        "id": log_id, "admin_id": 1, "sent_at": datetime(2026, 3, 1, 9, log_id), "subject": f"Notice {log_id}",
+        "body_preview": "Hello", "filters_used": "{}", "recipient_count": 40, "success_count": 0
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def build_chain(count, prev_hash=GENESIS_HASH):
+    rows = []
+    for seq in range(1, count + 1):
+        log = audit_log(seq)
+        link = SimpleNamespace(seq=seq, audit_log_id=log.id, prev_hash=prev_hash, chain_hash=link_hash(prev_hash, seq, log))
+        log.blockchain_hash = prev_hash = link.chain_hash
+        rows.append((link, log))
+    return rows
+
+
+class FakeStream:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        async def iterate():
+            for row in self.rows:
+                yield row
+        return iterate()
+
+    async def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, rows, checkpoint=None):
+        self.rows = rows
+        self.checkpoint = checkpoint
+        self.added = []
+
+    async def execute(self, query):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.checkpoint)
+
+    async def get(self, model, seq):
+        return next((link for link, _ in self.rows if link.seq == seq), None)
+
+    async def stream(self, query):
+        after = self.checkpoint.seq if self.checkpoint else 0
+        return FakeStream([(link, log) for link, log in self.rows if link.seq > after])
+
+    def add(self, row):
+        self.added.append(row)
+
+
+def test_link_hash_ignores_mutable_counts():
+    log = audit_log(1)
+    before = link_hash(GENESIS_HASH, 1, log)
+    log.success_count = 40
+    assert link_hash(GENESIS_HASH, 1, log) == before
+    log.subject = "Changed"
+    assert link_hash(GENESIS_HASH, 1, log) != before
+
+
+def test_full_verification_records_checkpoint():
+    rows = build_chain(4)
+    session = FakeSession(rows)
+    result = asyncio.run(verify_chain(session, full=True, verified_by=7))
+    assert result.valid and result.checked == 4 and result.head_seq == 4
+    (checkpoint,) = session.added
+    assert (checkpoint.seq, checkpoint.chain_hash, checkpoint.verified_by) == (4, rows[-1][0].chain_hash, 7)
+
+
+def test_incremental_verification_starts_after_checkpoint():
+    rows = build_chain(5)
+    checkpoint = SimpleNamespace(seq=3, chain_hash=rows[2][0].chain_hash)
+    result = asyncio.run(verify_chain(FakeSession(rows, checkpoint)))
+    assert result.valid and result.start_seq == 4 and result.checked == 2
+
+
+def test_tampered_log_breaks_chain():
+    rows = build_chain(4)
+    rows[2][1].subject = "Edited afterwards"
+    result = asyncio.run(verify_chain(FakeSession(rows), full=True))
+    assert not result.valid
+    assert (result.broken_seq, result.broken_log_id, result.checked) == (3, 3, 2)
+
+
+def test_missing_link_is_reported():
+    rows = build_chain(4)
+    del rows[1]
+    result = asyncio.run(verify_chain(FakeSession(rows), full=True))
+    assert not result.valid and result.broken_seq == 3 and "Missing" in result.reason
+
+
+def test_modified_checkpointed_link_is_reported():
+    rows = build_chain(3)
+    checkpoint = SimpleNamespace(seq=2, chain_hash="0" * 64)
+    result = asyncio.run(verify_chain(FakeSession(rows, checkpoint)))
+    assert not result.valid and result.broken_seq == 2
@@ -0,0 +1,204 @@
+"""Outbox state machine tests on an in-memory SQLite database (FOR UPDATE is a no-op there)."""
+import asyncio
+import smtplib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.models.sql_models import EmailAuditLog, EmailCampaign, EmailOutbox
+from app.services import email_outbox as outbox_module
+from app.services.email_outbox import EmailOutboxWorker, outbox_backoff_delay, redrive
+from app.services.email_templates import compile_template
+from app.services.smtp_delivery import DeliveryReport, OutboundMessage
+
+TABLES = [EmailAuditLog.__table__, EmailCampaign.__table__, EmailOutbox.__table__]
+
+
+class FakeEmailService:
+    """Stands in for email_service: records messages and fails the refs it is told to."""
+
+    configured = True
+
+    def __init__(self):
+        self.failures = {}  # email -> exception
+        self.delivered = []
+
+    def render_messages(self, recipients, subject, body_template, refs):
+        template = compile_template(body_template)
+        return [
+            OutboundMessage("sports@rvce.edu.in", [r["email"]], template.render(r).encode(), ref=ref)
+            for r, ref in zip(recipients, refs)
+        ]
+
+    async def deliver(self, messages):
+        report = DeliveryReport()
+        for message in messages:
+            error = self.failures.get(message.recipients[0])
+            if error:
+                report.failed(message, error)
+            else:
+                self.delivered.append(message.recipients[0])
+                report.sent(message)
+        return report
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    service = FakeEmailService()
+    monkeypatch.setattr(outbox_module, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(outbox_module, "email_service", service)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 3)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: EmailOutbox.metadata.create_all(sync_conn, tables=TABLES))
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(setup())
+    yield SimpleNamespace(loop=loop, sessions=sessions, service=service, worker=EmailOutboxWorker())
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+def run(outbox, coro):
+    return outbox.loop.run_until_complete(coro)
+
+
+async def add_campaign(outbox, emails, body="Hi {{student_name}}", log_id=1, **row_fields):
+    async with outbox.sessions() as session:
+        log = EmailAuditLog(id=log_id, admin_id=1, subject="Trials", recipient_count=len(emails))
+        session.add(log)
+        await session.flush()
+        await outbox_module.enqueue_campaign(session, log, body, [{"email": e, "name": e.split("@")[0]} for e in emails])
+        await session.commit()
+        if row_fields:
+            rows = (await session.execute(select(EmailOutbox))).scalars().all()
+            for row in rows:
+                for key, value in row_fields.items():
+                    setattr(row, key, value)
+            await session.commit()
+
+
+async def rows_by_email(outbox):
+    async with outbox.sessions() as session:
+        rows = (await session.execute(select(EmailOutbox))).scalars().all()
+        return {row.email: row for row in rows}
+
+
+async def make_due(outbox):
+    async with outbox.sessions() as session:
+        for row in (await session.execute(select(EmailOutbox))).scalars().all():
+            row.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        await session.commit()
+
+
+def test_backoff_doubles_and_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BASE_BACKOFF_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 200.0)
+    assert [outbox_backoff_delay(n) for n in (0, 1, 2, 3, 4)] == [30.0, 30.0, 60.0, 120.0, 200.0]
+
+
+def test_failure_turns_dead_at_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 3)
+    row = SimpleNamespace(attempts=2)
+    assert EmailOutboxWorker._failure(row, "busy") == ("failed", "busy")
+    row.attempts = 3
+    assert EmailOutboxWorker._failure(row, "busy") == ("dead", "busy")
+    assert EmailOutboxWorker._failure(SimpleNamespace(attempts=1), "x" * 2000, permanent=True) == ("dead", "x" * 1000)
+
+
+def test_failed_refs_map_back_to_their_rows(outbox):
+    outbox.service.failures = {
+        "busy@rvce.edu.in": smtplib.SMTPRecipientsRefused({"busy@rvce.edu.in": (451, b"Try later")}),
+        "gone@rvce.edu.in": smtplib.SMTPRecipientsRefused({"gone@rvce.edu.in": (550, b"No such user")}),
+    }
+    run(outbox, add_campaign(outbox, ["ok@rvce.edu.in", "busy@rvce.edu.in", "gone@rvce.edu.in"]))
+
+    assert run(outbox, outbox.worker.drain_once()) == 3
+    rows = run(outbox, rows_by_email(outbox))
+    assert rows["ok@rvce.edu.in"].status == "sent" and rows["ok@rvce.edu.in"].sent_at
+    assert rows["busy@rvce.edu.in"].status == "failed"
+    assert rows["busy@rvce.edu.in"].next_attempt_at > datetime.utcnow()
+    assert rows["gone@rvce.edu.in"].status == "dead"
+    assert "No such user" in rows["gone@rvce.edu.in"].last_error
+
+    # Nothing else is due until the backoff passes
+    assert run(outbox, outbox.worker.drain_once()) == 0
+
+    async def log_counts():
+        async with outbox.sessions() as session:
+            log = await session.get(EmailAuditLog, 1)
+            return log.success_count, log.failure_count
+
+    assert run(outbox, log_counts()) == (1, 2)
+
+
+def test_transient_failures_retry_until_dead(outbox):
+    outbox.service.failures = {"busy@rvce.edu.in": smtplib.SMTPDataError(421, b"Busy")}
+    run(outbox, add_campaign(outbox, ["busy@rvce.edu.in"]))
+
+    statuses = []
+    for _ in range(settings.EMAIL_OUTBOX_MAX_ATTEMPTS):
+        run(outbox, make_due(outbox))
+        run(outbox, outbox.worker.drain_once())
+        row = run(outbox, rows_by_email(outbox))["busy@rvce.edu.in"]
+        statuses.append((row.status, row.attempts))
+    assert statuses == [("failed", 1), ("failed", 2), ("dead", 3)]
+
+
+def test_unrenderable_template_is_dead_without_sending(outbox):
+    run(outbox, add_campaign(outbox, ["a@rvce.edu.in"], body="Meet at {{venue}}"))
+    run(outbox, outbox.worker.drain_once())
+    row = run(outbox, rows_by_email(outbox))["a@rvce.edu.in"]
+    assert row.status == "dead" and "venue" in row.last_error
+    assert outbox.service.delivered == []
+
+
+def test_stuck_sending_rows_are_reclaimed_after_timeout(outbox, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_SENDING_TIMEOUT_SECONDS", 600)
+    now = datetime.utcnow()
+    run(outbox, add_campaign(outbox, ["stuck@rvce.edu.in"], status="sending", attempts=1, updated_at=now - timedelta(seconds=60)))
+    assert run(outbox, outbox.worker.drain_once()) == 0
+
+    async def age_row():
+        async with outbox.sessions() as session:
+            row = (await session.execute(select(EmailOutbox))).scalar_one()
+            row.updated_at = datetime.utcnow() - timedelta(seconds=601)
+            await session.commit()
+
+    run(outbox, age_row())
+    assert run(outbox, outbox.worker.drain_once()) == 1
+    row = run(outbox, rows_by_email(outbox))["stuck@rvce.edu.in"]
+    assert (row.status, row.attempts) == ("sent", 2)
+
+
+def test_redrive_filters_by_status_and_ids(outbox):
+    async def scenario():
+        await add_campaign(outbox, ["f1@rvce.edu.in", "f2@rvce.edu.in", "d@rvce.edu.in", "s@rvce.edu.in"])
+        await add_campaign(outbox, ["other@rvce.edu.in"], log_id=2)
+        async with outbox.sessions() as session:
+            rows = {row.email: row for row in (await session.execute(select(EmailOutbox))).scalars().all()}
+            for email, status in [("f1", "failed"), ("f2", "failed"), ("d", "dead"), ("s", "sent"), ("other", "failed")]:
+                rows[f"{email}@rvce.edu.in"].status = status
+                rows[f"{email}@rvce.edu.in"].attempts = 3
+            await session.commit()
+
+            only_failed = await redrive(session, 1, statuses=("failed",))
+            await session.commit()
+            picked = await redrive(session, 1, ids=[rows["d@rvce.edu.in"].id, rows["s@rvce.edu.in"].id])
+            await session.commit()
+        return only_failed, picked
+
+    assert run(outbox, scenario()) == (2, 1)
+    rows = run(outbox, rows_by_email(outbox))
+    assert {email: (row.status, row.attempts) for email, row in rows.items()} == {
+        "f1@rvce.edu.in": ("queued", 0),
+        "f2@rvce.edu.in": ("queued", 0),
+        "d@rvce.edu.in": ("queued", 0),
+        "s@rvce.edu.in": ("sent", 3),
+        "other@rvce.edu.in": ("failed", 3),
+    }
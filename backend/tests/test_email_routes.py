@@ -0,0 +1,52 @@
+"""Smoke tests: every campaign route resolves its helpers and returns 404 for an unknown log."""
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.api import email as email_api
+from app.core.security import get_current_admin_user
+from app.db.postgres import get_postgres_session
+from app.main import app
+
+
+class EmptySession:
+    async def get(self, model, key):
+        return None
+
+    async def execute(self, query):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def session_override():
+        yield EmptySession()
+
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(id=1, email="admin@rvce.edu.in")
+    app.dependency_overrides[get_postgres_session] = session_override
+    monkeypatch.setattr(email_api, "AsyncSessionLocal", EmptySession)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("get", "/api/email/logs/999/status", None),
+    ("get", "/api/email/logs/999/progress", None),
+    ("get", "/api/email/logs/999/outbox", None),
+    ("post", "/api/email/logs/999/redrive", {}),
+])
+def test_unknown_campaign_is_404(client, method, path, body):
+    response = client.request(method, path, json=body)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Email log not found"
+
+
+def test_email_logs_listing(client):
+    response = client.get("/api/email/logs")
+    assert response.status_code == 200
+    assert response.json() == []
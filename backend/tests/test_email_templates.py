@@ -0,0 +1,33 @@
+import base64
+import pytest
+from app.services.email_templates import MessageSkeleton, UnknownPlaceholderError, compile_template
+
+
+def test_render_fills_placeholders_and_defaults():
+    template = compile_template("Dear {{ student_name }} ({{usn}}),\nSem {{semester}}, {{branch}}")
+    assert template.placeholders == ["student_name", "usn", "semester", "branch"]
+    assert template.render({"name": "Asha", "usn": "1RV21CS001", "semester": 5}) == (
+        "Dear Asha (1RV21CS001),<br>Sem 5, N/A"
+    )
+    assert template.render({}).startswith("Dear Student (N/A)")
+
+
+def test_template_without_placeholders_renders_verbatim():
+    assert compile_template("Line 1\nLine 2", newline_to_br=False).render({}) == "Line 1\nLine 2"
+
+
+def test_unknown_placeholders_are_rejected_up_front():
+    with pytest.raises(UnknownPlaceholderError) as exc:
+        compile_template("Hi {{student_name}}, meet at {{venue}} on {{date}}")
+    assert exc.value.names == ["date", "venue"]
+
+
+def test_skeleton_builds_one_message_per_recipient():
+    skeleton = MessageSkeleton("Sports Office <sports@rvce.edu.in>", "Trials\r\nBcc: x@example.com")
+    message = skeleton.build("asha@rvce.edu.in", "<p>Hi</p>").decode()
+    head, _, rest = message.partition("\r\n\r\n")
+    assert "To: asha@rvce.edu.in" in head
+    # CR/LF in the subject cannot start a new header
+    assert "\r\nBcc:" not in head
+    encoded = rest.split("\r\n\r\n", 1)[1].rsplit("\r\n--", 1)[0]
+    assert base64.b64decode(encoded) == b"<p>Hi</p>"
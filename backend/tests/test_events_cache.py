@@ -0,0 +1,48 @@
+import asyncio
+from app.services.events_cache import EventsCatalogueCache
+
+
+def test_stale_build_does_not_drop_newer_inflight_build():
+    async def scenario():
+        cache = EventsCatalogueCache(maxsize=8, ttl=60)
+        builds = []
+        gates = [asyncio.Event(), asyncio.Event()]
+
+        async def build():
+            n = len(builds)
+            builds.append(n)
+            await gates[n].wait()
+            return f"body-{n}".encode()
+
+        first = asyncio.create_task(cache.get_or_build("all", build))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        second = asyncio.create_task(cache.get_or_build("all", build))
+        await asyncio.sleep(0)
+
+        # The pre-invalidation build finishes while the newer one is running
+        gates[0].set()
+        assert (await first).body == b"body-0"
+
+        third = asyncio.create_task(cache.get_or_build("all", build))
+        await asyncio.sleep(0)
+        gates[1].set()
+        assert (await second).body == (await third).body == b"body-1"
+        assert builds == [0, 1]
+        assert cache.get("all").body == b"body-1"
+
+    asyncio.run(scenario())
+
+
+def test_etag_matching():
+    cache = EventsCatalogueCache(maxsize=8, ttl=60)
+
+    async def build():
+        return b"[]"
+
+    entry = asyncio.run(cache.get_or_build("all", build))
+    assert entry.matches(entry.etag)
+    assert entry.matches(f'"other", {entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('"other"')
+    assert not entry.matches(None)
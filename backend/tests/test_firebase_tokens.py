@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from app.core import firebase_tokens
+from app.core.firebase_tokens import (
+    ClaimsCache, JWKSFileKeySource, SigningKeyCache, TokenVerificationError, verify_with_signing_keys
+)
+
+PROJECT_ID = "sports-dbms-test"
+KID = "test-key-1"
+
+
+@pytest.fixture(scope="module")
+def private_pem():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+@pytest.fixture
+def key_source(tmp_path, private_pem, monkeypatch):
+    public = jwk.construct(private_pem, "RS256").public_key().to_dict()
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [{**public, "kid": KID, "use": "sig"}]}))
+    source = JWKSFileKeySource(str(path))
+    monkeypatch.setattr(firebase_tokens, "signing_keys", SigningKeyCache(source))
+    monkeypatch.setattr(firebase_tokens.settings, "FIREBASE_PROJECT_ID", PROJECT_ID)
+    return source
+
+
+def claims(**overrides):
+    now = int(time.time())
+    values = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid-1",
+        "user_id": "firebase-uid-1",
+        "email": "asha@rvce.edu.in",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    values.update(overrides)
+    return values
+
+
+def sign(private_pem, kid=KID, **overrides):
+    return jwt.encode(claims(**overrides), private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def verify(token):
+    return asyncio.run(verify_with_signing_keys(token))
+
+
+def test_valid_token_is_accepted(key_source, private_pem):
+    decoded = verify(sign(private_pem))
+    assert decoded["sub"] == "firebase-uid-1"
+    assert decoded["email"] == "asha@rvce.edu.in"
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "another-project"},
+    {"iss": "https://securetoken.google.com/another-project"},
+    {"iss": "https://accounts.google.com"},
+    # Beyond the 60 s leeway
+    {"iat": int(time.time()) - 7200, "exp": int(time.time()) - 120},
+    {"sub": ""},
+])
+def test_invalid_claims_are_rejected(key_source, private_pem, overrides):
+    with pytest.raises(TokenVerificationError):
+        verify(sign(private_pem, **overrides))
+
+
+def test_unknown_kid_is_rejected(key_source, private_pem):
+    with pytest.raises(TokenVerificationError, match="unknown key"):
+        verify(sign(private_pem, kid="rotated-away"))
+
+
+def test_non_rs256_token_is_rejected(key_source):
+    token = jwt.encode(claims(), "shared-secret", algorithm="HS256", headers={"kid": KID})
+    with pytest.raises(TokenVerificationError, match="RS256"):
+        verify(token)
+
+
+def test_token_without_kid_is_rejected(key_source, private_pem):
+    token = jwt.encode(claims(), private_pem, algorithm="RS256")
+    with pytest.raises(TokenVerificationError):
+        verify(token)
+
+
+def test_token_signed_by_another_key_is_rejected(key_source):
+    other = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    with pytest.raises(TokenVerificationError):
+        verify(sign(other))
+
+
+def test_signing_keys_are_fetched_once(key_source, private_pem):
+    calls = []
+    fetch = key_source.fetch
+
+    async def counting_fetch():
+        calls.append(1)
+        return await fetch()
+
+    key_source.fetch = counting_fetch
+
+    async def scenario():
+        for _ in range(3):
+            await verify_with_signing_keys(sign(private_pem))
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_claims_cache_drops_entry_at_exp(monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(firebase_tokens.time, "time", lambda: clock.now)
+    cache = ClaimsCache(maxsize=8)
+    cache.put("token", {"sub": "u1", "exp": clock.now + 30})
+
+    clock.now += 29
+    assert cache.get("token") == {"sub": "u1", "exp": 1_000_030.0}
+    clock.now += 1
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_claims_cache_skips_expired_and_evicts_lru(monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(firebase_tokens.time, "time", lambda: clock.now)
+    cache = ClaimsCache(maxsize=2)
+    cache.put("expired", {"sub": "u0", "exp": clock.now})
+    assert cache.get("expired") is None
+
+    for name in ("a", "b"):
+        cache.put(name, {"sub": name, "exp": clock.now + 60})
+    cache.get("a")
+    cache.put("c", {"sub": "c", "exp": clock.now + 60})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
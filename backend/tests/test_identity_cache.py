@@ -0,0 +1,48 @@
+import asyncio
+from bson import ObjectId
+from app.services import identity_cache as identity_module
+from app.services.identity_cache import IdentityCache, resolve_student_identity
+
+
+class FakeSubmissions:
+    def __init__(self, *docs):
+        self.docs = list(docs)
+
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            for clause in query["$or"]:
+                (field, value), = clause.items()
+                if value is not None and doc.get(field) == value:
+                    return dict(doc)
+        return None
+
+
+def test_approve_then_participate_sees_new_status(monkeypatch):
+    # Imported registration: no firebase_uid, email stored as given
+    doc = {
+        "_id": ObjectId(), "usn": "1AB21CS001", "student_name": "Asha",
+        "status": "pending", "email": "asha@college.edu", "firebase_uid": None
+    }
+    monkeypatch.setattr(identity_module, "get_submissions_collection", lambda: FakeSubmissions(doc))
+    monkeypatch.setattr(identity_module, "identity_cache", IdentityCache(maxsize=16, ttl=600))
+    student = {"uid": "firebase-uid-1", "email": "asha@college.edu"}
+
+    assert asyncio.run(resolve_student_identity(student))["status"] == "pending"
+
+    # PATCH /submissions/{id} approves and invalidates with the pre-update doc
+    before = dict(doc)
+    doc["status"] = "approved"
+    identity_module.identity_cache.invalidate_submission(before)
+
+    assert asyncio.run(resolve_student_identity(student))["status"] == "approved"
+
+
+def test_invalidate_by_cached_identity_drops_requester_keys():
+    cache = IdentityCache(maxsize=16, ttl=600)
+    identity = {"id": "sub-1", "usn": "1AB21CS002", "email": "b@college.edu", "firebase_uid": None}
+    cache.put(identity, uid="uid-b", email="b@college.edu")
+
+    cache.invalidate_submission(identity)
+
+    assert cache.get("uid-b", None) is None
+    assert cache.get(None, "b@college.edu") is None
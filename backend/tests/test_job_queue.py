@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobHandler, JobQueue
+
+
+class FakeJobs:
+    def __init__(self, doc):
+        self.doc = doc
+
+    async def find_one(self, query, projection=None):
+        return dict(self.doc)
+
+    async def update_one(self, query, update):
+        if any(self.doc.get(key) != value for key, value in query.items()):
+            return SimpleNamespace(matched_count=0)
+        self.doc.update(update.get("$set", {}))
+        for key, value in update.get("$inc", {}).items():
+            self.doc[key] = self.doc.get(key, 0) + value
+        return SimpleNamespace(matched_count=1)
+
+
+class FlakyHandler(JobHandler):
+    chunk_size = 2
+
+    def __init__(self):
+        self.delivered = []
+        self.fail_next = True
+
+    async def prepare(self, job):
+        return [{"email": f"s{i}@college.edu"} for i in range(5)]
+
+    async def process(self, job, items):
+        if self.fail_next and len(self.delivered) == 2:
+            self.fail_next = False
+            raise ValueError("Unknown placeholder {{venue}}")
+        self.delivered.extend(item["email"] for item in items)
+        return len(items), 0
+
+
+def claim(jobs):
+    jobs.doc.update(status="running", lease_id=f"lease-{jobs.doc['attempts']}")
+    jobs.doc["attempts"] += 1
+    return {key: value for key, value in jobs.doc.items() if key != "items"}
+
+
+def test_handler_error_retries_chunk_instead_of_skipping(monkeypatch):
+    jobs = FakeJobs({
+        "_id": "job-1", "type": "announce", "status": "queued", "attempts": 0, "prepared": False,
+        "cursor": 0, "sent": 0, "failed": 0, "skipped": 0, "inflight": None, "lease_id": None
+    })
+    monkeypatch.setattr(job_queue_module, "get_jobs_collection", lambda: jobs)
+    queue = JobQueue()
+    handler = FlakyHandler()
+    queue.register("announce", handler)
+
+    asyncio.run(queue.run_job(claim(jobs)))
+    assert jobs.doc["status"] == "queued"
+    assert jobs.doc["inflight"] is None and jobs.doc["cursor"] == 2
+
+    asyncio.run(queue.run_job(claim(jobs)))
+    assert jobs.doc["status"] == "completed"
+    assert jobs.doc["skipped"] == 0 and jobs.doc["sent"] == 5
+    assert sorted(handler.delivered) == [f"s{i}@college.edu" for i in range(5)]
+
+
+def test_expired_lease_skips_inflight_chunk(monkeypatch):
+    jobs = FakeJobs({
+        "_id": "job-2", "type": "announce", "status": "running", "attempts": 1, "prepared": True,
+        "items": [{"email": f"s{i}@college.edu"} for i in range(5)], "total": 5,
+        "cursor": 2, "sent": 2, "failed": 0, "skipped": 0, "inflight": {"start": 2, "end": 4}, "lease_id": "dead"
+    })
+    monkeypatch.setattr(job_queue_module, "get_jobs_collection", lambda: jobs)
+    queue = JobQueue()
+    handler = FlakyHandler()
+    handler.fail_next = False
+    queue.register("announce", handler)
+
+    asyncio.run(queue.run_job(claim(jobs)))
+    assert jobs.doc["status"] == "completed"
+    assert jobs.doc["skipped"] == 2
+    assert handler.delivered == ["s4@college.edu"]
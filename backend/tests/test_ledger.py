@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+from types import SimpleNamespace
+import pytest
+from app.core.blockchain import BlockchainLogger, GENESIS_HASH
+from app.core.merkle import block_header_hash, merkle_root
+from app.services import ledger as ledger_module
+from app.services.ledger import shutdown_verify_pool, verify_block_entries, verify_ledger
+
+
+def chain(count):
+    entries, previous = [], GENESIS_HASH
+    for seq in range(1, count + 1):
+        entry = {
+            "_id": seq, "timestamp": "2026-01-01T00:00:00", "usn": f"1RV21CS{seq:03d}", "event_id": 1,
+            "event_name": "Athletics", "action": "selected", "admin_email": "admin@rvce.edu.in",
+            "previous_hash": previous
+        }
+        entry["hash"] = previous = BlockchainLogger._calculate_hash(BlockchainLogger._entry_data(entry))
+        entries.append(entry)
+    return entries
+
+
+def sealed_block(entries):
+    root = merkle_root([entry["hash"] for entry in entries])
+    return {
+        "_id": 1, "first_seq": 1, "last_seq": len(entries), "merkle_root": root,
+        "previous_block_hash": GENESIS_HASH,
+        "block_hash": block_header_hash(1, 1, len(entries), root, GENESIS_HASH)
+    }
+
+
+def test_intact_block_verifies():
+    entries = chain(5)
+    assert verify_block_entries(sealed_block(entries), entries, GENESIS_HASH) is None
+    assert all(BlockchainLogger.verify_entry(e, p) for e, p in zip(entries, [GENESIS_HASH] + [e["hash"] for e in entries]))
+
+
+def test_modified_entry_is_detected():
+    entries = chain(5)
+    block = sealed_block(entries)
+    entries[2]["action"] = "dropped"
+    assert "entry 3" in verify_block_entries(block, entries, GENESIS_HASH)
+
+
+def test_missing_entry_is_detected():
+    entries = chain(5)
+    block = sealed_block(entries)
+    assert "missing" in verify_block_entries(block, entries[:2] + entries[3:], GENESIS_HASH)
+
+
+def test_forged_entry_hash_is_detected():
+    entries = chain(5)
+    block = sealed_block(entries)
+    forged = chain(5)
+    forged[4]["admin_email"] = "intruder@example.com"
+    forged[4]["hash"] = hashlib.sha256(b"x").hexdigest()
+    assert verify_block_entries(block, forged, GENESIS_HASH) is not None
+
+
+class FakeCursor:
+    def __init__(self, docs, fail_after=None):
+        self.docs = docs
+        self.fail_after = fail_after
+
+    def sort(self, *args):
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for i, doc in enumerate(self.docs):
+                if i == self.fail_after:
+                    raise RuntimeError("cursor lost")
+                yield doc
+        return iterate()
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+
+class FakeLedger:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def find(self, query, projection=None):
+        bounds = query["_id"]
+        return FakeCursor([
+            e for e in self.entries
+            if bounds.get("$gte", 0) <= e["_id"] <= bounds.get("$lte", float("inf"))
+        ])
+
+
+def ledger_with_blocks(monkeypatch, block_count, block_size=4, fail_after=None):
+    entries = chain(block_count * block_size + 2)
+    blocks, previous_block_hash = [], GENESIS_HASH
+    for number in range(1, block_count + 1):
+        members = entries[(number - 1) * block_size:number * block_size]
+        root = merkle_root([e["hash"] for e in members])
+        first, last = members[0]["_id"], members[-1]["_id"]
+        block = {
+            "_id": number, "first_seq": first, "last_seq": last, "merkle_root": root,
+            "previous_block_hash": previous_block_hash,
+            "block_hash": block_header_hash(number, first, last, root, previous_block_hash)
+        }
+        previous_block_hash = block["block_hash"]
+        blocks.append(block)
+    monkeypatch.setattr(ledger_module, "get_ledger_collection", lambda: FakeLedger(entries))
+    monkeypatch.setattr(ledger_module, "get_ledger_blocks_collection", lambda: SimpleNamespace(
+        find=lambda *args: FakeCursor(blocks, fail_after)
+    ))
+    return entries
+
+
+def test_verify_ledger_reuses_one_pool_and_survives_cursor_errors(monkeypatch):
+    async def scenario():
+        try:
+            ledger_with_blocks(monkeypatch, 3)
+            first = await verify_ledger(2)
+            pool = ledger_module.get_verify_pool()
+
+            ledger_with_blocks(monkeypatch, 6, fail_after=4)
+            with pytest.raises(RuntimeError, match="cursor lost"):
+                await verify_ledger(2)
+
+            entries = ledger_with_blocks(monkeypatch, 3)
+            entries[5]["usn"] = "TAMPERED"
+            second = await verify_ledger(2)
+            assert ledger_module.get_verify_pool() is pool
+            return first, second
+        finally:
+            await shutdown_verify_pool()
+
+    first, second = asyncio.run(scenario())
+    assert first["valid"] and first["blocks_checked"] == 3
+    assert first["entries_checked"] == 14 and first["unsealed_entries"] == 2
+    assert not second["valid"] and second["errors"] == ["Block 2: entry 6 was modified or re-linked"]
+    assert ledger_module._verify_pool is None
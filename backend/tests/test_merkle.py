@@ -0,0 +1,53 @@
+import hashlib
+import pytest
+from app.core.merkle import block_header_hash, leaf_hash, merkle_proof, merkle_root, node_hash, verify_proof
+
+
+def entry_hashes(count):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+
+def test_single_leaf_root_is_its_leaf_hash():
+    hashes = entry_hashes(1)
+    assert merkle_root(hashes) == leaf_hash(hashes[0])
+    assert merkle_proof(hashes, 0) == []
+
+
+def test_odd_node_is_carried_up():
+    a, b, c = entry_hashes(3)
+    assert merkle_root([a, b, c]) == node_hash(node_hash(leaf_hash(a), leaf_hash(b)), leaf_hash(c))
+
+
+@pytest.mark.parametrize("count", [2, 3, 5, 8, 13, 256])
+def test_every_leaf_proves_against_root(count):
+    hashes = entry_hashes(count)
+    root = merkle_root(hashes)
+    for index, entry_hash in enumerate(hashes):
+        assert verify_proof(entry_hash, merkle_proof(hashes, index), root)
+
+
+def test_proof_fails_for_tampered_entry_or_wrong_position():
+    hashes = entry_hashes(8)
+    root = merkle_root(hashes)
+    proof = merkle_proof(hashes, 3)
+    assert not verify_proof(hashes[4], proof, root)
+    assert not verify_proof("f" * 64, proof, root)
+
+
+def test_leaf_and_node_hashes_are_domain_separated():
+    a, b = entry_hashes(2)
+    # A two-leaf root must not be usable as a leaf of its own
+    assert leaf_hash(a) != node_hash(a, b)
+    assert merkle_root([a, b]) != merkle_root([node_hash(leaf_hash(a), leaf_hash(b))])
+
+
+def test_empty_tree_is_rejected():
+    with pytest.raises(ValueError):
+        merkle_root([])
+
+
+def test_block_header_hash_covers_every_field():
+    base = (1, 1, 256, "a" * 64, "0" * 64)
+    header = block_header_hash(*base)
+    for i, changed in enumerate((2, 2, 255, "b" * 64, "1" * 64)):
+        assert block_header_hash(*base[:i], changed, *base[i + 1:]) != header
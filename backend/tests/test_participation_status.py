@@ -0,0 +1,157 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from fastapi import BackgroundTasks, HTTPException
+from app.api import participation as participation_module
+from app.api.participation import bulk_update_participation_status, update_participation_status
+from app.schemas.schemas import ParticipationBulkUpdate, ParticipationUpdate
+
+ADMIN = SimpleNamespace(id=1, email="admin@rvce.edu.in")
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class FakeParticipation:
+    """Applies UpdateOne filters on _id and status like MongoDB does."""
+
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        # Called before each write so a test can change a row "concurrently"
+        self.before_write = lambda: None
+
+    def matches(self, doc, query):
+        for key, wanted in query.items():
+            if isinstance(wanted, dict):
+                if doc.get(key) not in wanted["$in"]:
+                    return False
+            elif doc.get(key) != wanted:
+                return False
+        return True
+
+    async def find_one(self, query, projection=None):
+        return next((dict(doc) for doc in self.docs.values() if self.matches(doc, query)), None)
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(doc) for doc in self.docs.values() if self.matches(doc, query)])
+
+    async def update_one(self, query, update):
+        self.before_write()
+        doc = next((doc for doc in self.docs.values() if self.matches(doc, query)), None)
+        if doc:
+            doc.update(update["$set"])
+        return SimpleNamespace(matched_count=1 if doc else 0)
+
+    async def bulk_write(self, operations, ordered=False):
+        self.before_write()
+        matched = 0
+        for operation in operations:
+            result = await self.update_one(operation._filter, operation._doc)
+            matched += result.matched_count
+        return SimpleNamespace(matched_count=matched)
+
+
+class FakeLedger:
+    def __init__(self):
+        self.entries = []
+
+    async def log_action(self, **entry):
+        self.entries.append(entry)
+        return f"hash-{len(self.entries)}"
+
+    async def log_batch(self, entries):
+        return [await self.log_action(**entry) for entry in entries]
+
+
+class FakeSession:
+    async def execute(self, query):
+        return SimpleNamespace(scalar_one_or_none=lambda: SimpleNamespace(id=7, name="Athletics"))
+
+
+def request(status="pending"):
+    return {
+        "_id": ObjectId(), "usn": f"1RV23CS{ObjectId()}"[-10:], "student_name": "Asha", "event_id": 7,
+        "event_name": "Athletics", "status": status, "submitted_at": datetime(2026, 3, 1)
+    }
+
+
+@pytest.fixture
+def env(monkeypatch):
+    ledger = FakeLedger()
+    synced = []
+
+    async def sync(db, event_id, decision, participations, admin_id, now=None):
+        synced.extend((decision, p["usn"], hash_value) for p, hash_value in participations)
+
+    monkeypatch.setattr(participation_module, "blockchain", ledger)
+    monkeypatch.setattr(participation_module, "sync_approved_participants", sync)
+    monkeypatch.setattr(participation_module, "get_database", lambda: {"student_submissions": FakeParticipation([])})
+    env = SimpleNamespace(ledger=ledger, synced=synced)
+
+    def use(docs):
+        env.collection = FakeParticipation(docs)
+        monkeypatch.setattr(participation_module, "get_participation_collection", lambda: env.collection)
+        return env.collection
+
+    env.use = use
+    return env
+
+
+def patch_status(participation_id, status):
+    return asyncio.run(update_participation_status(
+        participation_id, ParticipationUpdate(status=status), BackgroundTasks(), current_user=ADMIN, db=FakeSession()
+    ))
+
+
+def bulk(status, ids=None):
+    return asyncio.run(bulk_update_participation_status(
+        7, ParticipationBulkUpdate(status=status, ids=ids, notify=False), BackgroundTasks(),
+        current_user=ADMIN, db=FakeSession()
+    ))
+
+
+def test_reselecting_is_a_no_op(env):
+    doc = request()
+    env.use([doc])
+    first = patch_status(str(doc["_id"]), "selected")
+    second = patch_status(str(doc["_id"]), "selected")
+
+    assert first.status == second.status == "selected"
+    assert second.blockchain_hash == first.blockchain_hash
+    assert len(env.ledger.entries) == 1
+    assert env.synced == [("selected", doc["usn"], first.blockchain_hash)]
+
+
+def test_single_update_conflicts_when_status_changed_concurrently(env):
+    doc = request()
+    collection = env.use([doc])
+    collection.before_write = lambda: collection.docs[doc["_id"]].update(status="dropped")
+
+    with pytest.raises(HTTPException) as exc:
+        patch_status(str(doc["_id"]), "selected")
+    assert exc.value.status_code == 409
+    assert env.synced == []
+
+
+def test_bulk_skips_rows_whose_status_changed_concurrently(env):
+    raced, fresh = request(), request()
+    collection = env.use([raced, fresh])
+
+    # Another bulk request selects `raced` between our read and our write
+    collection.before_write = lambda: collection.docs[raced["_id"]].update(status="selected", blockchain_hash="other")
+    response = bulk("selected", ids=[str(raced["_id"]), str(fresh["_id"])])
+
+    results = {r.id: r for r in response.results}
+    assert results[str(fresh["_id"])].success
+    assert not results[str(raced["_id"])].success
+    assert "concurrently" in results[str(raced["_id"])].error
+    # Only the row we actually changed reaches approved_participants
+    assert [usn for _, usn, _ in env.synced] == [fresh["usn"]]
+    assert collection.docs[raced["_id"]]["blockchain_hash"] == "other"
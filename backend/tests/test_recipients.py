@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+from app.schemas.email_schemas import RecipientFilter
+from app.services import recipients as recipients_module
+from app.services.recipients import RECIPIENT_PROJECTION, RecipientResolver, submission_query
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def batch_size(self, n):
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+
+class FakeCollection:
+    """Evaluates the equality and $in filters the resolver builds and records each find()."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = []
+
+    @staticmethod
+    def matches(doc, query):
+        for key, wanted in query.items():
+            if isinstance(wanted, dict):
+                if doc.get(key) not in wanted["$in"]:
+                    return False
+            elif doc.get(key) != wanted:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        self.finds.append((query, projection))
+        fields = [key for key, include in (projection or {}).items() if include]
+        return FakeCursor([
+            {key: doc[key] for key in fields if key in doc} if fields else doc
+            for doc in self.docs if self.matches(doc, query)
+        ])
+
+
+def student(usn, email=None, status="approved", branch="CSE", semester=4):
+    return {
+        "usn": usn, "email": email if email is not None else f"{usn.lower()}@rvce.edu.in",
+        "student_name": f"Student {usn}", "branch": branch, "semester": semester,
+        "status": status, "photo_base64": "x" * 100
+    }
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    collections = {"submissions": FakeCollection([]), "participation": FakeCollection([])}
+    monkeypatch.setattr(recipients_module, "get_submissions_collection", lambda: collections["submissions"])
+    monkeypatch.setattr(recipients_module, "get_participation_collection", lambda: collections["participation"])
+    return collections
+
+
+def collect(resolver):
+    async def gather():
+        return [batch async for batch in resolver.batches()]
+    return asyncio.run(gather())
+
+
+def test_submission_query_from_filters():
+    filters = RecipientFilter(semester=[3, 4], branch=["CSE"], usn=["1RV23CS001"])
+    assert submission_query(filters) == {
+        "status": "approved", "semester": {"$in": [3, 4]}, "branch": {"$in": ["CSE"]}, "usn": {"$in": ["1RV23CS001"]}
+    }
+    assert submission_query(None) == {"status": "approved"}
+
+
+def test_event_targets_selected_participants_only(mongo):
+    mongo["participation"].docs = [
+        {"event_id": 7, "usn": "1RV23CS001", "status": "selected"},
+        {"event_id": 7, "usn": "1RV23CS002", "status": "pending"},
+        {"event_id": 8, "usn": "1RV23CS003", "status": "selected"},
+        {"event_id": 7, "usn": "1RV23CS004", "status": "selected"},
+    ]
+    mongo["submissions"].docs = [
+        student("1RV23CS001"), student("1RV23CS002"), student("1RV23CS003"),
+        student("1RV23CS004", status="pending")
+    ]
+    batches = collect(RecipientResolver(RecipientFilter(event_id=7)))
+
+    assert [r["usn"] for batch in batches for r in batch] == ["1RV23CS001"]
+    participation_query, participation_projection = mongo["participation"].finds[0]
+    assert participation_query == {"event_id": 7, "status": "selected"}
+    assert participation_projection == {"_id": 0, "usn": 1}
+    # Submissions are looked up by the event's USNs, still limited to approved students
+    query, projection = mongo["submissions"].finds[0]
+    assert query == {"status": "approved", "usn": {"$in": ["1RV23CS001", "1RV23CS004"]}}
+    assert projection == RECIPIENT_PROJECTION
+
+
+def test_event_usns_are_intersected_with_usn_filter(mongo):
+    mongo["participation"].docs = [
+        {"event_id": 7, "usn": usn, "status": "selected"} for usn in ("1RV23CS001", "1RV23CS002", "1RV23CS003")
+    ]
+    mongo["submissions"].docs = [student(usn) for usn in ("1RV23CS001", "1RV23CS002", "1RV23CS003")]
+    resolver = RecipientResolver(RecipientFilter(event_id=7, usn=["1RV23CS002", "1RV23CS009"]), batch_size=1)
+    batches = collect(resolver)
+
+    assert [r["usn"] for batch in batches for r in batch] == ["1RV23CS002"]
+    # Chunks with no USN left after the intersection never reach student_submissions
+    assert [query["usn"] for query, _ in mongo["submissions"].finds] == [{"$in": ["1RV23CS002"]}]
+
+
+def test_emails_are_deduplicated_case_insensitively(mongo):
+    mongo["submissions"].docs = [
+        student("1RV23CS001", email="Asha@RVCE.edu.in"),
+        student("1RV23CS002", email=" asha@rvce.edu.in "),
+        student("1RV23CS003", email="not-an-email"),
+        student("1RV23CS004", email=""),
+        student("1RV23CS005", email="ravi@rvce.edu.in"),
+    ]
+    resolver = RecipientResolver(None)
+    batches = collect(resolver)
+
+    # The first spelling wins and is kept as written
+    assert [r["email"] for batch in batches for r in batch] == ["Asha@RVCE.edu.in", "ravi@rvce.edu.in"]
+    assert (resolver.matched, resolver.recipients) == (5, 2)
+
+
+def test_recipients_are_yielded_in_batches(mongo):
+    mongo["submissions"].docs = [student(f"1RV23CS{i:03d}") for i in range(7)]
+    mongo["submissions"].docs.append(student("1RV23CS099", email="1rv23cs000@rvce.edu.in"))
+    resolver = RecipientResolver(None, batch_size=3)
+    batches = collect(resolver)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert (resolver.matched, resolver.recipients) == (8, 7)
+    assert set(batches[0][0]) == {"email", "name", "usn", "branch", "semester"}
+
+
+def test_event_usns_are_chunked_by_batch_size(mongo):
+    usns = [f"1RV23CS{i:03d}" for i in range(5)]
+    mongo["participation"].docs = [{"event_id": 7, "usn": usn, "status": "selected"} for usn in usns]
+    mongo["submissions"].docs = [student(usn) for usn in usns]
+    resolver = RecipientResolver(RecipientFilter(event_id=7), batch_size=2)
+    batches = collect(resolver)
+
+    assert [len(query["usn"]["$in"]) for query, _ in mongo["submissions"].finds] == [2, 2, 1]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_count_matches_unique_recipients(mongo):
+    mongo["submissions"].docs = [
+        student("1RV23CS001"), student("1RV23CS002", email="1RV23CS001@rvce.edu.in"), student("1RV23CS003", status="rejected")
+    ]
+    resolver = RecipientResolver(None)
+    assert asyncio.run(resolver.count()) == 1
+    assert resolver.matched == 2
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.api import submissions as submissions_module
+from app.api.submissions import autocomplete_submissions, list_submissions
+from app.services.search_index import (
+    MAX_PREFIX_LEN, build_exact_filter, build_search_keys, needs_recheck
+)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+
+class FakeSubmissions:
+    """Answers the filters search_index builds, in insertion order like an unsorted index scan."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    @staticmethod
+    def matches(doc, query):
+        for key, wanted in query.items():
+            if key == "search_keys":
+                if not set(wanted["$all"]) <= set(doc["search_keys"]):
+                    return False
+            elif key == "_id":
+                if doc["_id"] in wanted["$nin"]:
+                    return False
+            elif key == "usn" and isinstance(wanted, dict):
+                if not doc["usn"].startswith(wanted["$regex"].lstrip("^")):
+                    return False
+            elif doc.get(key) != wanted:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([doc for doc in self.docs if self.matches(doc, query)])
+
+    async def count_documents(self, query, limit=None):
+        return len([doc for doc in self.docs if self.matches(doc, query)])
+
+
+def submission(name, usn, minutes=0):
+    return {
+        "_id": ObjectId(), "student_name": name, "usn": usn, "branch": "CSE", "semester": 4,
+        "status": "approved", "submitted_at": datetime(2026, 3, 1) - timedelta(minutes=minutes),
+        "search_keys": build_search_keys(name, usn)
+    }
+
+
+def test_search_keys_hold_prefixes_and_whole_tokens():
+    keys = build_search_keys("Ravi Kumar", "1RV23CS001")
+    assert {"r", "ra", "rav", "ravi", "=ravi", "=kumar", "1rv23cs001", "=1rv23cs001"} <= set(keys)
+    assert "=rav" not in keys
+
+
+def test_exact_filter_and_recheck():
+    assert build_exact_filter("Ravi K") == {"search_keys": {"$all": ["=ravi", "=k"]}}
+    assert build_exact_filter("1rv23cs001") == {"usn": "1RV23CS001"}
+    assert not needs_recheck("ravi")
+    assert needs_recheck("x" * (MAX_PREFIX_LEN + 1))
+    assert not needs_recheck("1" * (MAX_PREFIX_LEN + 1))
+
+
+def test_autocomplete_fetches_exact_token_hits_before_prefix_candidates(monkeypatch):
+    # More prefix-only names than the candidate window, all ahead of the exact hit
+    docs = [submission(f"Ravindra {i}", f"1RV23CS{i:03d}") for i in range(submissions_module.AUTOCOMPLETE_CANDIDATES + 10)]
+    docs.append(submission("Ravi Shankar", "1RV23EC001"))
+    collection = FakeSubmissions(docs)
+    monkeypatch.setattr(submissions_module, "get_submissions_collection", lambda: collection)
+
+    results = asyncio.run(autocomplete_submissions(q="ravi", status=None, limit=5, current_user=None))
+    assert results[0]["student_name"] == "Ravi Shankar"
+    assert len(results) == 5
+    # The prefix query skips what the exact query already returned
+    assert collection.queries[1]["_id"] == {"$nin": [docs[-1]["_id"]]}
+
+
+def test_list_drops_false_positives_for_truncated_terms(monkeypatch):
+    long_name = "Venkatasubramanian"
+    lookalike = "Venkatasubramanyam"
+    assert long_name[:MAX_PREFIX_LEN] == lookalike[:MAX_PREFIX_LEN]
+    docs = [submission(f"{lookalike} {i}", f"1RV23ME{i:03d}", minutes=i) for i in range(3)]
+    docs += [submission(f"{long_name} {i}", f"1RV23CV{i:03d}", minutes=10 + i) for i in range(3)]
+    collection = FakeSubmissions(docs)
+    monkeypatch.setattr(submissions_module, "get_submissions_collection", lambda: collection)
+
+    result = asyncio.run(list_submissions(
+        status=None, branch=None, semester=None, search=long_name, page=1, per_page=2,
+        cursor=None, count="exact", current_user=None
+    ))
+    assert [s["student_name"] for s in result["submissions"]] == [f"{long_name} 0", f"{long_name} 1"]
+    assert result["has_more"] is True
+    assert result["total"] == 6 and result["total_is_estimate"] is True
@@ -0,0 +1,242 @@
+import asyncio
+import base64
+import smtplib
+import pytest
+from app.services.smtp_async import AsyncSMTPTransport, prepare_data
+from app.services.smtp_delivery import OutboundMessage, is_permanent
+
+
+class FakeSMTPServer:
+    """Minimal scripted SMTP server that records every command it receives."""
+
+    def __init__(self, pipelining=True, auth="PLAIN", mail_reply=None, rcpt_replies=None, starttls=False):
+        self.pipelining = pipelining
+        self.auth = auth
+        self.mail_reply = mail_reply or "250 OK"
+        self.rcpt_replies = rcpt_replies or {}
+        self.starttls = starttls
+        self.commands = []
+        self.messages = []
+        self.reads_per_write = []
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def transport(self, **kwargs):
+        options = {"user": "mailer", "password": "secret", "starttls": False, "timeout": 5}
+        options.update(kwargs)
+        return AsyncSMTPTransport("127.0.0.1", self.port, **options)
+
+    async def handle(self, reader, writer):
+        def reply(line):
+            writer.write(line.encode() + b"\r\n")
+
+        reply("220 fake.smtp ready")
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode().rstrip("\r\n")
+            self.commands.append(command)
+            # Lines already buffered when a command is read show whether the client pipelined
+            self.reads_per_write.append(len(reader._buffer))
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                extensions = ["fake.smtp"] + (["PIPELINING"] if self.pipelining else [])
+                extensions += [f"AUTH {self.auth}"] + (["STARTTLS"] if self.starttls else [])
+                for extension in extensions[:-1]:
+                    reply(f"250-{extension}")
+                reply(f"250 {extensions[-1]}")
+            elif verb == "AUTH" and command.upper().startswith("AUTH PLAIN"):
+                token = base64.b64decode(command.split(" ", 2)[2]).decode()
+                reply("235 Accepted" if token == "\0mailer\0secret" else "535 Bad credentials")
+            elif verb == "AUTH":
+                reply("334 VXNlcm5hbWU6")
+                user = base64.b64decode((await reader.readline()).strip()).decode()
+                reply("334 UGFzc3dvcmQ6")
+                await writer.drain()
+                password = base64.b64decode((await reader.readline()).strip()).decode()
+                self.commands.append(f"LOGIN {user}:{password}")
+                reply("235 Accepted" if (user, password) == ("mailer", "secret") else "535 Bad credentials")
+            elif verb == "MAIL":
+                reply(self.mail_reply)
+            elif verb == "RCPT":
+                address = command[command.index("<") + 1:command.index(">")]
+                reply(self.rcpt_replies.get(address, "250 OK"))
+            elif verb == "DATA":
+                accepted = self.mail_reply.startswith("250") and any(
+                    self.rcpt_replies.get(c[c.index("<") + 1:c.index(">")], "250").startswith("25")
+                    for c in self.commands if c.startswith("RCPT")
+                )
+                if not accepted:
+                    reply("503 No valid recipients")
+                else:
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    lines = []
+                    while (data_line := await reader.readline()) != b".\r\n":
+                        lines.append(data_line)
+                    self.messages.append(b"".join(lines))
+                    reply("250 Queued")
+            elif verb == "RSET":
+                self.commands = [c for c in self.commands if not c.startswith(("MAIL", "RCPT"))]
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Not implemented")
+            await writer.drain()
+        writer.close()
+
+
+def message(*recipients, data=b"Subject: Hi\r\n\r\nHello\r\n"):
+    return OutboundMessage("sports@rvce.edu.in", list(recipients), data)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_pipelined_session_sends_envelope_in_one_write():
+    async def scenario():
+        async with FakeSMTPServer(pipelining=True) as server:
+            transport = server.transport()
+            await transport.connect()
+            await transport.send(message("a@rvce.edu.in", "b@rvce.edu.in"))
+            await transport.close()
+            return server
+
+    server = run(scenario())
+    envelope = [c for c in server.commands if c.split(" ")[0] in ("MAIL", "RCPT", "DATA")]
+    assert envelope == ["MAIL FROM:<sports@rvce.edu.in>", "RCPT TO:<a@rvce.edu.in>", "RCPT TO:<b@rvce.edu.in>", "DATA"]
+    mail_index = server.commands.index(envelope[0])
+    # MAIL arrived with both RCPTs and DATA already buffered behind it
+    assert server.reads_per_write[mail_index] > 0
+    assert server.messages == [b"Subject: Hi\r\n\r\nHello\r\n"]
+    assert server.commands[-1] == "QUIT"
+
+
+def test_lock_step_session_with_auth_login():
+    async def scenario():
+        async with FakeSMTPServer(pipelining=False, auth="LOGIN") as server:
+            transport = server.transport()
+            await transport.connect()
+            assert "PIPELINING" not in transport.capabilities
+            await transport.send(message("a@rvce.edu.in"))
+            await transport.close()
+            return server
+
+    server = run(scenario())
+    assert "LOGIN mailer:secret" in server.commands
+    mail_index = server.commands.index("MAIL FROM:<sports@rvce.edu.in>")
+    assert server.reads_per_write[mail_index] == 0
+    assert len(server.messages) == 1
+
+
+@pytest.mark.parametrize("pipelining", [True, False])
+def test_rejected_mail_raises_sender_refused_and_resets(pipelining):
+    async def scenario():
+        async with FakeSMTPServer(pipelining=pipelining, mail_reply="550 Sender blocked") as server:
+            transport = server.transport()
+            await transport.connect()
+            with pytest.raises(smtplib.SMTPSenderRefused) as exc:
+                await transport.send(message("a@rvce.edu.in"))
+            # The session is still usable after the RSET
+            server.mail_reply = "250 OK"
+            await transport.send(message("a@rvce.edu.in"))
+            await transport.close()
+            return server, exc.value
+
+    server, error = run(scenario())
+    assert error.smtp_code == 550 and is_permanent(error)
+    assert "RSET" in server.commands
+    assert len(server.messages) == 1
+    if not pipelining:
+        # Lock-step sessions stop the envelope at the rejected MAIL
+        first_rset = server.commands.index("RSET")
+        assert not any(c.startswith("RCPT") for c in server.commands[:first_rset])
+
+
+def test_partially_rejected_rcpt_still_delivers_to_the_rest():
+    async def scenario():
+        async with FakeSMTPServer(rcpt_replies={"gone@rvce.edu.in": "550 No such user"}) as server:
+            transport = server.transport()
+            await transport.connect()
+            await transport.send(message("gone@rvce.edu.in", "a@rvce.edu.in"))
+            await transport.close()
+            return server
+
+    assert len(run(scenario()).messages) == 1
+
+
+@pytest.mark.parametrize("reply, permanent", [("450 Mailbox busy", False), ("550 No such user", True)])
+def test_all_rcpts_rejected_maps_4xx_transient_and_5xx_permanent(reply, permanent):
+    async def scenario():
+        async with FakeSMTPServer(rcpt_replies={"a@rvce.edu.in": reply}) as server:
+            transport = server.transport()
+            await transport.connect()
+            with pytest.raises(smtplib.SMTPRecipientsRefused) as exc:
+                await transport.send(message("a@rvce.edu.in"))
+            await transport.close()
+            return server, exc.value
+
+    server, error = run(scenario())
+    assert error.recipients == {"a@rvce.edu.in": (int(reply[:3]), reply[4:])}
+    assert is_permanent(error) is permanent
+    assert server.messages == []
+
+
+@pytest.mark.parametrize("code, permanent", [(421, False), (451, False), (550, True), (554, True)])
+def test_is_permanent_by_reply_class(code, permanent):
+    assert is_permanent(smtplib.SMTPDataError(code, "x")) is permanent
+    assert is_permanent(smtplib.SMTPSenderRefused(code, "x", "s@rvce.edu.in")) is permanent
+
+
+def test_body_lines_starting_with_dot_are_stuffed():
+    body = b"Subject: Dots\n\n.hidden\nok\r\n..two\r.\rend"
+    assert prepare_data(body) == b"Subject: Dots\r\n\r\n..hidden\r\nok\r\n...two\r\n..\r\nend\r\n.\r\n"
+
+    async def scenario():
+        async with FakeSMTPServer() as server:
+            transport = server.transport()
+            await transport.connect()
+            await transport.send(message("a@rvce.edu.in", data=b".hidden\r\n.\r\nafter"))
+            await transport.close()
+            return server
+
+    # The server sees the stuffed lines; a lone "." never ends DATA early
+    assert run(scenario()).messages == [b"..hidden\r\n..\r\nafter\r\n"]
+
+
+def test_multiline_reply_is_joined():
+    async def scenario():
+        async with FakeSMTPServer() as server:
+            transport = server.transport()
+            await transport.connect()
+            code, text = await transport._command("EHLO again")
+            await transport.close()
+            return code, text
+
+    code, text = run(scenario())
+    assert code == 250
+    assert text.split("\n") == ["fake.smtp", "PIPELINING", "AUTH PLAIN"]
+
+
+def test_bad_credentials_and_missing_starttls():
+    async def scenario():
+        async with FakeSMTPServer() as server:
+            with pytest.raises(smtplib.SMTPAuthenticationError):
+                await server.transport(password="wrong").connect()
+            with pytest.raises(smtplib.SMTPNotSupportedError):
+                await server.transport(starttls=True).connect()
+
+    run(scenario())
@@ -0,0 +1,22 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.api.submissions import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_filters_rows_after_position():
+    doc = {"_id": ObjectId(), "submitted_at": datetime(2026, 3, 1, 10, 30, 15, 123000)}
+    token = encode_cursor(doc)
+    assert "=" not in token
+    assert decode_cursor(token) == {"$or": [
+        {"submitted_at": {"$lt": doc["submitted_at"]}},
+        {"submitted_at": doc["submitted_at"], "_id": {"$lt": doc["_id"]}}
+    ]}
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "e30", "eyJ0IjogIngiLCAiaWQiOiAieSJ9"])
+def test_invalid_cursor_is_400(token):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(token)
+    assert exc.value.status_code == 400
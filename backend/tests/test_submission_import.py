@@ -0,0 +1,25 @@
+import io
+import pytest
+from app.services.submission_import import iter_csv_rows, normalize_email, normalize_header
+
+
+def test_normalize_email_lowercases_and_strips():
+    assert normalize_email("  Asha.K@RVCE.edu.in ") == "asha.k@rvce.edu.in"
+    assert normalize_email(None) is None
+    assert normalize_email("") is None
+
+
+@pytest.mark.parametrize("value", ["asha", "asha@", "asha@@rvce.edu.in", "asha k@rvce.edu.in"])
+def test_normalize_email_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        normalize_email(value)
+
+
+def test_csv_rows_use_aliases_and_skip_blank_rows():
+    data = "Name,USN,Email ID,Photo_Base64\nAsha,1rv21cs001,Asha@RVCE.edu.in,xyz\n,,,\nRavi,1rv21cs002,,\n"
+    rows = list(iter_csv_rows(io.BytesIO(data.encode("utf-8-sig"))))
+    assert rows == [
+        (2, {"student_name": "Asha", "usn": "1rv21cs001", "email": "Asha@RVCE.edu.in"}),
+        (4, {"student_name": "Ravi", "usn": "1rv21cs002", "email": None}),
+    ]
+    assert normalize_header("Phone Number") == "phone"
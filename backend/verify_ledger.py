@@ -0,0 +1,43 @@
+"""
+Seal any complete ledger blocks, then verify the whole blockchain ledger in parallel.
+
+Usage: python verify_ledger.py [--workers N]
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Ensure backend dir is in path
+sys.path.append(os.getcwd())
+
+from app.core.blockchain import blockchain
+from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.services.ledger import verify_ledger, shutdown_verify_pool
+
+
+async def main(workers: int):
+    await connect_to_mongo()
+    try:
+        await blockchain.seal_blocks()
+        result = await verify_ledger(workers)
+    finally:
+        await shutdown_verify_pool()
+        await close_mongo_connection()
+
+    print(
+        f"{'✅' if result['valid'] else '❌'} {result['blocks_checked']} blocks, "
+        f"{result['entries_checked']} entries ({result['unsealed_entries']} unsealed) "
+        f"checked by {result['workers']} workers in {result['elapsed_seconds']}s"
+    )
+    for error in result["errors"]:
+        print(f"   - {error}")
+    sys.exit(0 if result["valid"] else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None)
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(parser.parse_args().workers))
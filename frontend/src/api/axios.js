@@ -7,6 +7,18 @@ const API_BASE_URL = import.meta.env.VITE_API_URL
     ? `${import.meta.env.VITE_API_URL}/api`
     : '/api';  // Use relative URL for production (Nginx proxies to backend)
 
+// Resolve server-relative asset paths (e.g. /api/blobs/<hash>) against the API host
+export const assetUrl = (path) => {
+    if (!path) return null;
+    return import.meta.env.VITE_API_URL ? `${import.meta.env.VITE_API_URL}${path}` : path;
+};
+
+// Prefer the blob URL for a stored image, falling back to legacy inline base64
+export const imageSrc = (record, field) => {
+    if (!record) return null;
+    return assetUrl(record[`${field}_url`]) || record[`${field}_base64`] || null;
+};
+
 // Create axios instance
 const api = axios.create({
     baseURL: API_BASE_URL,
@@ -44,6 +56,16 @@ api.interceptors.response.use(
     }
 );
 
+// ==================== BLOBS API ====================
+// `url` is a photo_url/signature_url already resolved by assetUrl; students pass their Firebase token
+export const blobsAPI = {
+    fetch: (url, firebaseToken) => api.get(url, {
+        baseURL: '',
+        responseType: 'blob',
+        headers: firebaseToken ? { Authorization: `Bearer ${firebaseToken}` } : {}
+    }),
+};
+
 // ==================== AUTH API ====================
 export const authAPI = {
     login: (email, password) => {
@@ -63,8 +85,20 @@ export const submissionsAPI = {
     getAll: (params = {}) => api.get('/submissions', { params }),
     getOne: (id) => api.get(`/submissions/${id}`),
     update: (id, data) => api.patch(`/submissions/${id}`, data),
+    bulkStatus: (ids, action, rejectionReason = null) => api.post('/submissions/bulk-status', {
+        ids, action, rejection_reason: rejectionReason
+    }),
     delete: (id) => api.delete(`/submissions/${id}`),
     getSports: () => api.get('/submissions/sports/list'),
+    autocomplete: (params = {}) => api.get('/submissions/search/autocomplete', { params }),
+    importFile: (file, dryRun = false) => {
+        const formData = new FormData();
+        formData.append('file', file);
+        return api.post('/submissions/import', formData, {
+            params: { dry_run: dryRun },
+            headers: { 'Content-Type': 'multipart/form-data' }
+        });
+    },
 
     // Student endpoints (require Firebase token)
     create: (data, firebaseToken) => api.post('/submissions', data, {
@@ -84,6 +118,18 @@ export const eventsAPI = {
     delete: (id) => api.delete(`/events/${id}`),
 };
 
+// ==================== JOBS API ====================
+export const jobsAPI = {
+    getAll: (params = {}) => api.get('/jobs', { params }),
+    getOne: (id) => api.get(`/jobs/${id}`),
+};
+
+// ==================== LEDGER API ====================
+export const ledgerAPI = {
+    getProof: (hash) => api.get(`/ledger/proofs/${hash}`),
+    verify: (params = {}) => api.post('/ledger/verify', null, { params }),
+};
+
 // ==================== PARTICIPATION API ====================
 export const participationAPI = {
     // Student endpoints
@@ -97,6 +143,7 @@ export const participationAPI = {
     // Admin endpoints
     getByEvent: (eventId, params = {}) => api.get(`/participation/event/${eventId}`, { params }),
     updateStatus: (id, data) => api.patch(`/participation/${id}`, data),
+    bulkStatus: (eventId, data) => api.post(`/participation/event/${eventId}/bulk-status`, data),
 };
 
 // ==================== EXPORT API ====================
@@ -118,6 +165,41 @@ export const exportAPI = {
 export const emailAPI = {
     send: (data) => api.post('/email/send', data),
     getLogs: () => api.get('/email/logs'),
+    getCampaignStatus: (logId) => api.get(`/email/logs/${logId}/status`),
+    getCampaignOutbox: (logId, params = {}) => api.get(`/email/logs/${logId}/outbox`, { params }),
+    getFailures: (params = {}) => api.get('/email/outbox/failures', { params }),
+    redrive: (logId, data = {}) => api.post(`/email/logs/${logId}/redrive`, data),
+    verifyAuditChain: (full = false) => api.post('/email/audit/verify', null, { params: { full } }),
+    // Server-Sent Events over fetch (EventSource cannot send the Authorization header).
+    // Calls onEvent(type, data) for each `progress` / `done` event; abort via `signal`.
+    streamProgress: async (logId, onEvent, signal) => {
+        const response = await fetch(`${API_BASE_URL}/email/logs/${logId}/progress`, {
+            headers: { Authorization: `Bearer ${localStorage.getItem('admin_token')}` },
+            signal,
+        });
+        if (!response.ok) throw new Error(`Progress stream failed (${response.status})`);
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) return;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let type = 'message';
+                let data = '';
+                for (const line of block.split('\n')) {
+                    if (line.startsWith('event:')) type = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                }
+                if (data) onEvent(type, JSON.parse(data));
+            }
+        }
+    },
 };
 
 // ==================== ATTENDANCE API ====================
@@ -125,6 +207,9 @@ export const attendanceAPI = {
     getDates: (eventId) => api.get(`/attendance/${eventId}/dates`),
     get: (eventId, date) => api.get(`/attendance/${eventId}`, { params: { attendance_date: date } }),
     save: (eventId, data) => api.post(`/attendance/${eventId}`, data),
+    // Participants x days; pass `since` (a previous version) for a delta
+    getMatrix: (eventId, since) => api.get(`/attendance/${eventId}/matrix`, { params: since ? { since } : {} }),
+    updateMatrix: (eventId, changes, since) => api.patch(`/attendance/${eventId}/matrix`, { changes }, { params: since ? { since } : {} }),
 };
 
 // ==================== ANALYTICS API ====================
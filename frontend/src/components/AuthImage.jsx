@@ -0,0 +1,33 @@
+import { useEffect, useState } from 'react';
+import { blobsAPI } from '../api/axios';
+
+/**
+ * <img> for stored photos/signatures. Blob URLs need the viewer's credentials,
+ * which an <img src> cannot send, so the image is fetched and shown from an
+ * object URL. Inline base64 (data:) sources are used as-is.
+ */
+export default function AuthImage({ src, token, ...props }) {
+    const [objectUrl, setObjectUrl] = useState(null);
+    const inline = !src || src.startsWith('data:');
+
+    useEffect(() => {
+        if (inline) return undefined;
+        let url = null;
+        let cancelled = false;
+        blobsAPI.fetch(src, token)
+            .then((res) => {
+                if (cancelled) return;
+                url = URL.createObjectURL(res.data);
+                setObjectUrl(url);
+            })
+            .catch((err) => console.error('Failed to load image', err));
+        return () => {
+            cancelled = true;
+            if (url) URL.revokeObjectURL(url);
+            setObjectUrl(null);
+        };
+    }, [src, token, inline]);
+
+    const shown = inline ? src : objectUrl;
+    return shown ? <img src={shown} {...props} /> : null;
+}
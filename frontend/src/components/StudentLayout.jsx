@@ -1,7 +1,8 @@
 import { useState, useEffect } from 'react';
 import { Outlet, Link, useNavigate, useLocation } from 'react-router-dom';
 import { useStudentAuth } from '../context/StudentAuthContext';
-import { submissionsAPI } from '../api/axios';
+import { submissionsAPI, imageSrc } from '../api/axios';
+import AuthImage from './AuthImage';
 import { Trophy, User, LogOut, ChevronDown, Calendar, Menu, X } from 'lucide-react';
 import { Toaster } from 'react-hot-toast';
 
@@ -84,8 +85,8 @@ export default function StudentLayout() {
                                 className="flex items-center gap-3 px-3 py-1.5 rounded-full bg-white/5 hover:bg-white/10 border border-white/5 hover:border-white/10 transition-all duration-300 group"
                             >
                                 <div className="w-8 h-8 rounded-full bg-gradient-to-br from-slate-700 to-slate-600 overflow-hidden ring-2 ring-transparent group-hover:ring-blue-500/50 transition-all">
-                                    {profile?.photo_base64 ? (
-                                        <img src={profile.photo_base64} alt="Profile" className="w-full h-full object-cover" />
+                                    {imageSrc(profile, 'photo') ? (
+                                        <AuthImage src={imageSrc(profile, 'photo')} token={token} alt="Profile" className="w-full h-full object-cover" />
                                     ) : (
                                         <div className="w-full h-full flex items-center justify-center">
                                             <User className="w-4 h-4 text-slate-300" />
@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { emailAPI, submissionsAPI } from '../../api/axios';
 import { Mail, CheckCircle, AlertCircle, Users, RefreshCw, Send, Eye, Search, X } from 'lucide-react';
 import toast from 'react-hot-toast';
@@ -16,6 +16,31 @@ export default function AdminEmailPage() {
     const [loading, setLoading] = useState(false);
     const [previewData, setPreviewData] = useState(null);
     const [showConfirm, setShowConfirm] = useState(false);
+    const [progress, setProgress] = useState(null);
+    const progressAbort = useRef(null);
+
+    // Stop listening to a campaign stream when leaving the page
+    useEffect(() => () => progressAbort.current?.abort(), []);
+
+    const watchProgress = async (logId) => {
+        progressAbort.current?.abort();
+        const controller = new AbortController();
+        progressAbort.current = controller;
+        try {
+            await emailAPI.streamProgress(logId, (type, data) => {
+                setProgress(data);
+                if (type === 'done') {
+                    if (data.failed > 0) {
+                        toast.error(`Campaign finished: ${data.sent} sent, ${data.failed} failed.`);
+                    } else {
+                        toast.success(`Campaign finished: ${data.sent} emails sent.`);
+                    }
+                }
+            }, controller.signal);
+        } catch (err) {
+            if (err.name !== 'AbortError') console.error(err);
+        }
+    };
 
     // Student Search State
     const [searchTerm, setSearchTerm] = useState('');
@@ -42,12 +67,12 @@ export default function AdminEmailPage() {
         }
 
         try {
-            const res = await submissionsAPI.getAll({
-                search: term,
+            const res = await submissionsAPI.autocomplete({
+                q: term,
                 status: 'approved',
-                per_page: 5
+                limit: 5
             });
-            setSearchResults(res.data.submissions);
+            setSearchResults(res.data);
         } catch (err) {
             console.error(err);
         }
@@ -107,7 +132,9 @@ export default function AdminEmailPage() {
                 body,
                 dry_run: false
             });
-            toast.success(`Successfully queued ${res.data.success_count} emails.`);
+            toast.success(`Queued ${res.data.recipient_count} emails for delivery.`);
+            setProgress({ audit_log_id: res.data.id, total: res.data.recipient_count, sent: 0, failed: 0, retrying: 0, remaining: res.data.recipient_count, rate_per_second: 0, done: false });
+            watchProgress(res.data.id);
             setShowConfirm(false);
             setPreviewData(null);
             setSubject('');
@@ -281,6 +308,34 @@ export default function AdminEmailPage() {
                         </div>
                     </div>
 
+                    {/* Delivery Progress */}
+                    {progress && (
+                        <div className="bg-slate-800 p-6 rounded-xl border border-slate-700 shadow-lg">
+                            <div className="flex justify-between items-center mb-3">
+                                <h2 className="text-sm font-semibold text-slate-300 uppercase tracking-wider">
+                                    {progress.done ? 'Delivery Complete' : 'Delivering...'}
+                                </h2>
+                                <span className="text-xs text-slate-500">
+                                    {progress.done ? `Campaign #${progress.audit_log_id}` : `${progress.rate_per_second} msg/s`}
+                                </span>
+                            </div>
+                            <div className="w-full h-2 bg-slate-900 rounded-full overflow-hidden mb-3">
+                                <div
+                                    className="h-full bg-blue-500 transition-all duration-500"
+                                    style={{ width: `${progress.total ? ((progress.total - progress.remaining) / progress.total) * 100 : 0}%` }}
+                                />
+                            </div>
+                            <div className="flex gap-6 text-sm">
+                                <span className="text-green-400">Sent: <strong>{progress.sent}</strong></span>
+                                <span className="text-red-400">Failed: <strong>{progress.failed}</strong></span>
+                                {progress.retrying > 0 && (
+                                    <span className="text-amber-400">Retrying: <strong>{progress.retrying}</strong></span>
+                                )}
+                                <span className="text-slate-400">Remaining: <strong>{progress.remaining}</strong></span>
+                            </div>
+                        </div>
+                    )}
+
                     {/* Actions */}
                     <div className="bg-slate-800 p-6 rounded-xl border border-slate-700 shadow-lg flex justify-between items-center">
                         <div className="flex items-center gap-4">
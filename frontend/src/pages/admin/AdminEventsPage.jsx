@@ -40,8 +40,10 @@ export default function AdminEventsPage() {
     const handleCreate = async (e) => {
         e.preventDefault();
         try {
-            await eventsAPI.create(formData);
-            toast.success('Event created!');
+            const res = await eventsAPI.create(formData);
+            toast.success(res.data.announcement_job_id
+                ? 'Event created! Announcement emails are being sent.'
+                : 'Event created!');
             setShowCreate(false);
             setFormData({ name: '', location: '', start_date: '', end_date: '', description: '' });
             fetchEvents();
@@ -7,12 +7,21 @@ import { attendanceAPI, eventsAPI } from '../../api/axios';
 import { Calendar, Users, Check, X, Save, ArrowLeft, Clock } from 'lucide-react';
 import toast from 'react-hot-toast';
 
+// Matrix status codes (one character per event day)
+const CODES = { present: 'P', absent: 'A' };
+const UNMARKED = '-';
+const codeToStatus = (code) => (code === 'P' ? 'present' : code === 'A' ? 'absent' : null);
+
+const setCode = (statuses, day, code) => statuses.slice(0, day) + code + statuses.slice(day + 1);
+
 export default function EventAttendancePage() {
     const { eventId } = useParams();
     const [event, setEvent] = useState(null);
     const [dates, setDates] = useState([]);
     const [selectedDate, setSelectedDate] = useState(null);
-    const [attendance, setAttendance] = useState([]);
+    const [rows, setRows] = useState([]);
+    const [version, setVersion] = useState(null);
+    const [edits, setEdits] = useState({});  // "usn|date" -> status
     const [loading, setLoading] = useState(true);
     const [saving, setSaving] = useState(false);
 
@@ -20,22 +29,20 @@ export default function EventAttendancePage() {
         loadEventData();
     }, [eventId]);
 
-    useEffect(() => {
-        if (selectedDate) {
-            loadAttendance(selectedDate);
-        }
-    }, [selectedDate]);
-
     const loadEventData = async () => {
         try {
-            const [eventRes, datesRes] = await Promise.all([
+            // One request for every participant on every day
+            const [eventRes, matrixRes] = await Promise.all([
                 eventsAPI.getOne(eventId),
-                attendanceAPI.getDates(eventId)
+                attendanceAPI.getMatrix(eventId)
             ]);
             setEvent(eventRes.data);
-            setDates(datesRes.data.dates);
-            if (datesRes.data.dates.length > 0) {
-                setSelectedDate(datesRes.data.dates[0]);
+            setDates(matrixRes.data.dates);
+            setRows(matrixRes.data.participants);
+            setVersion(matrixRes.data.version);
+            setEdits({});
+            if (matrixRes.data.dates.length > 0) {
+                setSelectedDate(matrixRes.data.dates[0]);
             }
         } catch (err) {
             toast.error('Failed to load event data');
@@ -45,37 +52,51 @@ export default function EventAttendancePage() {
         }
     };
 
-    const loadAttendance = async (date) => {
-        try {
-            const res = await attendanceAPI.get(eventId, date);
-            setAttendance(res.data);
-        } catch (err) {
-            console.error('Failed to load attendance:', err);
-            setAttendance([]);
+    // Merge a delta response; if the roster size still disagrees afterwards, reload fully
+    const applyDelta = (delta) => {
+        const dropped = new Set(delta.dropped);
+        const kept = rows.filter(r => !dropped.has(r.usn));
+        const known = new Set(kept.map(r => r.usn));
+        let next = [...kept, ...delta.participants.filter(p => !known.has(p.usn))];
+        if (next.length !== delta.roster_size) {
+            loadEventData();
+            return;
         }
+        for (const change of delta.changes) {
+            next = next.map(r => r.usn === change.usn ? { ...r, statuses: setCode(r.statuses, change.day, change.status) } : r);
+        }
+        setRows(next);
+        if (delta.version) setVersion(delta.version);
     };
 
+    const dayIndex = dates.indexOf(selectedDate);
+    const attendance = dayIndex < 0 ? [] : rows.map(r => ({
+        usn: r.usn,
+        student_name: r.student_name,
+        status: codeToStatus(r.statuses[dayIndex])
+    }));
+
     const toggleStatus = (usn, newStatus) => {
-        setAttendance(prev => prev.map(record =>
-            record.usn === usn
-                ? { ...record, status: record.status === newStatus ? null : newStatus }
-                : record
+        const row = rows.find(r => r.usn === usn);
+        const status = codeToStatus(row.statuses[dayIndex]) === newStatus ? null : newStatus;
+        setRows(prev => prev.map(r =>
+            r.usn === usn ? { ...r, statuses: setCode(r.statuses, dayIndex, CODES[status] || UNMARKED) } : r
         ));
+        setEdits(prev => ({ ...prev, [`${usn}|${selectedDate}`]: status }));
     };
 
     const handleSave = async () => {
         setSaving(true);
         try {
-            const records = attendance.map(a => ({
-                usn: a.usn,
-                student_name: a.student_name,
-                status: a.status
-            }));
-
-            await attendanceAPI.save(eventId, {
-                attendance_date: selectedDate,
-                records
+            // Only the edited cells, across all days, in one request
+            const changes = Object.entries(edits).map(([key, status]) => {
+                const [usn, attendance_date] = key.split('|');
+                const row = rows.find(r => r.usn === usn);
+                return { usn, student_name: row?.student_name, attendance_date, status };
             });
+            const res = await attendanceAPI.updateMatrix(eventId, changes, version);
+            setEdits({});
+            applyDelta(res.data);
             toast.success('Attendance saved successfully!');
         } catch (err) {
             toast.error('Failed to save attendance');
@@ -114,7 +135,7 @@ export default function EventAttendancePage() {
 
                 <button
                     onClick={handleSave}
-                    disabled={saving || attendance.length === 0}
+                    disabled={saving || Object.keys(edits).length === 0}
                     className="btn btn-primary flex items-center gap-2"
                 >
                     <Save className="w-4 h-4" />
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { submissionsAPI } from '../../api/axios';
+import { submissionsAPI, blobsAPI, assetUrl } from '../../api/axios';
 import { Download, FileSpreadsheet, FileText, Loader2, Filter } from 'lucide-react';
 import toast from 'react-hot-toast';
 import ExcelJS from 'exceljs';
@@ -34,18 +34,18 @@ export default function ExportPage() {
         setLoading(true);
         try {
             let allSubmissions = [];
-            let page = 1;
-            let hasMore = true;
+            let cursor = null;
+            let pagesFetched = 0;
 
-            while (hasMore) {
-                const params = { status, page, per_page: 100 };
+            // Walk the keyset cursor; skip the total count since we fetch everything anyway
+            do {
+                const params = { status, per_page: 100, count: 'none' };
+                if (cursor) params.cursor = cursor;
                 const res = await submissionsAPI.getAll(params);
-                const subs = res.data.submissions || [];
-                allSubmissions = [...allSubmissions, ...subs];
-                if (subs.length < 100) hasMore = false;
-                else page++;
-                if (page > 50) hasMore = false;
-            }
+                allSubmissions = [...allSubmissions, ...(res.data.submissions || [])];
+                cursor = res.data.next_cursor;
+                pagesFetched++;
+            } while (cursor && pagesFetched < 50);
 
             if (selectedSport) {
                 allSubmissions = allSubmissions.filter(sub => sub.game_sport_competition === selectedSport);
@@ -95,6 +95,20 @@ export default function ExportPage() {
         }
     };
 
+    // Stored images come from the blob store; legacy records still carry inline base64
+    const loadSubmissionImage = async (sub, field) => {
+        if (sub[`${field}_url`]) {
+            try {
+                const res = await blobsAPI.fetch(assetUrl(sub[`${field}_url`]));
+                return await res.data.arrayBuffer();
+            } catch (error) {
+                console.error("Error fetching image", error);
+                return null;
+            }
+        }
+        return sub[`${field}_base64`] ? base64ToArrayBuffer(sub[`${field}_base64`]) : null;
+    };
+
     const getCurrentYear = () => {
         const now = new Date();
         const year = now.getFullYear();
@@ -281,29 +295,25 @@ export default function ExportPage() {
 
                 // --- IMAGES ---
                 // Photo (Col 8, Row r1-r5)
-                if (sub.photo_base64) {
-                    const imgBuffer = base64ToArrayBuffer(sub.photo_base64);
-                    if (imgBuffer) {
-                        const imgId = workbook.addImage({ buffer: imgBuffer, extension: 'png' });
-                        worksheet.addImage(imgId, {
-                            tl: { col: 7, row: r1 - 1 }, // 7 = Col H
-                            br: { col: 8, row: r5 },     // 8 = End of Col H
-                            editAs: 'oneCell'
-                        });
-                    }
+                const photoBuffer = await loadSubmissionImage(sub, 'photo');
+                if (photoBuffer) {
+                    const imgId = workbook.addImage({ buffer: photoBuffer, extension: 'png' });
+                    worksheet.addImage(imgId, {
+                        tl: { col: 7, row: r1 - 1 }, // 7 = Col H
+                        br: { col: 8, row: r5 },     // 8 = End of Col H
+                        editAs: 'oneCell'
+                    });
                 }
 
                 // Signature (Col 9, Row r1-r5)
-                if (sub.signature_base64) {
-                    const imgBuffer = base64ToArrayBuffer(sub.signature_base64);
-                    if (imgBuffer) {
-                        const imgId = workbook.addImage({ buffer: imgBuffer, extension: 'png' });
-                        worksheet.addImage(imgId, {
-                            tl: { col: 8, row: r1 - 1 }, // 8 = Col I
-                            br: { col: 9, row: r5 },     // 9 = End of Col I
-                            editAs: 'oneCell'
-                        });
-                    }
+                const signatureBuffer = await loadSubmissionImage(sub, 'signature');
+                if (signatureBuffer) {
+                    const imgId = workbook.addImage({ buffer: signatureBuffer, extension: 'png' });
+                    worksheet.addImage(imgId, {
+                        tl: { col: 8, row: r1 - 1 }, // 8 = Col I
+                        br: { col: 9, row: r5 },     // 9 = End of Col I
+                        editAs: 'oneCell'
+                    });
                 }
 
                 currentRow += 5;
@@ -366,6 +376,15 @@ export default function ExportPage() {
 
             const body = [];
 
+            const images = await Promise.all(submissions.map(async (sub) => {
+                const photo = await loadSubmissionImage(sub, 'photo');
+                const signature = await loadSubmissionImage(sub, 'signature');
+                return {
+                    photo: photo ? new Uint8Array(photo) : null,
+                    signature: signature ? new Uint8Array(signature) : null
+                };
+            }));
+
             submissions.forEach((sub, index) => {
                 // 5 Rows per student
 
@@ -378,8 +397,8 @@ export default function ExportPage() {
                     { content: 'BE', rowSpan: 5, styles: { valign: 'middle', halign: 'center' } },
                     { content: 'a) -', styles: { halign: 'left' } },
                     { content: 'a) -', styles: { halign: 'left' } },
-                    { content: '', rowSpan: 5, styles: { minCellHeight: 30, valign: 'middle' }, data: { image: sub.photo_base64 } }, // Photo container
-                    { content: '', rowSpan: 5, styles: { minCellHeight: 30, valign: 'middle' }, data: { image: sub.signature_base64 } } // Signature container
+                    { content: '', rowSpan: 5, styles: { minCellHeight: 30, valign: 'middle' }, data: { image: images[index].photo } }, // Photo container
+                    { content: '', rowSpan: 5, styles: { minCellHeight: 30, valign: 'middle' }, data: { image: images[index].signature } } // Signature container
                 ]);
 
                 // Row 2
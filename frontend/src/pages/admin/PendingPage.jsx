@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
-import { submissionsAPI } from '../../api/axios';
+import { submissionsAPI, imageSrc } from '../../api/axios';
+import AuthImage from '../../components/AuthImage';
 import {
     Clock, CheckCircle, XCircle, Eye, Trash2,
     Search, ChevronLeft, ChevronRight, AlertCircle,
@@ -161,9 +162,9 @@ export default function PendingPage() {
                                         <tr key={sub.id}>
                                             <td>
                                                 <div className="flex items-center gap-3">
-                                                    {sub.photo_base64 ? (
-                                                        <img
-                                                            src={sub.photo_base64}
+                                                    {imageSrc(sub, 'photo') ? (
+                                                        <AuthImage
+                                                            src={imageSrc(sub, 'photo')}
                                                             alt=""
                                                             className="w-10 h-10 rounded-full object-cover"
                                                         />
@@ -300,9 +301,9 @@ export default function PendingPage() {
                         <div className="p-6 space-y-6">
                             {/* Photo and Basic Info */}
                             <div className="flex gap-6">
-                                {selectedSubmission.photo_base64 && (
-                                    <img
-                                        src={selectedSubmission.photo_base64}
+                                {imageSrc(selectedSubmission, 'photo') && (
+                                    <AuthImage
+                                        src={imageSrc(selectedSubmission, 'photo')}
                                         alt="Student"
                                         className="w-32 h-40 rounded-lg object-cover"
                                     />
@@ -352,11 +353,11 @@ export default function PendingPage() {
                             </div>
 
                             {/* Signature */}
-                            {selectedSubmission.signature_base64 && (
+                            {imageSrc(selectedSubmission, 'signature') && (
                                 <div>
                                     <span className="text-gray-500 text-sm">Signature</span>
-                                    <img
-                                        src={selectedSubmission.signature_base64}
+                                    <AuthImage
+                                        src={imageSrc(selectedSubmission, 'signature')}
                                         alt="Signature"
                                         className="h-16 mt-2 bg-white/10 rounded p-2"
                                     />
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
-import { submissionsAPI } from '../../api/axios';
+import { submissionsAPI, imageSrc } from '../../api/axios';
+import AuthImage from '../../components/AuthImage';
 import {
     XCircle, Search, Eye, Trash2, User,
     ChevronLeft, ChevronRight, AlertCircle, Loader2
@@ -109,9 +110,9 @@ export default function RejectedPage() {
                                         <tr key={sub.id}>
                                             <td>
                                                 <div className="flex items-center gap-3">
-                                                    {sub.photo_base64 ? (
-                                                        <img
-                                                            src={sub.photo_base64}
+                                                    {imageSrc(sub, 'photo') ? (
+                                                        <AuthImage
+                                                            src={imageSrc(sub, 'photo')}
                                                             alt=""
                                                             className="w-10 h-10 rounded-full object-cover opacity-60"
                                                         />
@@ -225,9 +226,9 @@ export default function RejectedPage() {
 
                             {/* Photo and Basic Info */}
                             <div className="flex gap-6">
-                                {selectedSubmission.photo_base64 && (
-                                    <img
-                                        src={selectedSubmission.photo_base64}
+                                {imageSrc(selectedSubmission, 'photo') && (
+                                    <AuthImage
+                                        src={imageSrc(selectedSubmission, 'photo')}
                                         alt="Student"
                                         className="w-32 h-40 rounded-lg object-cover opacity-70"
                                     />
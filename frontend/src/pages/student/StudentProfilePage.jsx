@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { useStudentAuth } from '../../context/StudentAuthContext';
-import { submissionsAPI } from '../../api/axios';
+import { submissionsAPI, imageSrc } from '../../api/axios';
 import { Mail, Phone, MapPin, Heart, Share2, Award, Calendar, Home, BookOpen, Quote, Download } from 'lucide-react';
 
 export default function StudentProfilePage() {
@@ -39,8 +39,8 @@ export default function StudentProfilePage() {
                         {/* ID Photo */}
                         <div className="shrink-0 flex flex-col gap-4">
                             <div className="w-40 h-40 rounded-lg overflow-hidden border-4 border-slate-800 shadow-lg bg-slate-800">
-                                {profile.photo_base64 ? (
-                                    <img src={profile.photo_base64} alt="Student" className="w-full h-full object-cover" />
+                                {imageSrc(profile, 'photo') ? (
+                                    <img src={imageSrc(profile, 'photo')} alt="Student" className="w-full h-full object-cover" />
                                 ) : (
                                     <div className="w-full h-full flex items-center justify-center text-slate-600">
                                         <span className="text-5xl">🎓</span>
@@ -164,8 +164,8 @@ export default function StudentProfilePage() {
                             Signature
                         </h3>
                         <div className="flex-1 flex items-center justify-center p-6 bg-white rounded-lg border border-slate-200">
-                            {profile.signature_base64 ? (
-                                <img src={profile.signature_base64} alt="Signature" className="max-w-full max-h-32 object-contain" />
+                            {imageSrc(profile, 'signature') ? (
+                                <img src={imageSrc(profile, 'signature')} alt="Signature" className="max-w-full max-h-32 object-contain" />
                             ) : (
                                 <p className="text-slate-400 text-sm">No signature on file</p>
                             )}